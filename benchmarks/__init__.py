@@ -0,0 +1 @@
+"""Benchmarks of the tasks app, each module is a script (see its docstring for usage)."""
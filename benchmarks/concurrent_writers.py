@@ -0,0 +1,91 @@
+"""Throughput of concurrent writers to a single tasks list.
+
+Starts N processes, each adding tasks to the same list one write at
+a time, then checks that every added task is in the list, i.e. that
+no update was lost. Writers either keep a list loaded for all of their
+writes (so they are stale most of the time and have to catch up before
+writing), or load it for every write, as ``tasks add`` does.
+
+Usage::
+
+    python benchmarks/concurrent_writers.py --writers 8 --writes 200 --storage json sqlite
+"""
+
+import argparse
+import multiprocessing
+import tempfile
+import time
+from multiprocessing.synchronize import Event
+from pathlib import Path
+
+from tasks.core import TasksList, open_storage
+from tasks.core.storage import DEFAULT_SUFFIXES
+
+
+def writer(path: Path, writer_id: int, writes: int, reload: bool, start: Event) -> None:
+    """Add ``writes`` tasks to a list, one write per task."""
+    tasks = TasksList(path)
+    start.wait()
+    for i in range(writes):
+        if reload:
+            tasks = TasksList(path)
+        tasks.add(f"writer {writer_id} task {i}")
+
+
+def run(storage: str, writers: int, writes: int, initial: int, reload: bool) -> tuple[float, int]:
+    """Run writers and check the result.
+
+    :return tuple[float, int]: Elapsed seconds and number of lost updates.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp, "list" + DEFAULT_SUFFIXES[storage])
+        open_storage(path).create("Benchmark")
+        if initial:
+            tasks = TasksList(path)
+            with tasks.batch():
+                for i in range(initial):
+                    tasks.add(f"initial task {i}")
+
+        start = multiprocessing.Event()
+        processes = [
+            multiprocessing.Process(target=writer, args=(path, w, writes, reload, start)) for w in range(writers)
+        ]
+        for p in processes:
+            p.start()
+        time.sleep(0.5)  # let writers load the list
+        started = time.perf_counter()
+        start.set()
+        for p in processes:
+            p.join()
+        elapsed = time.perf_counter() - started
+
+        titles = {task.title for task in TasksList(path)}
+        expected = {f"writer {w} task {i}" for w in range(writers) for i in range(writes)}
+        return elapsed, len(expected - titles)
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writers", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--writes", type=int, default=100, help="Writes per writer")
+    parser.add_argument("--initial", type=int, default=1000, help="Tasks in the list before writing")
+    parser.add_argument("--storage", nargs="+", default=["json", "sqlite"], choices=list(DEFAULT_SUFFIXES))
+    args = parser.parse_args()
+
+    print(f"{'storage':>7} | {'writers':>7} | {'mode':>9} | {'writes/s':>9} | {'lost':>4}")
+    lost_total = 0
+    for storage in args.storage:
+        for writers in args.writers:
+            for reload in (False, True):
+                elapsed, lost = run(storage, writers, args.writes, args.initial, reload)
+                lost_total += lost
+                mode = "reload" if reload else "long-lived"
+                print(f"{storage:>7} | {writers:>7} | {mode:>9} | {writers * args.writes / elapsed:>9.1f} | {lost:>4}")
+
+    if lost_total:
+        raise SystemExit(f"{lost_total} update(s) lost")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Command latency with and without a daemon.
+
+Sets up a throwaway config with a list of ``--tasks`` tasks, then
+measures ``tasks add`` and ``tasks ls`` run as processes with direct
+file access and through a daemon, and single requests sent over
+a connection kept open, as a script talking to the daemon would do.
+
+Usage::
+
+    python benchmarks/daemon_latency.py --tasks 10000 --repeat 20
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from tasks.core import TasksList, open_storage
+from tasks.daemon import DaemonClient
+
+
+def measure(func: Callable[[], object], repeat: int) -> float:
+    """Get a median run time of a function in milliseconds."""
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - started)
+    return statistics.median(times) * 1000
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=10_000, help="Tasks in the list")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs of every command")
+    args = parser.parse_args()
+
+    tasks_cmd = shutil.which("tasks")
+    if tasks_cmd is None:
+        raise SystemExit("`tasks` is not installed, run `pip install -e .`")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ,
+            "XDG_CONFIG_HOME": str(Path(tmp, "config")),
+            "XDG_CACHE_HOME": str(Path(tmp, "cache")),
+            "TASKS_SOCKET": str(Path(tmp, "tasks.sock")),
+        }
+        env.pop("TASKS_NO_DAEMON", None)
+        list_path = Path(tmp, "list.json")
+        open_storage(list_path).create("Benchmark")
+        tasks = TasksList(list_path)
+        with tasks.batch():
+            for i in range(args.tasks):
+                tasks.add(f"task {i}")
+        config_path = Path(tmp, "config", "Tasks", "config.json")
+        config_path.parent.mkdir(parents=True)
+        config_path.write_text(json.dumps({"active_list": str(list_path), "task_lists": [str(list_path)]}))
+
+        def run(*argv: str, direct: bool = False) -> None:
+            subprocess.run(
+                [tasks_cmd, *argv],
+                env={**env, "TASKS_NO_DAEMON": "1"} if direct else env,
+                stdout=subprocess.DEVNULL,
+                check=True,
+            )
+
+        results = {
+            "add (direct)": measure(lambda: run("add", "task", direct=True), args.repeat),
+            "ls (direct)": measure(lambda: run("ls", direct=True), args.repeat),
+        }
+
+        daemon = subprocess.Popen([tasks_cmd, "serve"], env=env, stdout=subprocess.DEVNULL)
+        try:
+            while not Path(env["TASKS_SOCKET"]).exists():
+                time.sleep(0.05)
+            time.sleep(0.2)
+            results["add (daemon)"] = measure(lambda: run("add", "task"), args.repeat)
+            results["ls (daemon)"] = measure(lambda: run("ls"), args.repeat)
+            with DaemonClient(env["TASKS_SOCKET"]) as client:
+                results["ping request"] = measure(lambda: client.request("ping"), args.repeat)
+                results["add request"] = measure(lambda: client.request("add", titles=["task"]), args.repeat)
+                results["ls request"] = measure(lambda: client.request("ls"), args.repeat)
+                client.request("stop")
+        finally:
+            daemon.wait(timeout=10)
+
+    print(f"{'command':>14} | {'median ms':>9}")
+    for name, ms in results.items():
+        print(f"{name:>14} | {ms:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Size and speed of list file formats.
+
+Writes the same synthetic list in every storage format, optionally
+compressed, and reports the file size, a full load (``TasksList``),
+a full save (``compact``), streaming all tasks and reading a summary.
+
+Usage::
+
+    python benchmarks/storage_formats.py --sizes 10000 100000 1000000 --storage json binary sqlite
+    python benchmarks/storage_formats.py --storage json binary --compression none gzip bz2 lzma
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from tasks.core import Task, TasksList, open_storage, read_summary, stream_tasks
+from tasks.core.storage import CODECS, DEFAULT_SUFFIXES
+
+
+def measure(func: Callable[[], object], repeat: int) -> float:
+    """Get a median run time of a function in seconds."""
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - started)
+    return statistics.median(times)
+
+
+def run(storage: str, codec: str, size: int, repeat: int) -> tuple[int, float, float, float, float]:
+    """Measure a format.
+
+    :param str codec: A compression codec, ``none`` for uncompressed files.
+
+    :return tuple[int, float, float, float, float]: File size in bytes,
+        seconds to load, save, stream and summarize the list.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp, "list" + DEFAULT_SUFFIXES[storage])
+        if codec != "none":
+            path = path.with_name(path.name + CODECS[codec].suffix)  # type: ignore
+        open_storage(path).create(
+            "Benchmark",
+            (Task(f"Synthetic task number {i}", done=i % 3 == 0) for i in range(size)),
+        )
+        file_size = path.stat().st_size
+        tasks = TasksList(path)
+        return (
+            file_size,
+            measure(lambda: TasksList(path), repeat),
+            measure(tasks.compact, repeat),
+            measure(lambda: sum(1 for _ in stream_tasks(path)[1]), repeat),
+            measure(lambda: read_summary(path), repeat),
+        )
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--storage", nargs="+", default=["json", "binary", "sqlite"], choices=list(DEFAULT_SUFFIXES))
+    parser.add_argument("--compression", nargs="+", default=["none"], choices=["none", *CODECS])
+    parser.add_argument("--repeat", type=int, default=3, help="Measurements per operation")
+    args = parser.parse_args()
+
+    print(
+        f"{'storage':>7} | {'codec':>5} | {'tasks':>8} | {'bytes/task':>10} | {'load ms':>9} | {'save ms':>9} | "
+        f"{'stream ms':>9} | {'summary ms':>10}"
+    )
+    for size in args.sizes:
+        for storage in args.storage:
+            for codec in args.compression if storage != "sqlite" else ["none"]:
+                file_size, load, save, stream, summary = run(storage, codec, size, args.repeat)
+                print(
+                    f"{storage:>7} | {codec:>5} | {size:>8} | {file_size / size:>10.1f} | {load * 1000:>9.1f} | "
+                    f"{save * 1000:>9.1f} | {stream * 1000:>9.1f} | {summary * 1000:>10.2f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""Benchmark suite for core, CLI and TUI hot paths.
+
+Generates synthetic lists of given sizes and measures:
+
+- core: :class:`tasks.core.TasksList` loading, ``compact``, ``add``, ``at`` and ``completed_number``;
+- cli: cold start of ``tasks ls`` and ``tasks lists``, each in a new process
+  (with direct file access, a running daemon is ignored);
+- tui: :class:`tasks.tui.TasksApp` compose (until the app is mounted)
+  and one task toggle (until the UI is updated), under Textual's headless pilot.
+
+Results (median seconds per operation) are printed and may be written
+to a JSON file. Timings only compare on the same machine, so there is
+no committed baseline: to check a change for regressions, save results
+of the code before it with ``--output`` and run the suite again with
+``--baseline``. Results slower than the baseline beyond ``--threshold``
+are reported as regressions and make the suite exit with an error.
+
+Usage::
+
+    python benchmarks/suite.py --sizes 1000 100000 1000000
+    python benchmarks/suite.py --groups core tui --sizes 1000 --output results.json
+    python benchmarks/suite.py --sizes 1000 100000 --output before.json
+    python benchmarks/suite.py --sizes 1000 100000 --baseline before.json
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from tasks import APP_VERSION
+from tasks.core import Task, TasksList, open_storage
+
+GROUPS = ("core", "cli", "tui")
+
+CLIENT = [sys.executable, "-c", "from tasks.daemon.client import main; main()"]
+"""The ``tasks`` entry point, independent of the ``PATH``."""
+
+
+def measure(func: Callable[[], object], repeat: int, number: int = 1) -> float:
+    """Get a median time of a function call in seconds.
+
+    :param int repeat: Number of measurements.
+    :param int number: Calls per measurement, for calls too fast to measure one by one.
+    """
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        times.append((time.perf_counter() - started) / number)
+    return statistics.median(times)
+
+
+def make_list(directory: Path, size: int) -> Path:
+    """Make a synthetic list with every third task done."""
+    path = Path(directory, f"list-{size}.json")
+    open_storage(path).create(
+        f"Benchmark {size}",
+        (Task(f"Synthetic task number {i}", done=i % 3 == 0) for i in range(size)),
+    )
+    return path
+
+
+def bench_core(path: Path, size: int, repeat: int) -> dict[str, float]:
+    """Measure :class:`TasksList` operations."""
+    tasks = TasksList(path)
+    results = {
+        "core.load": measure(lambda: TasksList(path), repeat),
+        "core.save": measure(tasks.compact, repeat),
+        "core.add": measure(lambda: tasks.add("Added task"), repeat, number=10),
+    }
+    index = size // 2
+    results["core.at"] = measure(lambda: tasks.at(index), repeat, number=10_000)
+    results["core.completed_number"] = measure(lambda: tasks.completed_number, repeat, number=10_000)
+    return results
+
+
+def bench_cli(path: Path, repeat: int) -> dict[str, float]:
+    """Measure CLI commands in new processes."""
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ,
+            "XDG_CONFIG_HOME": str(Path(tmp, "config")),
+            "XDG_CACHE_HOME": str(Path(tmp, "cache")),
+            "TASKS_NO_DAEMON": "1",
+        }
+        config_path = Path(tmp, "config", "Tasks", "config.json")
+        config_path.parent.mkdir(parents=True)
+        config_path.write_text(json.dumps({"active_list": str(path), "task_lists": [str(path)]}))
+
+        def run(*args: str) -> None:
+            subprocess.run([*CLIENT, *args], env=env, stdout=subprocess.DEVNULL, check=True)
+
+        return {
+            "cli.ls": measure(lambda: run("ls"), repeat),
+            "cli.lists": measure(lambda: run("lists"), repeat),
+        }
+
+
+def bench_tui(path: Path, repeat: int) -> dict[str, float]:
+    """Measure the TUI under a headless pilot."""
+    from tasks.tui import TasksApp
+    from tasks.tui.tasks_list_item import TasksListItem
+
+    tasks = TasksList(path)
+    compose_times: list[float] = []
+    toggle_times: list[float] = []
+
+    async def run() -> None:
+        started = time.perf_counter()
+        app = TasksApp(tasks)
+        async with app.run_test(size=(120, 40)) as pilot:
+            await pilot.pause()
+            compose_times.append(time.perf_counter() - started)
+
+            item = app.query(TasksListItem).first()
+            done = tasks.get(item.task_id).done
+            started = time.perf_counter()
+            item.query_one("#checkbox").toggle()  # type: ignore
+            await pilot.pause()
+            toggle_times.append(time.perf_counter() - started)
+            assert tasks.get(item.task_id).done != done
+
+    for _ in range(repeat):
+        asyncio.run(run())
+    return {"tui.compose": statistics.median(compose_times), "tui.toggle": statistics.median(toggle_times)}
+
+
+def run_suite(sizes: list[int], groups: list[str], repeat: int) -> dict[str, float]:
+    """Run benchmarks.
+
+    :return dict[str, float]: Median seconds by benchmark name, like ``core.load[1000]``.
+    """
+    results: dict[str, float] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            started = time.perf_counter()
+            path = make_list(Path(tmp), size)
+            print(f"Generated {size} tasks in {time.perf_counter() - started:.2f} s", file=sys.stderr)
+            for group in groups:
+                if group == "core":
+                    measured = bench_core(path, size, repeat)
+                elif group == "cli":
+                    measured = bench_cli(path, repeat)
+                else:
+                    measured = bench_tui(path, repeat)
+                for name, seconds in measured.items():
+                    results[f"{name}[{size}]"] = seconds
+                    print(f"{name}[{size}]: {seconds * 1000:.4f} ms", file=sys.stderr)
+    return results
+
+
+def compare(results: dict[str, float], baseline: dict[str, float], threshold: float) -> list[str]:
+    """Print results next to a baseline.
+
+    :param float threshold: A ratio to the baseline above which a result is a regression.
+    :return list[str]: Names of regressed benchmarks.
+    """
+    regressions = []
+    print(f"{'benchmark':<32} | {'ms':>12} | {'baseline ms':>12} | {'change':>8}")
+    for name, seconds in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<32} | {seconds * 1000:>12.4f} | {'-':>12} | {'-':>8}")
+            continue
+        ratio = seconds / base if base else float("inf")
+        mark = ""
+        if ratio > threshold:
+            regressions.append(name)
+            mark = " !"
+        print(f"{name:<32} | {seconds * 1000:>12.4f} | {base * 1000:>12.4f} | {ratio:>7.2f}x{mark}")
+    return regressions
+
+
+def dump(results: dict[str, float], sizes: list[int], repeat: int) -> dict[str, Any]:
+    """Make a results document with details of where it was measured."""
+    return {
+        "meta": {
+            "date": datetime.datetime.now(datetime.UTC).isoformat(timespec="seconds"),
+            "version": APP_VERSION,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sizes": sizes,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def main() -> None:
+    """Run the benchmark suite."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100_000, 1_000_000])
+    parser.add_argument("--groups", nargs="+", default=list(GROUPS), choices=GROUPS)
+    parser.add_argument("--repeat", type=int, default=5, help="Measurements per benchmark")
+    parser.add_argument("--output", type=Path, help="Write results to a JSON file")
+    parser.add_argument("--baseline", type=Path, help="Compare with results written by --output earlier")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Slowdown ratio reported as a regression")
+    args = parser.parse_args()
+    baseline = None if args.baseline is None else json.loads(args.baseline.read_text())["results"]
+
+    results = run_suite(args.sizes, args.groups, args.repeat)
+    document = dump(results, args.sizes, args.repeat)
+    if args.output:
+        args.output.write_text(json.dumps(document, indent=2) + "\n")
+
+    if baseline is None:
+        return
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        raise SystemExit(f"{len(regressions)} benchmark(s) regressed: {', '.join(regressions)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Memory footprint of tasks representations.
+
+Reports bytes per task for the legacy (``__dict__`` based) task class
+and for the current slotted :class:`tasks.core.Task`, including the
+``id -> Task`` dict a :class:`tasks.core.TasksList` keeps.
+
+Usage::
+
+    python benchmarks/task_memory.py --sizes 10000 100000 1000000
+"""
+
+import argparse
+import gc
+import tracemalloc
+import uuid
+from collections.abc import Callable
+from typing import Any
+
+from tasks.core import Task
+
+
+class LegacyTask:
+    """Task representation before slots were introduced."""
+
+    def __init__(self, title: str, *, task_id: str | None = None, done: bool = False) -> None:
+        self.id = task_id or str(uuid.uuid4()).replace("-", "")
+        self.title = title or "Untitled"
+        self.done = done
+
+
+def measure(factory: Callable[..., Any], ids: list[str], titles: list[str]) -> int:
+    """Measure memory allocated for tasks and their index.
+
+    Ids and titles are created beforehand, so only objects
+    and the index are measured.
+
+    :return int: Allocated bytes.
+    """
+    gc.collect()
+    tracemalloc.start()
+    tasks = {
+        task_id: factory(title, task_id=task_id, done=i % 3 == 0)
+        for i, (task_id, title) in enumerate(zip(ids, titles, strict=True))
+    }
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del tasks
+    return allocated
+
+
+def measure_strings(n: int) -> tuple[list[str], list[str], int]:
+    """Create ids and titles for ``n`` tasks and measure their size."""
+    tracemalloc.start()
+    ids = [uuid.uuid4().hex for _ in range(n)]
+    titles = [f"Task number {i}" for i in range(n)]
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return ids, titles, allocated
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'tasks':>10} | {'strings B/task':>14} | {'legacy B/task':>13} | {'slotted B/task':>14} | {'saved':>6}")
+    for n in args.sizes:
+        ids, titles, strings = measure_strings(n)
+        legacy = measure(LegacyTask, ids, titles)
+        slotted = measure(Task, ids, titles)
+        print(
+            f"{n:>10} | {strings / n:>14.1f} | {legacy / n:>13.1f} | {slotted / n:>14.1f} | "
+            f"{(1 - slotted / legacy) * 100:>5.1f}%"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,10 @@
 """Tasks package."""
 
+import time
+
+STARTED = time.perf_counter()
+"""Time the package started to be imported, imports are timed from here (see ``tasks --profile``)."""
+
 __version__ = "0.0.1"
 
 APP_NAME = "Tasks"
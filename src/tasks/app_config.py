@@ -1,21 +1,45 @@
 """Application configuration."""
 
+import json
 import logging
+import os
+import time
+from dataclasses import asdict, dataclass
 from pathlib import Path
+from typing import Any, Literal
 
 import platformdirs
-from pydantic import BaseModel, ValidationError
 
-from tasks import APP_NAME
+from tasks import APP_NAME, APP_VERSION
+from tasks.core.profiling import timer
+from tasks.core.storage import Codec, CompressionPolicy
 
 logger = logging.getLogger()
 
 
-class AppConfig(BaseModel):
-    """Application global configuration."""
+@dataclass
+class AppConfig:
+    """Application global configuration.
+
+    Configuration files are validated with pydantic (see :func:`load_app_config`),
+    but pydantic is heavy to import, so the config itself is a plain dataclass.
+    """
 
     active_list: Path | None
     task_lists: list[Path]
+    storage: Literal["json", "sqlite", "binary"] = "json"
+    """Storage backend for new tasks lists."""
+    compression: Literal["never", "auto", "always"] = "never"
+    """When json and binary list files are compressed, see :class:`CompressionPolicy`."""
+    compression_codec: Codec = "gzip"
+    """Codec of newly compressed list files."""
+    compression_min_size: int = 1024 * 1024
+    """List file size (in bytes) from which ``auto`` compression compresses it."""
+
+    @property
+    def compression_policy(self) -> CompressionPolicy:
+        """Compression policy of tasks lists."""
+        return CompressionPolicy(self.compression, self.compression_codec, self.compression_min_size)
 
 
 CONFIG_DIR = platformdirs.user_config_path(APP_NAME, False)
@@ -24,9 +48,18 @@ CONFIG_DIR = platformdirs.user_config_path(APP_NAME, False)
 DATA_DIR = platformdirs.user_data_path(APP_NAME, False)
 """Place where user data is stored."""
 
+CACHE_DIR = platformdirs.user_cache_path(APP_NAME, False)
+"""Place where cached data is stored."""
+
 CONFIG_FILE_PATH = Path(CONFIG_DIR, "config.json")
 """App configuration file path."""
 
+SUMMARY_CACHE_PATH = Path(CACHE_DIR, "summaries.json")
+"""Tasks lists summaries cache file path."""
+
+CONFIG_SNAPSHOT_PATH = Path(CACHE_DIR, "config.snapshot.json")
+"""Validated app configuration snapshot file path."""
+
 DEFAULT_LIST_PATH = Path(platformdirs.user_data_path(APP_NAME, False), "default.json")
 """Default tasks list file path."""
 
@@ -64,11 +97,89 @@ def _default_setup() -> AppConfig:
         f.write('{"title": "Default", "tasks": {}}')
 
     # Return default configuration
-    return AppConfig.model_validate_json(DEFAULT_CONFIG)
+    config = _validate(DEFAULT_CONFIG)
+    _write_snapshot(config)
+    return config
+
+
+def _validate(data: str) -> AppConfig:
+    """Validate app configuration json.
+
+    :raises pydantic.ValidationError: Configuration is not valid.
+    """
+    from pydantic import TypeAdapter  # pydantic is heavy, import it only when needed
+
+    return TypeAdapter(AppConfig).validate_json(data)
+
+
+def _dump(config: AppConfig) -> dict[str, Any]:
+    """Dump app configuration into json compatible data."""
+    data = asdict(config)
+    data["active_list"] = str(config.active_list) if config.active_list else None
+    data["task_lists"] = [str(p) for p in config.task_lists]
+    return data
+
+
+def _config_file_stamp() -> list[Any]:
+    """Get config file modification time, size and the app version that validated it."""
+    stat = CONFIG_FILE_PATH.stat()
+    return [stat.st_mtime_ns, stat.st_size, APP_VERSION]
+
+
+def _write_snapshot(config: AppConfig) -> None:
+    """Remember a validated configuration along with the config file stamp."""
+    try:
+        CONFIG_SNAPSHOT_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = CONFIG_SNAPSHOT_PATH.with_name(CONFIG_SNAPSHOT_PATH.name + ".tmp")
+        with tmp_path.open("w") as f:
+            json.dump({"stamp": _config_file_stamp(), "config": _dump(config)}, f)
+        os.replace(tmp_path, CONFIG_SNAPSHOT_PATH)
+    except OSError as e:
+        logger.debug(f"Cannot write config snapshot: {e}")
+
+
+def _read_snapshot() -> AppConfig | None:
+    """Read a validated configuration if the config file did not change since it was validated."""
+    try:
+        with CONFIG_SNAPSHOT_PATH.open("r") as f:
+            snapshot = json.load(f)
+        if snapshot["stamp"] != _config_file_stamp():
+            return None
+        data = snapshot["config"]
+        return AppConfig(
+            active_list=Path(data["active_list"]) if data["active_list"] else None,
+            task_lists=[Path(p) for p in data["task_lists"]],
+            storage=data["storage"],
+            compression=data["compression"],
+            compression_codec=data["compression_codec"],
+            compression_min_size=data["compression_min_size"],
+        )
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
 
 
 def load_app_config() -> AppConfig:
-    """Load app configuration."""
+    """Load app configuration.
+
+    A configuration validated earlier is reused while the config file
+    stays the same, full validation runs only after the file changed.
+    """
+    started = time.perf_counter()
+    with timer.phase("config load"):
+        config = _read_snapshot()
+        if config is not None:
+            logger.debug(f"Config loaded from a snapshot in {(time.perf_counter() - started) * 1000:.2f} ms")
+            return config
+
+        config = _load_app_config()
+    logger.debug(f"Config loaded and validated in {(time.perf_counter() - started) * 1000:.2f} ms")
+    return config
+
+
+def _load_app_config() -> AppConfig:
+    """Read and validate app configuration file."""
+    from pydantic import ValidationError
+
     config_file_path = CONFIG_FILE_PATH
 
     # Create config file if not exists and fill it with default configuration
@@ -84,13 +195,17 @@ def load_app_config() -> AppConfig:
         return _default_setup()
 
     try:
-        return AppConfig.model_validate_json(config_file_data)
+        config = _validate(config_file_data)
     except ValidationError:
         logger.warning("Config file is corrupted, overwriting with the default config")
         return _default_setup()
 
+    _write_snapshot(config)
+    return config
+
 
 def save_app_config(config: AppConfig) -> None:
     """Save app config to a file."""
     with CONFIG_FILE_PATH.open("w") as f:
-        f.write(config.model_dump_json(indent=4))
+        json.dump(_dump(config), f, indent=4)
+    _write_snapshot(config)
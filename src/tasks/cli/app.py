@@ -1,15 +1,16 @@
 """A wiring of CLI modules into a CLI app."""
 
 import logging
+import os
 import sys
 import traceback
+from pathlib import Path
 
 import typer
 from rich.console import Console
-from rich.markdown import Markdown
 
 from tasks import APP_NAME, APP_VERSION
-from tasks.cli.errors import NoActiveListError, NoTasksListsError
+from tasks.cli.errors import DaemonRunningError, InvalidListError, NoActiveListError, NoTasksListsError
 from tasks.logging import setup_logging
 
 from .context import ContextObject
@@ -38,10 +39,26 @@ def root_callback(
         "-V",
         help="Show version",
     ),
+    profile: bool = typer.Option(
+        False,
+        "--profile",
+        help="Time phases of the command (import, config and list loading, rendering, saving) and print them",
+    ),
+    profile_output: Path | None = typer.Option(
+        None,
+        "--profile-output",
+        help="Also dump cProfile stats to a file (implies --profile)",
+        show_default=False,
+    ),
 ) -> None:
     """Simple todo CLI app."""  # noqa: D401
     setup_logging(verbose)
 
+    if profile or profile_output is not None:
+        from .profiling import start_profiling
+
+        start_profiling(ctx, profile_output)
+
     if version:
         console.print(f"{APP_NAME} {APP_VERSION}")
         return
@@ -60,6 +77,8 @@ def clean_terminate(err: Exception) -> None:
         # NotADirectoryError,
         # TimeoutError,
     ) + (
+        DaemonRunningError,
+        InvalidListError,
         NoActiveListError,
         NoTasksListsError,
         # yaml.parser.ParserError,
@@ -96,6 +115,11 @@ def run_cli() -> None:
         tasks_cli.add_typer(debug_cli, name="debug")
         tasks_cli.add_typer(lists_cli, name="lists")
         return tasks_cli()
+    except BrokenPipeError:
+        # Output is piped into a command that exited early, like ``head``.
+        # Redirect the rest of the output to devnull to avoid another error at exit.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
     except Exception as err:
         clean_terminate(err)
 
@@ -1,11 +1,24 @@
 """CLI context."""
 
+import itertools
 import logging
-
-from tasks.app_config import AppConfig, load_app_config
-from tasks.cli.errors import NoActiveListError
-from tasks.cli.utils import is_valid_json_file_path
-from tasks.core import TasksList
+from collections.abc import Iterator
+from typing import TYPE_CHECKING
+
+from tasks.cli.errors import InvalidListError, NoActiveListError
+from tasks.core import (
+    InvalidTasksListError,
+    SearchHit,
+    Task,
+    TasksList,
+    list_file_error,
+    load_tasks_list,
+    search_tasks,
+    stream_tasks,
+)
+
+if TYPE_CHECKING:
+    from tasks.app_config import AppConfig
 
 logger = logging.getLogger()
 
@@ -21,21 +34,24 @@ class ContextObject:
     entity repositories, etc.
     """
 
-    _config: AppConfig
+    _config: "AppConfig"
     _tasks: TasksList
 
     @property
-    def config(self) -> AppConfig:
-        """Get :class:`AppConfig` instance."""
+    def config(self) -> "AppConfig":
+        """:class:`AppConfig` instance."""
         if getattr(self, "_config", None) is None:
+            from tasks.app_config import load_app_config
+
             self._config = load_app_config()
         return self._config
 
     @property
     def tasks(self) -> TasksList:
-        """Get :class:`Tasks` instance for currently selected list.
+        """:class:`TasksList` instance for currently selected list.
 
         :raises NoActiveListError: Active tasks list is not set.
+        :raises InvalidListError: Active tasks list cannot be loaded.
         :return TasksList: A tasks list handler.
         """
         config = self.config
@@ -44,11 +60,53 @@ class ContextObject:
             raise NoActiveListError()
 
         if getattr(self, "_tasks", None) is None:
-            valid, error = is_valid_json_file_path(config.active_list)
+            try:
+                self._tasks = load_tasks_list(config.active_list, compression=config.compression_policy)
+            except InvalidTasksListError as e:
+                raise InvalidListError(e) from e
+
+        return self._tasks
 
-            if not valid:
-                logger.warning(f"Path: {config.active_list} is not a valid json file: {error}")
+    def stream_tasks(self) -> tuple[str, Iterator[Task]]:
+        """Read currently selected list title and iterate over its tasks as they are read.
 
-            self._tasks = TasksList(config.active_list)
+        Unlike :attr:`tasks`, this does not load the whole list into memory.
 
-        return self._tasks
+        :raises NoActiveListError: Active tasks list is not set.
+        :raises InvalidListError: Active tasks list cannot be read.
+        :return tuple[str, Iterator[Task]]: List title and an iterator over tasks.
+        """
+        if getattr(self, "_tasks", None) is not None:
+            return self._tasks.title, iter(self._tasks)
+
+        config = self.config
+
+        if config.active_list is None:
+            raise NoActiveListError()
+
+        try:
+            title, tasks = stream_tasks(config.active_list)
+            # Some problems only show up when the first task is read
+            first = next(tasks, None)
+        except InvalidTasksListError as e:
+            raise InvalidListError(e) from e
+        except (OSError, UnicodeDecodeError) as e:
+            raise InvalidListError(list_file_error(config.active_list, e)) from e
+
+        return title, tasks if first is None else itertools.chain([first], tasks)
+
+    def search_tasks(self, query: str, *, fuzzy: bool = False, limit: int | None = None) -> list[SearchHit]:
+        """Search tasks of currently selected list by title.
+
+        :param str query: Search query.
+        :param bool fuzzy: Also match words similar to query words.
+        :param int | None limit: Maximal number of hits.
+        :raises NoActiveListError: Active tasks list is not set.
+        :return list[SearchHit]: Found tasks, best matches first.
+        """
+        config = self.config
+
+        if config.active_list is None:
+            raise NoActiveListError()
+
+        return search_tasks(config.active_list, query, fuzzy=fuzzy, limit=limit)
@@ -1,17 +1,15 @@
 """CLI module for debugging."""
 
 import logging
-import shutil
+import subprocess
+import sys
+import time
 
-import rich
-import rich.prompt
 import typer
-
-from tasks.app_config import CONFIG_DIR, CONFIG_FILE_PATH, DATA_DIR, DEFAULT_LIST_PATH
-from tasks.cli.utils import print_tree
+from rich.console import Console
 
 logger = logging.getLogger()
-console = rich.console.Console()
+console = Console()
 
 debug_cli = typer.Typer(
     help="Debug commands for CLI. For development only.",
@@ -29,8 +27,11 @@ def cli_help(ctx: typer.Context) -> None:
 @debug_cli.command("config")
 def debug_config(ctx: typer.Context) -> None:
     """View configuration file path."""
+    from tasks.app_config import CONFIG_FILE_PATH, DEFAULT_LIST_PATH, SUMMARY_CACHE_PATH
+
     console.print(f"Config file path: {CONFIG_FILE_PATH}")
     console.print(f"Default tasks list file path: {DEFAULT_LIST_PATH}")
+    console.print(f"Summaries cache file path: {SUMMARY_CACHE_PATH}")
 
 
 @debug_cli.command("logging")
@@ -49,6 +50,13 @@ def clean(ctx: typer.Context, force: bool = typer.Option(False, "-y")) -> None:
 
     Removes configuration file and a default tasks list.
     """
+    import shutil
+
+    import rich.prompt
+
+    from tasks.app_config import CACHE_DIR, CONFIG_DIR, DATA_DIR, DEFAULT_LIST_PATH
+    from tasks.cli.tree import print_tree
+
     if not force:
         console.print(
             "[yellow]WARNING[/yellow]: This action will "
@@ -74,4 +82,87 @@ def clean(ctx: typer.Context, force: bool = typer.Option(False, "-y")) -> None:
         shutil.rmtree(DATA_DIR)
         console.print(f"User data folder and all of its contents [red]deleted[/red]: {DEFAULT_LIST_PATH}")
 
+    if CACHE_DIR.exists():
+        shutil.rmtree(CACHE_DIR)
+        console.print(f"Cache folder and all of its contents [red]deleted[/red]: {CACHE_DIR}")
+
     console.print("App data is cleaned")
+
+
+@debug_cli.command("startup")
+def debug_startup(
+    module: str = typer.Option(
+        "tasks.daemon.client",
+        "--module",
+        "-m",
+        help="Module which import is measured, the 'tasks' console script one by default",
+    ),
+    top: int = typer.Option(
+        20,
+        "--top",
+        "-n",
+        help="Number of the slowest modules to show",
+    ),
+    by_self: bool = typer.Option(
+        False,
+        "--self",
+        help="Sort modules by self import time instead of cumulative one",
+    ),
+    budget: float | None = typer.Option(
+        None,
+        "--budget",
+        help="Fail if the total import time exceeds this number of milliseconds",
+    ),
+) -> None:
+    """Show import time breakdown of a cold start.
+
+    Imports ``module`` in a fresh interpreter with ``-X importtime``
+    and shows the slowest modules.
+    """
+    from rich.table import Table
+
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "pass"], check=True)
+    interpreter_ms = (time.perf_counter() - started) * 1000
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if result.returncode != 0:
+        console.print(f"[red]Failed to import {module}[/red]")
+        console.print(result.stderr.splitlines()[-1] if result.stderr else "")
+        raise typer.Exit(1)
+
+    # Lines look like: "import time:       298 |        298 |   rich.screen"
+    imports: list[tuple[str, int, int, int]] = []  # name, depth, self, cumulative
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        raw_self, raw_cumulative, raw_name = line.removeprefix("import time:").split("|")
+        if not raw_self.strip().isdigit():
+            continue  # header
+        depth = (len(raw_name) - len(raw_name.lstrip()) - 1) // 2
+        imports.append((raw_name.strip(), depth, int(raw_self), int(raw_cumulative)))
+
+    total_us = sum(cumulative for _name, depth, _self, cumulative in imports if depth == 0)
+    key_index = 2 if by_self else 3
+    table = Table("Module", "Self, ms", "Cumulative, ms", "% of total")
+    for name, _depth, self_us, cumulative_us in sorted(imports, key=lambda i: i[key_index], reverse=True)[:top]:
+        table.add_row(
+            name,
+            f"{self_us / 1000:.1f}",
+            f"{cumulative_us / 1000:.1f}",
+            f"{(self_us if by_self else cumulative_us) / total_us * 100:.1f}",
+        )
+    table.title = f"Import time of {module}"
+    table.caption = f"{len(imports)} module(s)"
+    console.print(table)
+    console.print(f"Bare interpreter start-up: {interpreter_ms:.1f} ms")
+    console.print(f"Total import time: [bold]{total_us / 1000:.1f} ms[/bold]")
+
+    if budget is not None and total_us / 1000 > budget:
+        console.print(f"[bold red]Import time exceeds the budget of {budget:.1f} ms[/bold red]")
+        raise typer.Exit(1)
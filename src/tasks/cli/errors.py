@@ -1,5 +1,7 @@
 """Custom errors."""
 
+from tasks.core import InvalidTasksListError
+
 
 class CLIError(Exception):
     """Base CLI error."""
@@ -23,3 +25,28 @@ class NoTasksListsError(CLIError):
     message = "There are no tasks lists"
     advice = "Add a new tasks list using [code]tasks lists new[/code]"
     rc = 0
+
+
+class InvalidListError(CLIError):
+    """A tasks list file cannot be loaded."""
+
+    advice = "Fix the list file or use another one"
+    rc = 1
+
+    def __init__(self, error: InvalidTasksListError) -> None:
+        self.path = error.path
+        self.problems = error.problems
+        self.message = "\n".join([f"Not a valid tasks list: {error.path}", *(f"  - {p}" for p in error.problems)])
+        super().__init__(self.message)
+
+
+class DaemonRunningError(CLIError):
+    """A daemon is already running on a socket."""
+
+    advice = "Stop it using [code]tasks serve --stop[/code]"
+    rc = 1
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.message = f"A daemon is already running on {path}"
+        super().__init__(self.message)
@@ -1,19 +1,19 @@
 """CLI module to manage tasks lists."""
 
-import json
 import logging
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import typer
 from rich.console import Console
-from rich.prompt import Prompt
-from rich.table import Table
 
-from tasks.app_config import DATA_DIR, AppConfig, save_app_config
-from tasks.cli.errors import NoTasksListsError
-from tasks.cli.selector import select_menu
-from tasks.cli.utils import is_valid_json_file_path
-from tasks.core import TasksList
+from tasks.cli.errors import InvalidListError, NoActiveListError, NoTasksListsError
+from tasks.core import InvalidTasksListError, SearchIndex, SummaryCache, TasksList, load_tasks_list, open_storage, timer
+from tasks.core.storage import CODECS, DEFAULT_SUFFIXES, STORAGES, JsonStorage
+from tasks.core.storage.compression import strip_suffix
+
+if TYPE_CHECKING:
+    from tasks.app_config import AppConfig
 
 logger = logging.getLogger()
 console = Console()
@@ -29,20 +29,30 @@ def lists_callback(ctx: typer.Context) -> None:
     if ctx.invoked_subcommand is not None:
         return
 
+    from rich.table import Table
+
+    from tasks.app_config import SUMMARY_CACHE_PATH
+
     table = Table("Title", "List path", "Number of tasks", "List completion")
     config: AppConfig = ctx.obj.config
-    for list_path in config.task_lists:
-        tasks = TasksList(list_path)
-        title = f"[green]{tasks.title}[/green]" if list_path == ctx.obj.config.active_list else str(tasks.title)
+    cache = SummaryCache(SUMMARY_CACHE_PATH)
+    for list_path, summary in cache.get_many(config.task_lists).items():
+        if isinstance(summary, Exception):
+            logger.warning(f"Cannot read tasks list {list_path}: {summary!r}")
+            table.add_row("[red]Not readable[/red]", str(list_path), "-", "-")
+            continue
+        title = f"[green]{summary.title}[/green]" if list_path == ctx.obj.config.active_list else str(summary.title)
         table.add_row(
             title,
             str(list_path),
-            str(len(tasks)),
-            f"{tasks.completed_number}/{len(tasks)}",
+            str(summary.total),
+            f"{summary.done}/{summary.total}",
         )
+    cache.save()
     table.title = "Tasks lists"
     table.caption = f"{len(config.task_lists)} list(s)"
-    console.print(table)
+    with timer.phase("render"):
+        console.print(table)
 
 
 @lists_cli.command("help")
@@ -67,11 +77,27 @@ def create_new_list(
         "-a",
         help="Set new list as active after creation",
     ),
+    storage: str | None = typer.Option(
+        None,
+        "--storage",
+        "-s",
+        help=f"Storage backend of a new list ({', '.join(STORAGES)}), defaults to the one from config",
+        show_default=False,
+    ),
 ) -> None:
     """Create a new tasks list."""
+    from tasks.app_config import DATA_DIR, save_app_config
+
     config: AppConfig = ctx.obj.config
+    storage = storage or config.storage
+    if storage not in STORAGES:
+        console.print(f"Unknown storage: {storage}")
+        return
+
     console.print(f"Creating a new list with a title: {list_title}")
-    file_name = "".join(filter(lambda x: str.isalpha(x) or x == " ", list_title)) + ".json"
+    file_name = "".join(filter(lambda x: str.isalpha(x) or x == " ", list_title)) + DEFAULT_SUFFIXES[storage]
+    if config.compression == "always" and issubclass(STORAGES[storage], JsonStorage):
+        file_name += CODECS[config.compression_codec].suffix
     file_name = file_name.replace(" ", "_").lower()
     logger.debug(f"file name is {file_name}")
     list_path = Path(DATA_DIR, file_name)
@@ -79,10 +105,7 @@ def create_new_list(
     if list_path.exists():
         console.print("list already exists")
         return
-    list_path.touch()
-    list_data = {"title": list_title, "tasks": {}}
-    with list_path.open("w") as f:
-        json.dump(list_data, f)
+    open_storage(list_path).create(list_title)
     config.task_lists.append(list_path)
     if set_active:
         config.active_list = list_path
@@ -101,21 +124,16 @@ def add_tasks_list(
     ),
 ) -> None:
     """Add existing tasks list."""
+    from tasks.app_config import save_app_config
+
     config: AppConfig = ctx.obj.config
     list_path = Path(list_path).absolute().resolve()
 
-    # validate path is a json file
-    valid, message = is_valid_json_file_path(list_path)
-    if not valid:
-        console.print(f"Not a valid path: {message}")
-        return
-
-    # check if file contents are valid
+    # the file is parsed and validated at once
     try:
-        TasksList(list_path)
-    except Exception:
-        console.print("not a tasks list")
-        return
+        load_tasks_list(list_path)
+    except InvalidTasksListError as e:
+        raise InvalidListError(e) from e
 
     if list_path in config.task_lists:
         console.print("The list is already added")
@@ -130,10 +148,146 @@ def add_tasks_list(
     console.print("list added!")
 
 
+@lists_cli.command("convert")
+def convert_list(
+    ctx: typer.Context,
+    to: str = typer.Option(
+        ...,
+        "--to",
+        "-t",
+        help=f"Storage backend to convert to ({', '.join(STORAGES)})",
+    ),
+    list_path: Path | None = typer.Argument(
+        None,
+        help="A list file to convert, defaults to the active list",
+        show_default=False,
+    ),
+    output: Path | None = typer.Option(
+        None,
+        "--output",
+        "-o",
+        help="A new list file, defaults to the list file with the suffix of the new storage",
+        show_default=False,
+    ),
+    keep: bool = typer.Option(
+        False,
+        "--keep",
+        "-k",
+        help="Keep the old list file",
+    ),
+) -> None:
+    """Convert a tasks list to another storage backend.
+
+    The list is replaced with the new file in the config, and the old file
+    is deleted unless [code]--keep[/code] is given.
+    """
+    from tasks.app_config import save_app_config
+
+    config: AppConfig = ctx.obj.config
+    if to not in STORAGES:
+        console.print(f"Unknown storage: {to}")
+        return
+
+    source = list_path.absolute().resolve() if list_path else config.active_list
+    if source is None:
+        raise NoActiveListError()
+    if output is None:
+        # A compressed list stays compressed, if the new storage supports it
+        output, codec = strip_suffix(source)
+        output = output.with_suffix(DEFAULT_SUFFIXES[to])
+        if codec is not None and issubclass(STORAGES[to], JsonStorage):
+            output = output.with_name(output.name + CODECS[codec].suffix)
+    target = output.absolute().resolve()
+    if target == source or target.exists():
+        console.print(f"The new list file already exists: {target}, use --output to choose another one")
+        return
+
+    source_storage = open_storage(source)
+    with source_storage.lock():  # nobody writes to the list while it is converted
+        try:
+            tasks = load_tasks_list(source)
+        except InvalidTasksListError as e:
+            raise InvalidListError(e) from e
+        STORAGES[to](target).create(tasks.title, tasks, version=tasks.version)
+        size_before = sum(f.stat().st_size for f in source_storage.files() if f.exists())
+        if not keep:
+            source_storage.delete()
+            SearchIndex(source).delete()
+    if not keep:
+        source_storage.remove_lock()
+
+    if source in config.task_lists:
+        config.task_lists[config.task_lists.index(source)] = target
+    if config.active_list == source:
+        config.active_list = target
+    save_app_config(config)
+    console.print(
+        f"Converted {len(tasks)} task(s): {source} ({size_before} bytes) -> {target} ({target.stat().st_size} bytes)"
+    )
+
+
+@lists_cli.command("compress")
+def compress_list(
+    ctx: typer.Context,
+    list_path: Path | None = typer.Argument(
+        None,
+        help="A list file to compress, defaults to the active list",
+        show_default=False,
+    ),
+    codec: str | None = typer.Option(
+        None,
+        "--codec",
+        "-c",
+        help=f"Compression codec ({', '.join(CODECS)}), defaults to the one from config",
+        show_default=False,
+    ),
+    decompress: bool = typer.Option(
+        False,
+        "--decompress",
+        "-d",
+        help="Decompress the list file instead",
+    ),
+) -> None:
+    """Compress a tasks list file, or decompress it.
+
+    The file keeps its name and is recognized as compressed by its first bytes.
+    Compressed lists are used as usual: changes are appended to an uncompressed
+    journal, which is compressed into the list file from time to time.
+
+    To compress lists automatically, set [code]compression[/code] in the config
+    to [code]always[/code], or to [code]auto[/code] to compress lists
+    of at least [code]compression_min_size[/code] bytes.
+    """
+    config: AppConfig = ctx.obj.config
+    path = list_path.absolute().resolve() if list_path else config.active_list
+    if path is None:
+        raise NoActiveListError()
+    codec = None if decompress else codec or config.compression_codec
+    if codec is not None and codec not in CODECS:
+        console.print(f"Unknown codec: {codec}")
+        return
+
+    storage = open_storage(path)
+    if not isinstance(storage, JsonStorage):
+        console.print("Only json and binary lists can be compressed")
+        return
+
+    with storage.lock():
+        try:
+            size_before = path.stat().st_size
+            storage.compress(codec)
+        except (OSError, ValueError) as e:
+            raise InvalidListError(InvalidTasksListError(path, [str(e)])) from e
+    action = "Decompressed" if codec is None else f"Compressed with {codec}"
+    console.print(f"{action}: {path} ({size_before} -> {path.stat().st_size} bytes)")
+
 
 @lists_cli.command("select")
 def select_list(ctx: typer.Context) -> None:
     """Select a list to be active."""
+    from tasks.app_config import save_app_config
+    from tasks.cli.selector import select_menu  # Textual is heavy, import it only when needed
+
     config: AppConfig = ctx.obj.config
     if not config.task_lists:
         raise NoTasksListsError()
@@ -159,6 +313,11 @@ def delete_list(
     force: bool = typer.Option(False, "-f", help="Force the deletion, don't ask for comfirmation"),
 ) -> None:
     """Delete tasks list from a list of tasks lists."""
+    from rich.prompt import Prompt
+
+    from tasks.app_config import save_app_config
+    from tasks.cli.selector import select_menu  # Textual is heavy, import it only when needed
+
     config: AppConfig = ctx.obj.config
     if not config.task_lists:
         raise NoTasksListsError()
@@ -194,6 +353,9 @@ def delete_list(
     save_app_config(config)
 
     if delete:
-        path.unlink()
+        storage = open_storage(path)
+        storage.delete()
+        storage.remove_lock()
+        SearchIndex(path).delete()
 
     console.print(f"Tasks list deleted: {to_delete}")
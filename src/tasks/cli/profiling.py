@@ -0,0 +1,63 @@
+"""Profiling of CLI commands, see ``tasks --profile``."""
+
+import cProfile
+import time
+from pathlib import Path
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from tasks import STARTED
+from tasks.core import timer
+
+console = Console(stderr=True)
+
+PHASES = ("import", "config load", "list load", "command", "render", "save")
+"""Phases in the order they are shown."""
+
+
+def start_profiling(ctx: typer.Context, output: Path | None = None) -> None:
+    """Time phases of the invoked command and print them once it is done.
+
+    Everything but imports, config and list loading, rendering and saving
+    is counted as the command itself. Time is printed to stderr,
+    so the command output stays the same.
+
+    :param typer.Context ctx: Root command context.
+    :param Path | None output: A file to dump :mod:`cProfile` stats to, for :mod:`pstats` or ``snakeviz``.
+    """
+    started = time.perf_counter()
+    timer.enabled = True
+    timer.add("import", started - STARTED)
+
+    profile = None
+    if output is not None:
+        profile = cProfile.Profile()
+        profile.enable()
+
+    def finish() -> None:
+        total = time.perf_counter() - started
+        if profile is not None:
+            profile.disable()
+        timer.enabled = False
+        phases = {name: seconds for name, seconds in timer.times.items() if name != "import"}
+        timer.add("command", total - sum(phases.values()))
+        print_profile(timer.times, timer.calls)
+        if profile is None or output is None:
+            return
+        profile.dump_stats(output)
+        console.print(f"Profile saved to {output}, view it with [code]python -m pstats {output}[/code]")
+
+    ctx.call_on_close(finish)
+
+
+def print_profile(times: dict[str, float], calls: dict[str, int]) -> None:
+    """Print a table of time spent in each phase."""
+    total = sum(times.values())
+    table = Table("Phase", "ms", "%", "Calls", title="Profile", caption=f"{total * 1000:.1f} ms in total")
+    for name in sorted(times, key=lambda n: PHASES.index(n) if n in PHASES else len(PHASES)):
+        seconds = times[name]
+        share = seconds / total * 100 if total else 0.0
+        table.add_row(name, f"{seconds * 1000:.2f}", f"{share:.1f}", str(calls.get(name, 0)))
+    console.print(table)
@@ -0,0 +1,87 @@
+"""Printing tasks to the terminal.
+
+Used by the daemon client as well (see :mod:`tasks.daemon.client`),
+so :mod:`rich` is only imported when a table is printed.
+"""
+
+import itertools
+import sys
+from collections.abc import Iterable
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from rich.table import Table
+
+PLAIN_CHUNK = 1000
+"""Lines written at once in plain output."""
+
+TABLE_CHUNK = 1000
+"""Rows rendered at once in a table."""
+
+Row = tuple[int, str, bool]
+"""A task to print: its position in the list, title and done state."""
+
+
+def print_tasks(title: str, rows: Iterable[Row]) -> int:
+    """Print tasks of a list.
+
+    On a terminal tasks are shown in a table. Otherwise (e.g. when piped)
+    they are written as plain ``[X] title`` lines, in chunks, as rows come.
+
+    :param str title: List title.
+    :param Iterable[Row] rows: Tasks to print.
+    :return int: Number of printed tasks.
+    """
+    if sys.stdout.isatty():
+        return _print_table(title, rows)
+    return _print_plain(title, rows)
+
+
+def _print_plain(title: str, rows: Iterable[Row]) -> int:
+    out = sys.stdout
+    out.write(f"{title}\n")
+    count = 0
+    for chunk in itertools.batched(rows, PLAIN_CHUNK):
+        out.write("".join(f"[{'X' if done else ' '}] {task_title}\n" for _, task_title, done in chunk))
+        count += len(chunk)
+    out.write(f"-------------\n{count} items\n")
+    return count
+
+
+def _print_table(title: str, rows: Iterable[Row]) -> int:
+    """Print rows as a table, rendered in chunks of :data:`TABLE_CHUNK` rows.
+
+    Chunks are parts of one table without outer edges, only the first one
+    has a title and a header, so a long table is never kept in memory.
+    """
+    from rich.console import Console
+    from rich.text import Text
+
+    console = Console()
+    count = 0
+    number_width = 1
+    for chunk in itertools.batched(rows, TABLE_CHUNK):
+        # Numbers grow down the list, so the column only gets wider from chunk to chunk
+        number_width = max(number_width, *(len(str(position)) for position, _, _ in chunk))
+        table = _table(title if not count else None, number_width)
+        for position, task_title, done in chunk:
+            table.add_row(str(position), Text("✔", style="green") if done else "", Text(task_title))
+        console.print(table)
+        count += len(chunk)
+    if not count:
+        console.print(_table(title, number_width))
+    console.print(f"{count} items", style="table.caption", highlight=False)
+    return count
+
+
+def _table(title: str | None, number_width: int) -> "Table":
+    """Make a table of a chunk of rows, with a title and a header if it is the first one."""
+    from rich.table import Table
+
+    table = Table("#", "Done", "Title", title=title, title_style="bold", show_header=title is not None, show_edge=False)
+    table.columns[0].justify = "right"
+    table.columns[0].style = "dim"
+    table.columns[0].min_width = number_width
+    table.columns[1].justify = "center"
+    table.columns[1].min_width = len("Done")
+    return table
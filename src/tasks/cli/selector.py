@@ -2,90 +2,159 @@
 
 from typing import override
 
+from rich.text import Text
 from textual.app import App, ComposeResult
-from textual.reactive import reactive
-from textual.widgets import Footer, Label
+from textual.widgets import Footer, Input, Label, OptionList
+from textual.widgets.option_list import Option
+
+WORD_SEPARATORS = " /\\_-."
+"""Characters after which a word starts, for ranking matches."""
+
+
+def match_rank(option: str, query: str) -> tuple[int, int, int] | None:
+    """Rank how well an option matches a query typed by a user.
+
+    Matching is case insensitive. From the best to the worst:
+    the last path part (or word) starts with the query, a word starts
+    with the query, the query is a substring, query characters appear
+    in the option in order. Earlier and shorter matches rank higher.
+
+    :param str option: An option to match.
+    :param str query: A query typed by a user.
+    :return tuple[int, int, int] | None: A rank to sort by (lower is better),
+        None if the option does not match.
+    """
+    option = option.casefold()
+    query = query.casefold()
+    if not query:
+        return (0, 0, 0)
+
+    start = option.find(query)
+    if start >= 0:
+        last_part = option.rstrip("/\\").rsplit("/", 1)[-1]
+        if last_part.startswith(query):
+            return (0, start, len(option))
+        while start >= 0:
+            if start == 0 or option[start - 1] in WORD_SEPARATORS:
+                return (1, start, len(option))
+            start = option.find(query, start + 1)
+        return (2, option.find(query), len(option))
+
+    chars = iter(option)
+    if all(c in chars for c in query):
+        return (3, option.find(query[0]), len(option))
+    return None
+
+
+def rank_options(options: list[str], query: str) -> list[int]:
+    """Get indexes of options matching a query, best matches first.
+
+    :param list[str] options: Options to filter.
+    :param str query: A query typed by a user, empty to keep all options in order.
+    :return list[int]: Indexes of matching options.
+    """
+    if not query:
+        return list(range(len(options)))
+
+    ranked = []
+    for i, option in enumerate(options):
+        rank = match_rank(option, query)
+        if rank is not None:
+            ranked.append((rank, i))
+    ranked.sort()
+    return [i for _, i in ranked]
 
 
 class SelectorApp(App[int]):
-    """Simple CLI menu for selecting one of things from a list."""
+    """Simple CLI menu for selecting one of things from a list.
+
+    Typing filters options, best matches first. Options are shown in
+    an :class:`OptionList`, which only renders visible lines, so
+    the menu stays fast with any number of options.
+    """
 
     DEFAULT_CSS = """
     SelectorApp {
         background: green;
     }
-    .selected {
-        background: white;
-        color: grey 80%;
-    }
-    .default {
-        color: green;
+    SelectorApp > OptionList {
+        height: 1fr;
     }
     """
 
     BINDINGS = [
-        ("j", "select_next", "Select next item"),
         ("down", "select_next", "Select next item"),
-        ("k", "select_prev", "Select previous item"),
         ("up", "select_prev", "Select previous item"),
+        ("pagedown", "page_down", "Next page"),
+        ("pageup", "page_up", "Previous page"),
         ("enter", "submit", "Sumbit selection"),
-        ("q", "quit_selection", "Quit selection"),
+        ("escape", "quit_selection", "Quit selection"),
     ]
 
-    selected: reactive[int] = reactive(0)
-
     def __init__(self, options: list[str], prompt: str, default: int) -> None:
         super().__init__()
         self.options = options
         self.prompt = prompt
         self.default = default
         assert default >= -1, "Default value must be >= -1"
-        self.set_reactive(SelectorApp.selected, max(default, 0))
 
     @override
     def compose(self) -> ComposeResult:
         yield Label(f"{self.prompt}:")
-        for i, option in enumerate(self.options):
-            classes = ""
-            if i == self.selected:
-                classes += " selected"
-            if i == self.default:
-                classes += " default"
-            label = Label(option, id=f"item-{i}", classes=classes)
-            yield label
+        yield Input(placeholder="Type to filter...")
+        yield OptionList(*self._make_options(range(len(self.options))))
         yield Footer(show_command_palette=False)
 
+    def on_mount(self) -> None:  # noqa: D102
+        self.query_one(OptionList).highlighted = max(self.default, 0) if self.options else None
+        self.query_one(Input).focus()
+
+    def on_input_changed(self, event: Input.Changed) -> None:
+        """Filter options as a user types."""
+        option_list = self.query_one(OptionList)
+        option_list.clear_options()
+        option_list.add_options(self._make_options(rank_options(self.options, event.value)))
+        option_list.highlighted = 0 if option_list.option_count else None
+
+    def on_input_submitted(self) -> None:  # noqa: D102
+        self.action_submit()
+
+    def on_option_list_option_selected(self, event: OptionList.OptionSelected) -> None:  # noqa: D102
+        self.exit(int(event.option.id))  # type: ignore
+
     def action_select_next(self) -> None:
         """Select next option."""
-        if self.selected < len(self.options) - 1:
-            self.selected += 1
+        self.query_one(OptionList).action_cursor_down()
 
     def action_select_prev(self) -> None:
         """Select previous option."""
-        if self.selected > 0:
-            self.selected -= 1
+        self.query_one(OptionList).action_cursor_up()
+
+    async def action_page_down(self) -> None:
+        """Select an option a page below."""
+        await self.query_one(OptionList).run_action("page_down")
+
+    async def action_page_up(self) -> None:
+        """Select an option a page above."""
+        await self.query_one(OptionList).run_action("page_up")
 
     def action_submit(self) -> None:
         """Submit selection."""
-        self.exit(self.selected)
+        option_list = self.query_one(OptionList)
+        if option_list.highlighted is None:
+            return
+        self.exit(int(option_list.get_option_at_index(option_list.highlighted).id))  # type: ignore
 
     def action_quit_selection(self) -> None:
         """Quit selection."""
         self.exit(None)
 
-    def watch_selected(self, old: int, new: int) -> None:
-        """Change options highliting when ``self.selected`` changes."""
-        old_label: Label = self.query_one(f"#item-{old}")  # type: ignore
-        if old == self.default:
-            old_label.classes = "default"
-        else:
-            old_label.classes = ""
-
-        new_label: Label = self.query_one(f"#item-{self.selected}")  # type: ignore
-        if new == self.default:
-            new_label.classes = "selected default"
-        else:
-            new_label.classes = "selected"
+    def _make_options(self, indexes: range | list[int]) -> list[Option]:
+        """Make list options, keeping original option indexes as their ids."""
+        return [
+            Option(Text(self.options[i], style="green") if i == self.default else self.options[i], id=str(i))
+            for i in indexes
+        ]
 
 
 def select_menu(options: list[str], prompt: str = "Select an option", default: int = -1) -> str | None:
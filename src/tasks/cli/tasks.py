@@ -1,13 +1,16 @@
 """CLI Module to manage tasks in currently selected list."""
 
 import logging
+import sys
+from typing import Any
 
 import typer
+import typer.main
 from rich import print  # noqa: A004
 from rich.console import Console
 
-from tasks.core import TasksList
-from tasks.tui import TasksApp
+from tasks.cli.errors import NoActiveListError
+from tasks.core import TasksList, timer
 
 console = Console()
 logger = logging.getLogger()
@@ -27,37 +30,255 @@ def cli_help(ctx: typer.Context) -> None:
 @tasks_cli.command("tui")
 def cli_tui(ctx: typer.Context) -> None:
     """Open a TUI application."""
+    from tasks.tui import TasksApp  # Textual is heavy, import it only when needed
+
     tasks: TasksList = ctx.obj.tasks
     TasksApp(tasks).run()
 
 
+@tasks_cli.command("serve")
+def serve(
+    stop: bool = typer.Option(
+        False,
+        "--stop",
+        help="Stop a running daemon",
+    ),
+) -> None:
+    """Run a daemon keeping tasks lists in memory.
+
+    While the daemon runs, [code]ls[/code], [code]add[/code] and [code]pick[/code]
+    are sent to it over a Unix socket instead of reading list files,
+    which makes them several times faster. Set TASKS_NO_DAEMON=1
+    to access list files directly anyway.
+    """
+    from tasks.daemon import DaemonClient, socket_path
+
+    if stop:
+        client = DaemonClient.connect()
+        if client is None:
+            print("No daemon is running")
+            return
+        with client:
+            client.request("stop")
+        print("Daemon stopped")
+        return
+
+    from tasks.daemon.server import serve as serve_daemon
+
+    console.print(f"Serving on {socket_path()}, press Ctrl+C to stop")
+    serve_daemon()
+
+
 @tasks_cli.command("ls")
-def list_tasks(ctx: typer.Context) -> None:
-    """List all tasks."""
-    tasks: TasksList = ctx.obj.tasks
-    console.print(f"[bold]{tasks.title}[/bold]")
-    for task in tasks:
-        done = "X" if task.done else " "
-        print(f"[{done}] {task.title}")
+def list_tasks(
+    ctx: typer.Context,
+    limit: int | None = typer.Option(
+        None,
+        "--limit",
+        "-n",
+        min=0,
+        help="Show at most this many tasks",
+        show_default=False,
+    ),
+    offset: int = typer.Option(
+        0,
+        "--offset",
+        min=0,
+        help="Skip this many (matching) tasks",
+    ),
+    done: bool | None = typer.Option(
+        None,
+        "--done/--pending",
+        help="Only show done or pending tasks",
+        show_default=False,
+    ),
+    match: str | None = typer.Option(
+        None,
+        "--match",
+        "-m",
+        help="Only show tasks with this substring in titles (case insensitive)",
+        show_default=False,
+    ),
+    regex: bool = typer.Option(
+        False,
+        "--regex",
+        "-r",
+        help="Treat --match as a regular expression",
+    ),
+) -> None:
+    """List tasks.
+
+    Tasks are filtered and printed as they are read from the list file,
+    and reading stops after the last shown task, so e.g.
+    [code]tasks ls --pending -n 20[/code] is cheap for lists of any size.
+    On a terminal tasks are shown in a table, otherwise as plain lines.
+    """
+    import re
+
+    from tasks.core import TaskQuery, select_tasks
+
+    from .render import print_tasks
+
+    query = None
+    if done is not None or match:
+        try:
+            query = TaskQuery(match, regex=regex, done=done)
+        except re.error as e:
+            raise typer.BadParameter(f"Not a valid regular expression: {e}", param_hint="--match") from e
+
+    title, tasks = ctx.obj.stream_tasks()
+    selected = select_tasks(tasks, query, offset=offset, limit=limit)
+    rows = ((position, task.title, task.done) for position, task in selected)
+    with timer.phase("render"):  # reading tasks in between is timed as list load
+        print_tasks(title, rows)
+
+
+@tasks_cli.command("search")
+def search_tasks(
+    ctx: typer.Context,
+    query: list[str] = typer.Argument(..., help="Words to search for in task titles"),
+    fuzzy: bool = typer.Option(
+        False,
+        "--fuzzy",
+        "-f",
+        help="Also match words similar to query words, e.g. with typos",
+    ),
+    limit: int = typer.Option(
+        20,
+        "--limit",
+        "-n",
+        help="Maximal number of found tasks to show",
+    ),
+) -> None:
+    """Search tasks by title.
+
+    Finds tasks with all query words (or words starting with them)
+    in titles, best matches first. A search index is built
+    next to the list file on the first search.
+    """
+    hits = ctx.obj.search_tasks(" ".join(query), fuzzy=fuzzy, limit=limit)
+    with timer.phase("render"):
+        for hit in hits:
+            done = "X" if hit.task.done else " "
+            print(f"[{done}] {hit.task.title}")
+        print("-------------")
+        print(f"{len(hits)} found")
+
+
+@tasks_cli.command("find")
+def find_tasks(
+    ctx: typer.Context,
+    title: str | None = typer.Argument(
+        None,
+        help="A substring to search for in task titles",
+        show_default=False,
+    ),
+    all_lists: bool = typer.Option(
+        False,
+        "--all",
+        "-a",
+        help="Search in all tasks lists, not only in the active one",
+    ),
+    regex: bool = typer.Option(
+        False,
+        "--regex",
+        "-r",
+        help="Treat the title as a regular expression",
+    ),
+    case_sensitive: bool = typer.Option(
+        False,
+        "--case-sensitive",
+        "-c",
+        help="Match the title case sensitively",
+    ),
+    done: bool | None = typer.Option(
+        None,
+        "--done/--pending",
+        help="Only find done or pending tasks",
+        show_default=False,
+    ),
+) -> None:
+    """Find tasks by title and done state.
+
+    Lists are scanned concurrently and found tasks are printed
+    as soon as a list is scanned. Lists which cannot have
+    matching tasks (judging by their summaries) are not scanned at all.
+    """
+    import re
+
+    from tasks.app_config import SUMMARY_CACHE_PATH
+    from tasks.core import SummaryCache, TaskQuery, find_in_lists
+
+    try:
+        query = TaskQuery(title, regex=regex, case_sensitive=case_sensitive, done=done)
+    except re.error as e:
+        raise typer.BadParameter(f"Not a valid regular expression: {e}", param_hint="TITLE") from e
+
+    config = ctx.obj.config
+    if all_lists:
+        paths = config.task_lists
+    elif config.active_list is not None:
+        paths = [config.active_list]
+    else:
+        raise NoActiveListError()
+
+    cache = SummaryCache(SUMMARY_CACHE_PATH)
+    found_total = 0
+    lists_with_found = 0
+    try:
+        for path, summary, found in find_in_lists(paths, query, cache=cache):
+            if isinstance(found, Exception):
+                logger.warning(f"Cannot read tasks list {path}: {found!r}")
+                continue
+            if not found:
+                continue
+            with timer.phase("render"):
+                console.print(f"[bold]{summary.title}[/bold] ({path})")
+                for task in found:
+                    mark = "X" if task.done else " "
+                    print(f"[{mark}] {task.title}")
+            found_total += len(found)
+            lists_with_found += 1
+    finally:
+        cache.save()
     print("-------------")
-    print(f"{len(tasks)} items")
+    print(f"{found_total} found in {lists_with_found} list(s)")
 
 
 @tasks_cli.command("add")
 def add_task(
     ctx: typer.Context,
-    title: str = typer.Option(
-        "",
+    titles: list[str] | None = typer.Argument(
+        None,
+        help="Titles of tasks to add. Use '-' to read titles from stdin, one per line",
+        show_default=False,
+    ),
+    title: list[str] = typer.Option(
+        [],
         "--title",
         "-t",
-        help="Immediatly add a title to a task",
+        help="Immediatly add a title to a task (can be repeated)",
     ),
 ) -> None:
-    """Add a new task to a task list."""
+    """Add new tasks to a task list.
+
+    All tasks are saved at once, with a single write.
+    """
     tasks: TasksList = ctx.obj.tasks
-    if not title:
-        title = input("Add task title: ")
-    tasks.add(title)
+    new_titles: list[str] = []
+    for t in [*(titles or []), *title]:
+        if t == "-":
+            new_titles.extend(line.strip() for line in sys.stdin if line.strip())
+        else:
+            new_titles.append(t)
+
+    if not new_titles:
+        new_titles.append(input("Add task title: "))
+
+    with tasks.batch():
+        for t in new_titles:
+            tasks.add(t)
+    logger.info(f"Added {len(new_titles)} task(s)")
 
 
 @tasks_cli.command("pick")
@@ -69,9 +290,10 @@ def pick_task(ctx: typer.Context) -> None:
         print("No tasks")
         return
 
-    for i, task in enumerate(tasks):
-        done = "X" if task.done else " "
-        print(f"[{i}]: [{done}] {task.title}")
+    with timer.phase("render"):
+        for i, task in enumerate(tasks):
+            done = "X" if task.done else " "
+            print(f"[{i}]: [{done}] {task.title}")
 
     try:
         index = input("Pick a task number (q to quit): ")
@@ -85,7 +307,7 @@ def pick_task(ctx: typer.Context) -> None:
         print("Invalid task number")
         return
 
-    action = input("[d]elete / [e]dit title / [c]hange done: ")
+    action = input("[d]elete / [e]dit title / [c]hange done / [m]ove: ")
 
     if action == "d":
         message = f"Deleted: {task.title}"
@@ -109,4 +331,44 @@ def pick_task(ctx: typer.Context) -> None:
         print(message)
         return
 
+    if action == "m":
+        try:
+            position = int(input("New task number: "))
+        except ValueError:
+            print("Invalid task number")
+            return
+        tasks.move(task.id, position)
+        print(f"Moved: {task.title} -> [{tasks.index(task.id)}]")
+        return
+
     print("Invalid action")
+
+
+def parse_command(args: list[str]) -> tuple[str, dict[str, Any]] | None:
+    """Parse arguments of a command of this module the same way the CLI does.
+
+    The daemon parses ``ls`` and ``add`` sent by its clients with this,
+    so they take exactly the options defined here.
+
+    :param list[str] args: Command name and its arguments, e.g. ``["ls", "-n", "5"]``.
+    :return tuple[str, dict[str, Any]] | None: Command name and its parameters by names,
+        None if arguments are not valid or ask for help, then the full CLI has to handle them.
+    """
+    if not args:
+        return None
+    name, *rest = args
+
+    group = typer.main.get_command(tasks_cli)
+    ctx = typer.Context(group, info_name="tasks")
+    command = group.get_command(ctx, name)  # type: ignore[attr-defined]
+    if command is None:
+        return None
+    options = rest[: rest.index("--")] if "--" in rest else rest
+    if set(options) & set(command.get_help_option_names(ctx)):
+        return None
+
+    try:
+        command_ctx = command.make_context(name, rest, parent=ctx)
+    except (typer.TyperException, typer.Exit):
+        return None
+    return name, command_ctx.params
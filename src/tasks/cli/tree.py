@@ -1,8 +1,6 @@
-"""Various utilities."""
+"""Files tree printing."""
 
-import json
 from pathlib import Path
-from typing import Any
 
 from rich import print  # noqa: A004
 from rich.console import Console
@@ -12,32 +10,6 @@ from rich.text import Text
 from rich.tree import Tree
 
 
-def is_valid_json_file_path(path: Any) -> tuple[bool, str]:  # noqa: ANN401
-    """Check if a file at ``path`` is a valid json.
-
-    :param Any path: File path to validate.
-    :return bool: True if ``path`` is a path to a valid
-        json file, False otherwise.
-    """
-    try:
-        path = Path(path)
-    except Exception:
-        return False, "Not a path"
-
-    if not path.exists():
-        return False, "Not exsists"
-
-    if not path.is_file():
-        return False, "Not a file"
-
-    try:
-        with path.open("r") as f:
-            json.load(f)
-        return True, ""
-    except Exception:
-        return False, "Not a valid json"
-
-
 # This is taken from: https://github.com/textualize/rich/blob/master/examples/tree.py
 def walk_directory(directory: Path, tree: Tree) -> None:
     """Recursively build a Tree with directory contents."""
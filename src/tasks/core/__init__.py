@@ -1,4 +1,26 @@
 """Core of application for handling tasks."""
 
+from .errors import InvalidTasksListError as InvalidTasksListError
+from .loader import list_file_error as list_file_error
+from .loader import load_lists as load_lists
+from .loader import load_many as load_many
+from .loader import load_summaries as load_summaries
+from .loader import load_tasks_list as load_tasks_list
+from .profiling import PhaseTimer as PhaseTimer
+from .profiling import timer as timer
+from .query import TaskQuery as TaskQuery
+from .query import find_in_lists as find_in_lists
+from .query import find_tasks as find_tasks
+from .query import select_tasks as select_tasks
+from .search import SearchHit as SearchHit
+from .search import SearchIndex as SearchIndex
+from .search import search_tasks as search_tasks
+from .storage import CompressionPolicy as CompressionPolicy
+from .storage import ListSummary as ListSummary
+from .storage import open_storage as open_storage
+from .summary import read_summary as read_summary
+from .summary import stream_tasks as stream_tasks
+from .summary_cache import SummaryCache as SummaryCache
 from .task import Task as Task
 from .tasks_list import TasksList as TasksList
+from .watch import FileWatcher as FileWatcher
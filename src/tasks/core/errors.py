@@ -0,0 +1,16 @@
+"""Core errors."""
+
+from pathlib import Path
+
+
+class InvalidTasksListError(ValueError):
+    """A tasks list file cannot be loaded."""
+
+    def __init__(self, path: Path, problems: list[str]) -> None:
+        self.path = path
+        self.problems = problems
+        super().__init__(f"Not a valid tasks list {path}: {'; '.join(problems)}")
+
+    def __reduce__(self) -> tuple[type, tuple[Path, list[str]]]:  # noqa: D105
+        # Errors raised in a process pool are pickled to be sent back
+        return type(self), (self.path, self.problems)
@@ -0,0 +1,136 @@
+"""Append-only journal of tasks list mutations."""
+
+import json
+import logging
+import os
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger()
+
+Record = dict[str, Any]
+"""A single journal record, e.g. ``{"op": "delete", "id": "..."}``."""
+
+JOURNAL_SUFFIX = ".journal"
+"""Suffix appended to a list file path to get its journal path."""
+
+
+def journal_path(list_path: Path) -> Path:
+    """Get a journal file path for a tasks list file.
+
+    :param Path list_path: Tasks list file path.
+    :return Path: Journal file path next to the list file.
+    """
+    return list_path.with_name(list_path.name + JOURNAL_SUFFIX)
+
+
+class Journal:
+    """An append-only log of mutations stored next to a tasks list file.
+
+    Each record is a single line of compact json, so appending a record
+    costs O(size of the change) no matter how big the list is.
+    """
+
+    def __init__(self, list_path: Path) -> None:
+        self.path = journal_path(list_path)
+
+    @property
+    def size(self) -> int:
+        """Journal size in bytes (0 if the journal does not exist)."""
+        try:
+            return self.path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def append(self, records: Iterable[Record]) -> None:
+        """Append records to the journal with a single write.
+
+        If the journal ends with a torn line (e.g. after a crash in the middle
+        of a write), records start on a new line, so they are not glued to it.
+
+        :param Iterable[Record] records: Records to append.
+        """
+        data = "".join(json.dumps(r, separators=(",", ":")) + "\n" for r in records).encode("utf-8")
+        if not data:
+            return
+        with self.path.open("a+b") as f:
+            if f.seek(0, os.SEEK_END) > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    data = b"\n" + data
+            f.write(data)
+
+    def read(self) -> list[Record]:
+        """Read all records from the journal.
+
+        Corrupted lines, such as a torn line left by a crash in the middle
+        of a write, are skipped with a warning.
+
+        :return list[Record]: Journal records in order of appending.
+        """
+        try:
+            with self.path.open("rb") as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return []
+
+        records = []
+        for line in lines:
+            try:
+                records.append(json.loads(line))
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                logger.warning(f"Skipping a corrupted journal record in {self.path}")
+        return records
+
+    def read_from(self, offset: int) -> tuple[list[Record], int]:
+        """Read records appended after a given offset.
+
+        Only complete lines are read, so a record which is being
+        written right now is left for the next call.
+
+        :param int offset: Offset (in bytes) to read from, e.g. returned by a previous call.
+        :return tuple[list[Record], int]: Records and an offset to read the next records from.
+        """
+        try:
+            with self.path.open("rb") as f:
+                f.seek(offset)
+                data = f.read()
+        except FileNotFoundError:
+            return [], offset
+
+        end = data.rfind(b"\n") + 1
+        records = []
+        for line in data[:end].splitlines():
+            try:
+                records.append(json.loads(line))
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                logger.warning(f"Skipping a corrupted journal record in {self.path}")
+        return records, offset + end
+
+    def last(self, max_bytes: int = 4096) -> Record | None:
+        """Read the last record without reading the whole journal.
+
+        :param int max_bytes: How many bytes to read from the end of the journal.
+        :return Record | None: The last record, or None if the journal is empty
+            or its last record is not readable.
+        """
+        try:
+            with self.path.open("rb") as f:
+                size = f.seek(0, 2)
+                f.seek(max(size - max_bytes, 0))
+                tail = f.read()
+        except FileNotFoundError:
+            return None
+
+        lines = tail.splitlines()
+        if not lines:
+            return None
+        try:
+            return json.loads(lines[-1])
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return None
+
+    def clear(self) -> None:
+        """Remove the journal."""
+        self.path.unlink(missing_ok=True)
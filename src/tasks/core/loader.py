@@ -0,0 +1,150 @@
+"""Concurrent loading of many tasks lists."""
+
+import contextlib
+import os
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Literal
+
+from .errors import InvalidTasksListError
+from .storage import CompressionPolicy, ListSummary
+from .summary import read_summary
+from .tasks_list import TasksList
+
+Mode = Literal["auto", "thread", "process"]
+
+PROCESS_POOL_MIN_BYTES = 16 * 1024 * 1024
+"""Total size of lists files above which ``auto`` mode parses lists in processes."""
+
+
+def load_many[T](
+    func: Callable[[Path], T],
+    paths: Iterable[Path | str],
+    *,
+    mode: Mode = "auto",
+    max_workers: int | None = None,
+    ordered: bool = True,
+) -> Iterator[tuple[Path, T | Exception]]:
+    """Call ``func`` for many list paths concurrently.
+
+    Threads are good when time goes to file I/O, while processes
+    are good when it goes to parsing (which holds the GIL). In ``auto``
+    mode processes are used when there are several lists and they are big.
+
+    ``func`` must be picklable (e.g. a module level function or a class)
+    to be used in processes, as well as its results.
+
+    :param Callable[[Path], T] func: A function to call for every path.
+    :param Iterable[Path | str] paths: Tasks lists file paths.
+    :param Mode mode: Use a ``thread`` pool, a ``process`` pool or pick one (``auto``).
+    :param int | None max_workers: Maximum number of concurrent calls,
+        defaults to a number based on the number of CPUs.
+    :param bool ordered: Yield results in order of ``paths``,
+        otherwise yield them as soon as they are ready.
+    :return Iterator[tuple[Path, T | Exception]]: Pairs of a path and either
+        a result or an exception raised by ``func``.
+    """
+    resolved = [Path(p) for p in paths]
+    if not resolved:
+        return
+
+    cpus = os.cpu_count() or 1
+    if mode == "auto":
+        parsing_dominates = _total_size(resolved) >= PROCESS_POOL_MIN_BYTES
+        mode = "process" if cpus > 1 and len(resolved) > 1 and parsing_dominates else "thread"
+
+    if max_workers is None:
+        max_workers = cpus if mode == "process" else min(32, cpus + 4)
+    max_workers = max(1, min(max_workers, len(resolved)))
+
+    executor: Executor
+    if mode == "process":
+        executor = ProcessPoolExecutor(max_workers=max_workers)
+    else:
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tasks-loader")
+
+    with executor:
+        futures = {executor.submit(func, path): path for path in resolved}
+        for future in futures if ordered else as_completed(futures):
+            result = _result(future)
+            yield futures[future], result
+
+
+def load_tasks_list(path: Path | str, *, compression: CompressionPolicy | None = None) -> TasksList:
+    """Load and validate a tasks list, parsing its file once.
+
+    :param Path | str path: Tasks list file path.
+    :param CompressionPolicy | None compression: When to compress the list file when it is rewritten.
+    :raises InvalidTasksListError: The file is missing, unreadable or
+        is not a valid tasks list. Its ``problems`` tell what exactly is wrong.
+    :return TasksList: A loaded tasks list.
+    """
+    path = Path(path)
+    try:
+        return TasksList(path, compression=compression)
+    except (OSError, UnicodeDecodeError) as e:
+        raise list_file_error(path, e) from e
+
+
+def list_file_error(path: Path, error: OSError | UnicodeDecodeError) -> InvalidTasksListError:
+    """Describe why a list file cannot be read.
+
+    :param Path path: Tasks list file path.
+    :param OSError | UnicodeDecodeError error: An error raised while reading the file.
+    :return InvalidTasksListError: An error to raise instead.
+    """
+    if isinstance(error, FileNotFoundError):
+        problem = "File does not exist"
+    elif isinstance(error, IsADirectoryError):
+        problem = "Not a file"
+    elif isinstance(error, PermissionError):
+        problem = "Permission denied"
+    elif isinstance(error, UnicodeDecodeError):
+        problem = f"Not a text file: {error.reason}"
+    else:
+        problem = error.strerror or str(error)
+    return InvalidTasksListError(path, [problem])
+
+
+def load_lists(
+    paths: Iterable[Path | str],
+    *,
+    mode: Mode = "auto",
+    max_workers: int | None = None,
+    ordered: bool = True,
+) -> Iterator[tuple[Path, TasksList | Exception]]:
+    """Load many tasks lists concurrently.
+
+    Keyword arguments are the same as of :func:`load_many`.
+    """
+    return load_many(load_tasks_list, paths, mode=mode, max_workers=max_workers, ordered=ordered)
+
+
+def load_summaries(
+    paths: Iterable[Path | str],
+    *,
+    mode: Mode = "auto",
+    max_workers: int | None = None,
+    ordered: bool = True,
+) -> Iterator[tuple[Path, ListSummary | Exception]]:
+    """Read many tasks lists summaries concurrently.
+
+    Keyword arguments are the same as of :func:`load_many`.
+    """
+    return load_many(read_summary, paths, mode=mode, max_workers=max_workers, ordered=ordered)
+
+
+def _result[T](future: Future[T]) -> T | Exception:
+    try:
+        return future.result()
+    except Exception as e:
+        return e
+
+
+def _total_size(paths: list[Path]) -> int:
+    total = 0
+    for path in paths:
+        with contextlib.suppress(OSError):
+            total += path.stat().st_size
+    return total
@@ -0,0 +1,114 @@
+"""Inter-process file locks."""
+
+import os
+import time
+from pathlib import Path
+from types import TracebackType
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore
+    import msvcrt
+
+LOCK_SUFFIX = ".lock"
+"""Suffix appended to a list file path to get its lock file path."""
+
+
+def lock_path(list_path: Path) -> Path:
+    """Get a lock file path for a tasks list file.
+
+    :param Path list_path: Tasks list file path.
+    :return Path: Lock file path next to the list file.
+    """
+    return list_path.with_name(list_path.name + LOCK_SUFFIX)
+
+
+class LockTimeoutError(TimeoutError):
+    """A lock was not acquired in time."""
+
+
+class FileLock:
+    """An exclusive advisory lock held on a separate lock file.
+
+    The lock is held by an open file (``flock`` on POSIX, ``msvcrt.locking``
+    on Windows), so it is released by the OS if a process dies. Lock files
+    are never removed while in use, as removing them would let two processes
+    lock two different files.
+
+    .. code-block:: python
+
+        with FileLock(lock_path(path)):
+            ...
+    """
+
+    def __init__(self, path: Path, *, timeout: float | None = None, poll_interval: float = 0.01) -> None:
+        self.path = path
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self._fd: int | None = None
+
+    @property
+    def locked(self) -> bool:
+        """Check if the lock is held by this instance."""
+        return self._fd is not None
+
+    def acquire(self) -> None:
+        """Acquire the lock, waiting for other holders to release it.
+
+        :raises LockTimeoutError: The lock was not acquired in ``timeout`` seconds.
+        """
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        try:
+            while not self._try_lock(fd, blocking=deadline is None):
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise LockTimeoutError(f"Cannot lock {self.path} in {self.timeout} seconds")
+                time.sleep(self.poll_interval)
+        except BaseException:
+            os.close(fd)
+            raise
+        self._fd = fd
+
+    def release(self) -> None:
+        """Release the lock."""
+        if self._fd is None:
+            return
+        fd, self._fd = self._fd, None
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(fd)
+
+    def __enter__(self) -> "FileLock":  # noqa: D105
+        self.acquire()
+        return self
+
+    def __exit__(  # noqa: D105
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.release()
+
+    @staticmethod
+    def _try_lock(fd: int, *, blocking: bool) -> bool:
+        if fcntl is not None:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return False
+            return True
+
+        os.lseek(fd, 0, os.SEEK_SET)
+        try:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        except OSError:
+            # msvcrt cannot wait forever, so a blocking lock is polled by the caller
+            return False
+        return True
@@ -0,0 +1,73 @@
+"""Timing of command phases, see ``tasks --profile``."""
+
+import threading
+import time
+from collections.abc import Generator, Iterable, Iterator
+from contextlib import contextmanager
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+class PhaseTimer:
+    """Accumulate time spent in named phases.
+
+    Phases may be nested, then an outer phase does not include
+    inner ones, so phase times add up. Nothing is measured unless
+    the timer is enabled, and a disabled timer costs a single check.
+
+    .. code-block:: python
+
+        with timer.phase("list load"):
+            ...
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.times: dict[str, float] = {}
+        self.calls: dict[str, int] = {}
+        self._local = threading.local()
+
+    @contextmanager
+    def phase(self, name: str) -> Generator[None]:
+        """Measure a block of code as a part of a phase."""
+        if not self.enabled:
+            yield
+            return
+
+        stack: list[float] = self._local.__dict__.setdefault("stack", [])
+        stack.append(0.0)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            inner = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            self.add(name, elapsed - inner)
+
+    def iterate(self, name: str, items: Iterable[T]) -> Iterable[T]:
+        """Measure getting every item of an iterable as a part of a phase, e.g. reading a streamed list."""
+        if not self.enabled:
+            return items
+        return self._iterate(name, iter(items))
+
+    def add(self, name: str, seconds: float) -> None:
+        """Add time measured elsewhere to a phase."""
+        self.times[name] = self.times.get(name, 0.0) + seconds
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    def _iterate(self, name: str, items: Iterator[T]) -> Iterator[T]:
+        while True:
+            with self.phase(name):
+                item = next(items, _END)
+            if item is _END:
+                return
+            yield item  # type: ignore
+
+
+_END = object()
+
+timer = PhaseTimer()
+"""The timer of the running command."""
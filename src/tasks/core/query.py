@@ -0,0 +1,140 @@
+"""Queries over tasks of many lists."""
+
+import itertools
+import logging
+import re
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+
+from .loader import Mode, load_many, load_summaries
+from .search import SearchIndex
+from .storage import ListSummary, normalize_fingerprint, open_storage
+from .summary_cache import SummaryCache
+from .task import Task
+
+logger = logging.getLogger()
+
+
+@dataclass(frozen=True)
+class TaskQuery:
+    """Conditions a task has to meet to be found.
+
+    :param str | None title: A substring (or a regular expression,
+        if ``regex`` is set) to search for in task titles.
+    :param bool regex: Treat ``title`` as a regular expression.
+    :param bool case_sensitive: Match ``title`` case sensitively.
+    :param bool | None done: Only find done (True) or pending (False) tasks.
+    """
+
+    title: str | None = None
+    regex: bool = False
+    case_sensitive: bool = False
+    done: bool | None = None
+
+    def __post_init__(self) -> None:
+        """Compile the title pattern to fail early if it is invalid."""
+        self._pattern()
+
+    def matches(self, task: Task) -> bool:
+        """Check if a task meets the query conditions."""
+        if self.done is not None and task.done != self.done:
+            return False
+        pattern = self._pattern()
+        return pattern is None or pattern.search(task.title) is not None
+
+    def may_match(self, summary: ListSummary) -> bool:
+        """Check if a list with such a summary may have matching tasks at all."""
+        if self.done is None:
+            return summary.total > 0
+        return (summary.done if self.done else summary.total - summary.done) > 0
+
+    def _pattern(self) -> re.Pattern | None:
+        """Get a compiled title pattern (cached by :mod:`re`).
+
+        :raises re.error: ``title`` is not a valid regular expression.
+        """
+        if not self.title:
+            return None
+        pattern = self.title if self.regex else re.escape(self.title)
+        return re.compile(pattern, 0 if self.case_sensitive else re.IGNORECASE)
+
+
+def select_tasks(
+    tasks: Iterable[Task],
+    query: TaskQuery | None = None,
+    *,
+    offset: int = 0,
+    limit: int | None = None,
+) -> Iterator[tuple[int, Task]]:
+    """Filter and paginate tasks while they are iterated.
+
+    Nothing is taken from ``tasks`` after the last selected task,
+    so the first page of a streamed list only reads the list up to it.
+
+    :param Iterable[Task] tasks: Tasks in list order, e.g. from :func:`stream_tasks`.
+    :param TaskQuery | None query: Conditions tasks have to meet, None to select all tasks.
+    :param int offset: Number of matching tasks to skip.
+    :param int | None limit: Maximal number of tasks to select, None for no limit.
+    :return Iterator[tuple[int, Task]]: Positions of selected tasks in the list, and the tasks.
+    """
+    selected: Iterator[tuple[int, Task]] = enumerate(tasks)
+    if query is not None:
+        selected = ((position, task) for position, task in selected if query.matches(task))
+    return itertools.islice(selected, offset, None if limit is None else offset + limit)
+
+
+def find_tasks(path: Path | str, query: TaskQuery) -> list[Task]:
+    """Find tasks of a single list.
+
+    If the list has a fresh search index, tasks are read from the index
+    instead of parsing the list. Either way they come in list order.
+
+    :param Path | str path: Tasks list file path.
+    :param TaskQuery query: Conditions tasks have to meet.
+    :return list[Task]: Found tasks in list order.
+    """
+    storage = open_storage(path)
+    index = SearchIndex(path)
+    if index.exists and index.fingerprint() == normalize_fingerprint(storage.fingerprint()):
+        tasks = index.tasks(done=query.done)
+    else:
+        _, tasks = storage.stream()
+    return [task for task in tasks if query.matches(task)]
+
+
+def find_in_lists(
+    paths: Iterable[Path | str],
+    query: TaskQuery,
+    *,
+    cache: SummaryCache | None = None,
+    mode: Mode = "auto",
+) -> Iterator[tuple[Path, ListSummary, list[Task] | Exception]]:
+    """Find tasks in many lists, scanning them concurrently.
+
+    Results are yielded as soon as each list is scanned. Lists which
+    cannot have matching tasks according to their (cached) summaries,
+    e.g. lists without done tasks when looking for done ones, are not scanned.
+    Lists which summaries cannot be read are skipped with a warning.
+
+    :param Iterable[Path | str] paths: Tasks lists file paths.
+    :param TaskQuery query: Conditions tasks have to meet.
+    :param SummaryCache | None cache: A cache of lists summaries, if any.
+    :param Mode mode: Concurrency mode (see :func:`load_many`).
+    :return Iterator[tuple[Path, ListSummary, list[Task] | Exception]]: List paths,
+        their summaries and found tasks (or errors raised while scanning them).
+    """
+    paths = [Path(p) for p in paths]
+    summaries = cache.get_many(paths, mode=mode) if cache is not None else dict(load_summaries(paths, mode=mode))
+
+    to_scan = {}
+    for path, summary in summaries.items():
+        if isinstance(summary, Exception):
+            logger.warning(f"Cannot read tasks list {path}: {summary!r}")
+        elif query.may_match(summary):
+            to_scan[path] = summary
+    logger.debug(f"Scanning {len(to_scan)} of {len(paths)} list(s)")
+
+    for path, found in load_many(partial(find_tasks, query=query), to_scan, mode=mode, ordered=False):
+        yield path, to_scan[path], found
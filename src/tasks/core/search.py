@@ -0,0 +1,346 @@
+"""Full-text search over task titles."""
+
+import json
+import logging
+import re
+import sqlite3
+from collections.abc import Generator, Iterable, Iterator
+from contextlib import closing, contextmanager
+from pathlib import Path
+from typing import NamedTuple
+
+from .journal import Record
+from .storage import normalize_fingerprint, open_storage
+from .storage.sqlite_storage import position_at
+from .task import Task
+
+logger = logging.getLogger()
+
+INDEX_SUFFIX = ".index"
+"""Suffix appended to a list file path to get its search index path."""
+
+INDEX_VERSION = 2
+"""Version of the index schema, indexes of other versions are rebuilt."""
+
+FUZZY_THRESHOLD = 0.4
+"""Minimal trigram similarity of a word to a query term in fuzzy mode."""
+
+FUZZY_MAX_WORDS = 50
+"""Maximal number of similar words a single query term expands to in fuzzy mode."""
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS docs (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    done INTEGER NOT NULL,
+    position REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS docs_position ON docs (position);
+CREATE TABLE IF NOT EXISTS postings (
+    word TEXT NOT NULL,
+    id TEXT NOT NULL,
+    PRIMARY KEY (word, id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_id ON postings (id);
+CREATE TABLE IF NOT EXISTS trigrams (
+    trigram TEXT NOT NULL,
+    word TEXT NOT NULL,
+    PRIMARY KEY (trigram, word)
+) WITHOUT ROWID;
+"""
+"""Index schema.
+
+``postings`` is the inverted index (word -> task ids), ``trigrams`` maps
+trigrams to known words for fuzzy matching, and ``docs`` keeps titles
+and list order so hits are shown without reading the list itself.
+"""
+
+_WORD_RE = re.compile(r"\w+")
+_LAST_CHAR = "\U0010ffff"
+
+
+def index_path(list_path: Path) -> Path:
+    """Get a search index file path for a tasks list file.
+
+    :param Path list_path: Tasks list file path.
+    :return Path: Index file path next to the list file.
+    """
+    return list_path.with_name(list_path.name + INDEX_SUFFIX)
+
+
+def tokenize(text: str) -> list[str]:
+    """Split a text into lowercase words.
+
+    :param str text: A text to split.
+    :return list[str]: Unique words in order of appearance.
+    """
+    return list(dict.fromkeys(_WORD_RE.findall(text.casefold())))
+
+
+def trigrams(word: str) -> set[str]:
+    """Get trigrams of a word, padded so short words have trigrams too."""
+    padded = f"  {word} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class SearchHit(NamedTuple):
+    """A task found by a search."""
+
+    task: Task
+    score: float
+
+
+class SearchIndex:
+    """An inverted index over task titles of a single list.
+
+    The index is an SQLite database stored next to the list file.
+    It remembers a fingerprint of the list files it reflects (see
+    :meth:`Storage.fingerprint`), so a stale index is detected and rebuilt.
+    Once built, it is kept up to date incrementally by :class:`TasksList`,
+    which hands it the same records it writes to the list.
+    """
+
+    def __init__(self, list_path: Path | str) -> None:
+        self.list_path = Path(list_path)
+        self.path = index_path(self.list_path)
+
+    @property
+    def exists(self) -> bool:
+        """Check if the index was built."""
+        return self.path.is_file()
+
+    @contextmanager
+    def _connect(self) -> Generator[sqlite3.Connection]:
+        """Open a connection and run a single transaction in it."""
+        with closing(sqlite3.connect(self.path)) as conn, conn:
+            yield conn
+
+    def fingerprint(self) -> list | None:
+        """Get a fingerprint of the list files the index reflects.
+
+        :return list | None: A fingerprint, or None if the index is missing or unreadable.
+        """
+        if not self.exists:
+            return None
+        try:
+            with self._connect() as conn:
+                rows = dict(conn.execute("SELECT key, value FROM meta"))
+        except sqlite3.DatabaseError as e:
+            logger.warning(f"Search index {self.path} is not readable: {e}")
+            return None
+        if rows.get("version") != str(INDEX_VERSION) or "fingerprint" not in rows:
+            return None
+        return json.loads(rows["fingerprint"])
+
+    def rebuild(self, tasks: Iterable[Task], fingerprint: list) -> None:
+        """Build the index from scratch.
+
+        :param Iterable[Task] tasks: All tasks of the list.
+        :param list fingerprint: Fingerprint of the list files ``tasks`` were read from.
+        """
+        self.path.unlink(missing_ok=True)
+        docs = []
+        postings = []
+        words: set[str] = set()
+        for position, task in enumerate(tasks):
+            docs.append((task.id, task.title, task.done, position))
+            for word in tokenize(task.title):
+                postings.append((word, task.id))
+                words.add(word)
+
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+            conn.executemany("INSERT OR REPLACE INTO docs (id, title, done, position) VALUES (?, ?, ?, ?)", docs)
+            conn.executemany("INSERT OR IGNORE INTO postings (word, id) VALUES (?, ?)", postings)
+            conn.executemany(
+                "INSERT OR IGNORE INTO trigrams (trigram, word) VALUES (?, ?)",
+                ((trigram, word) for word in words for trigram in trigrams(word)),
+            )
+            self._stamp(conn, fingerprint)
+
+    def apply(self, records: Iterable[Record], previous: list, fingerprint: list) -> None:
+        """Update the index with list changes.
+
+        Changes are applied incrementally only if the index reflects
+        the list as it was before them, otherwise the index is dropped
+        to be rebuilt on the next search.
+
+        :param Iterable[Record] records: Journal records written to the list.
+        :param list previous: Fingerprint of the list files before the records were written.
+        :param list fingerprint: Fingerprint of the list files after the records were written.
+        """
+        if self.fingerprint() != normalize_fingerprint(previous):
+            logger.debug(f"Search index {self.path} is stale, dropping it")
+            self.delete()
+            return
+
+        with self._connect() as conn:
+            for record in records:
+                op = record["op"]
+                if op in ("add", "update"):
+                    self._index_task(conn, record["id"], record["title"], record["done"], record.get("position"))
+                elif op == "delete":
+                    self._unindex_task(conn, record["id"])
+                elif op == "move":
+                    position = position_at(conn, "docs", record["position"], record["id"])
+                    conn.execute("UPDATE docs SET position = ? WHERE id = ?", (position, record["id"]))
+            self._stamp(conn, fingerprint)
+
+    def search(self, query: str, *, fuzzy: bool = False, limit: int | None = None) -> list[SearchHit]:
+        """Find tasks which titles match all words of a query.
+
+        A query word matches title words it is a prefix of. In fuzzy mode
+        it also matches words with similar trigrams, to tolerate typos.
+        Hits are sorted by score: exact word matches score higher than prefix
+        and fuzzy matches.
+
+        :param str query: Search query.
+        :param bool fuzzy: Also match words similar to query words.
+        :param int | None limit: Maximal number of hits.
+        :return list[SearchHit]: Found tasks, best matches first.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+
+        with self._connect() as conn:
+            scores: dict[str, float] | None = None
+            for term in terms:
+                term_scores = self._match_term(conn, term, fuzzy)
+                if scores is None:
+                    scores = term_scores
+                else:
+                    scores = {i: s + term_scores[i] for i, s in scores.items() if i in term_scores}
+                if not scores:
+                    return []
+
+            assert scores is not None
+            ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+            hits = []
+            for task_id, score in ranked:
+                title, done = conn.execute("SELECT title, done FROM docs WHERE id = ?", (task_id,)).fetchone()
+                hits.append(SearchHit(Task(title, task_id=task_id, done=bool(done)), score / len(terms)))
+        return hits
+
+    def tasks(self, *, done: bool | None = None) -> Iterator[Task]:
+        """Iterate over indexed tasks in list order.
+
+        Reading tasks from the index is much faster than parsing the list,
+        but only makes sense while the index is fresh.
+
+        :param bool | None done: Only yield done (True) or pending (False) tasks.
+        :return Iterator[Task]: Indexed tasks.
+        """
+        with self._connect() as conn:
+            if done is None:
+                rows = conn.execute("SELECT id, title, done FROM docs ORDER BY position")
+            else:
+                rows = conn.execute("SELECT id, title, done FROM docs WHERE done = ? ORDER BY position", (done,))
+            for task_id, title, task_done in rows:
+                yield Task(title, task_id=task_id, done=bool(task_done))
+
+    def delete(self) -> None:
+        """Remove the index."""
+        self.path.unlink(missing_ok=True)
+
+    def _match_term(self, conn: sqlite3.Connection, term: str, fuzzy: bool) -> dict[str, float]:
+        """Score tasks matching a single query term.
+
+        :return dict[str, float]: Best score of a title word for each matching task id.
+        """
+        scores: dict[str, float] = {}
+        rows = conn.execute("SELECT word, id FROM postings WHERE word >= ? AND word < ?", (term, term + _LAST_CHAR))
+        for word, task_id in rows:
+            score = 1.0 if word == term else 0.8
+            if score > scores.get(task_id, 0):
+                scores[task_id] = score
+
+        if fuzzy:
+            for word, similarity in self._similar_words(conn, term):
+                for (task_id,) in conn.execute("SELECT id FROM postings WHERE word = ?", (word,)):
+                    score = 0.6 * similarity
+                    if score > scores.get(task_id, 0):
+                        scores[task_id] = score
+        return scores
+
+    def _similar_words(self, conn: sqlite3.Connection, term: str) -> list[tuple[str, float]]:
+        """Find known words similar to a term by trigrams (Jaccard similarity)."""
+        term_trigrams = trigrams(term)
+        placeholders = ", ".join("?" * len(term_trigrams))
+        rows = conn.execute(
+            f"SELECT word, COUNT(*) FROM trigrams WHERE trigram IN ({placeholders}) GROUP BY word",
+            tuple(term_trigrams),
+        )
+        similar = []
+        for word, shared in rows:
+            similarity = shared / (len(term_trigrams) + len(trigrams(word)) - shared)
+            if similarity >= FUZZY_THRESHOLD:
+                similar.append((word, similarity))
+        similar.sort(key=lambda item: item[1], reverse=True)
+        return similar[:FUZZY_MAX_WORDS]
+
+    def _index_task(
+        self,
+        conn: sqlite3.Connection,
+        task_id: str,
+        title: str,
+        done: bool,
+        index: int | None,
+    ) -> None:
+        """Index a new or changed task, new tasks are put at ``index`` (None for the end)."""
+        row = conn.execute("SELECT position FROM docs WHERE id = ?", (task_id,)).fetchone()
+        position = position_at(conn, "docs", index, task_id) if row is None else row[0]
+        self._unindex_task(conn, task_id)
+        conn.execute(
+            "INSERT INTO docs (id, title, done, position) VALUES (?, ?, ?, ?)",
+            (task_id, title, done, position),
+        )
+        words = tokenize(title)
+        conn.executemany("INSERT OR IGNORE INTO postings (word, id) VALUES (?, ?)", ((w, task_id) for w in words))
+        conn.executemany(
+            "INSERT OR IGNORE INTO trigrams (trigram, word) VALUES (?, ?)",
+            ((trigram, word) for word in words for trigram in trigrams(word)),
+        )
+
+    def _unindex_task(self, conn: sqlite3.Connection, task_id: str) -> None:
+        # Words left without postings stay in ``trigrams``, they just match nothing
+        conn.execute("DELETE FROM docs WHERE id = ?", (task_id,))
+        conn.execute("DELETE FROM postings WHERE id = ?", (task_id,))
+
+    def _stamp(self, conn: sqlite3.Connection, fingerprint: list) -> None:
+        conn.executemany(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+            [("version", str(INDEX_VERSION)), ("fingerprint", json.dumps(fingerprint))],
+        )
+
+
+def search_tasks(
+    path: Path | str,
+    query: str,
+    *,
+    fuzzy: bool = False,
+    limit: int | None = None,
+) -> list[SearchHit]:
+    """Search tasks of a list by title.
+
+    The list search index is built on the first search and rebuilt
+    whenever the list was changed without updating it.
+
+    :param Path | str path: Tasks list file path.
+    :param str query: Search query, see :meth:`SearchIndex.search`.
+    :param bool fuzzy: Also match words similar to query words.
+    :param int | None limit: Maximal number of hits.
+    :return list[SearchHit]: Found tasks, best matches first.
+    """
+    storage = open_storage(path)
+    index = SearchIndex(path)
+    fingerprint = normalize_fingerprint(storage.fingerprint())
+    if index.fingerprint() != fingerprint:
+        logger.debug(f"Building a search index for {path}")
+        _, tasks = storage.stream()
+        index.rebuild(tasks, fingerprint)
+    return index.search(query, fuzzy=fuzzy, limit=limit)
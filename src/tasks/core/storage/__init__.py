@@ -0,0 +1,83 @@
+"""Storage backends for tasks lists."""
+
+from pathlib import Path
+
+from .base import ListSummary as ListSummary
+from .base import Storage as Storage
+from .base import files_fingerprint as files_fingerprint
+from .base import normalize_fingerprint as normalize_fingerprint
+from .binary_storage import BINARY_MAGIC
+from .binary_storage import BinaryStorage as BinaryStorage
+from .compression import CODECS as CODECS
+from .compression import Codec as Codec
+from .compression import CompressionPolicy as CompressionPolicy
+from .compression import read_head, strip_suffix
+from .json_storage import JsonStorage as JsonStorage
+from .sqlite_storage import SQLITE_MAGIC
+from .sqlite_storage import SqliteStorage as SqliteStorage
+
+STORAGES: dict[str, type[Storage]] = {
+    "json": JsonStorage,
+    "sqlite": SqliteStorage,
+    "binary": BinaryStorage,
+}
+"""Storage backends by their names."""
+
+SUFFIXES: dict[str, str] = {
+    ".json": "json",
+    ".sqlite": "sqlite",
+    ".sqlite3": "sqlite",
+    ".db": "sqlite",
+    ".tasks": "binary",
+}
+"""Storage backend names by list file suffixes."""
+
+DEFAULT_SUFFIXES: dict[str, str] = {
+    "json": ".json",
+    "sqlite": ".sqlite",
+    "binary": ".tasks",
+}
+"""Suffixes of new list files by storage backend names."""
+
+
+def detect_storage(path: Path | str) -> str:
+    """Detect a storage backend name of a list file.
+
+    Existing files are detected by their first bytes (after decompression),
+    new ones by their suffix, ignoring a compression suffix (e.g. ``.json.gz``).
+    Json is the fallback.
+
+    :param Path | str path: List file path.
+    :return str: Storage backend name, one of :data:`STORAGES` keys.
+    """
+    path = Path(path)
+    magic = read_head(path, len(SQLITE_MAGIC))
+
+    if magic == SQLITE_MAGIC:
+        return "sqlite"
+    if magic.startswith(BINARY_MAGIC):
+        return "binary"
+    if magic:
+        return "json"
+    return SUFFIXES.get(strip_suffix(path)[0].suffix.lower(), "json")
+
+
+def open_storage(
+    path: Path | str,
+    *,
+    journaled: bool = True,
+    compression: CompressionPolicy | None = None,
+) -> Storage:
+    """Open a storage for a list file.
+
+    :param Path | str path: List file path.
+    :param bool journaled: Use a journal for backends which support it.
+    :param CompressionPolicy | None compression: When to compress snapshots
+        (json and binary lists only). Compressed lists are read whatever the policy is.
+    :return Storage: A storage for the list.
+    """
+    path = Path(path)
+    storage = STORAGES[detect_storage(path)]
+    if issubclass(storage, JsonStorage):
+        return storage(path, journaled=journaled, compression=compression)
+    return storage(path)
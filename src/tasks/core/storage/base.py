@@ -0,0 +1,164 @@
+"""Storage backend interface."""
+
+from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator
+from contextlib import AbstractContextManager
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple
+
+from ..journal import Record
+from ..lock import FileLock, lock_path
+from ..task import Task
+
+if TYPE_CHECKING:
+    from ..tasks_list import ListSnapshot
+
+
+class ListSummary(NamedTuple):
+    """Summary of a tasks list."""
+
+    title: str
+    total: int
+    done: int
+
+
+def normalize_fingerprint(fingerprint: list) -> list:
+    """Make a fingerprint comparable with one read back from json.
+
+    :param list fingerprint: A fingerprint returned by :meth:`Storage.fingerprint`.
+    :return list: The same fingerprint with tuples converted to lists.
+    """
+    return [list(f) if f else None for f in fingerprint]
+
+
+def files_fingerprint(paths: Iterable[Path]) -> list[tuple[int, int] | None]:
+    """Get modification times and sizes of files.
+
+    :param Iterable[Path] paths: File paths.
+    :return list[tuple[int, int] | None]: ``(mtime_ns, size)`` for each file, None for missing ones.
+    """
+    fingerprint: list[tuple[int, int] | None] = []
+    for path in paths:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            fingerprint.append(None)
+        else:
+            fingerprint.append((stat.st_mtime_ns, stat.st_size))
+    return fingerprint
+
+
+class Storage(ABC):
+    """A place where a single tasks list is persisted.
+
+    :class:`TasksList` keeps the whole list in memory and uses a storage
+    to load it and to persist changes, described as journal records.
+
+    Every write stores the list version (``TasksList.version``), a number
+    which grows with every write. Writers hold the list :meth:`lock`
+    and compare the stored version with the one they have seen, so a stale
+    writer notices it has to catch up before writing.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    def files(self) -> list[Path]:
+        """Get all files the list is stored in."""
+        return [self.path]
+
+    def fingerprint(self) -> list[tuple[int, int] | None]:
+        """Get modification times and sizes of all list files.
+
+        If a fingerprint did not change, the stored list did not change either.
+
+        :return list[tuple[int, int] | None]: ``(mtime_ns, size)`` for each
+            of :meth:`files`, None for missing ones.
+        """
+        return files_fingerprint(self.files())
+
+    def lock(self) -> AbstractContextManager:
+        """Get an inter-process lock of the list, held while writing."""
+        return FileLock(lock_path(self.path))
+
+    @abstractmethod
+    def version(self) -> int | None:
+        """Read the stored list version.
+
+        :return int | None: List version, None if it cannot be told.
+        """
+
+    @abstractmethod
+    def load(self) -> tuple[str, list[Task], list[Record]]:
+        """Load a tasks list.
+
+        Records may include ``stats`` records, carrying counters and
+        the list version as of that record.
+
+        :return tuple[str, list[Task], list[Record]]: List title, tasks
+            in list order and records to replay over them.
+        """
+
+    def changes(self) -> list[Record] | None:
+        """Read changes made to the stored list since it was loaded.
+
+        Every call returns changes made since the previous one. Changes
+        written through this storage may be returned as well, which is
+        harmless as records are idempotent. The default implementation
+        cannot tell what has changed.
+
+        :return list[Record] | None: Records to replay over the loaded list,
+            None if the list has to be loaded again.
+        """
+        return None
+
+    @abstractmethod
+    def write(self, records: list[Record], tasks: "ListSnapshot") -> None:
+        """Persist changes which are already applied to ``tasks``.
+
+        :param list[Record] records: Changes to persist, in order.
+        :param ListSnapshot tasks: The list the changes belong to,
+            for backends which need to rewrite everything.
+        """
+
+    @abstractmethod
+    def save(self, tasks: "ListSnapshot") -> None:
+        """Rewrite the whole stored list with ``tasks``."""
+
+    @abstractmethod
+    def create(self, title: str, tasks: Iterable[Task] = (), *, version: int = 0) -> None:
+        """Create a new list, overwriting an existing one.
+
+        :param str title: List title.
+        :param Iterable[Task] tasks: Initial tasks.
+        :param int version: List version.
+        """
+
+    def stream(self) -> tuple[str, Iterator[Task]]:
+        """Read a list title and iterate over its tasks as they are read.
+
+        The default implementation loads the whole list, backends override
+        it to yield tasks one by one in constant memory.
+
+        :return tuple[str, Iterator[Task]]: List title and an iterator over tasks in list order.
+        """
+        from ..tasks_list import TasksList
+
+        tasks = TasksList(self.path, storage=self)
+        return tasks.title, iter(tasks)
+
+    @abstractmethod
+    def summary(self) -> ListSummary:
+        """Get a list summary, ideally without loading all tasks."""
+
+    @abstractmethod
+    def delete(self) -> None:
+        """Delete all files of the list.
+
+        The lock file is kept, as the lock may be held while the list
+        is deleted, see :meth:`remove_lock`.
+        """
+
+    def remove_lock(self) -> None:
+        """Remove the lock file of a deleted list, once the lock is released."""
+        lock_path(self.path).unlink(missing_ok=True)
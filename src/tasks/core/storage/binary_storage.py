@@ -0,0 +1,218 @@
+"""Compact binary storage with the same journal as the json storage."""
+
+import json
+import re
+import struct
+from collections.abc import Iterable, Iterator
+from typing import IO, Any, override
+
+from ..errors import InvalidTasksListError
+from ..journal import Record
+from ..task import Task
+from .compression import open_file, read_file
+from .json_storage import JsonStorage, _stamp
+
+BINARY_MAGIC = b"\x89TASKS\r\n"
+"""First bytes of a binary list file."""
+
+FORMAT_VERSION = 1
+"""Version of the binary format, stored right after the magic."""
+
+DONE = 0x01
+"""Task flag: the task is done."""
+
+TEXT_ID = 0x02
+"""Task flag: the id is not a uuid hex string, so it is stored as text."""
+
+READ_CHUNK = 1024 * 1024
+"""Bytes read at once while streaming tasks."""
+
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_HEX_ID = re.compile(r"[0-9a-f]{32}")
+
+
+class BinaryStorage(JsonStorage):
+    """A compact binary snapshot plus a journal of changes next to it.
+
+    The snapshot is about a third of the size of the json one and is
+    faster to load and save (see ``benchmarks/storage_formats.py``).
+    It is laid out as::
+
+        magic (8 bytes) | format version (u8)
+        header length (u32) | header (json: title, version, stats)
+        task records, each:
+            flags (u8: done, text id)
+            id: 16 raw bytes of a uuid hex string, or u16 length + utf-8 text
+            title: u32 length + utf-8 text
+
+    Integers are little-endian. Journaling, compaction, streaming
+    and summaries work exactly as in :class:`JsonStorage`.
+    """
+
+    @override
+    def load(self) -> tuple[str, list[Task], list[Record]]:
+        """Load and validate the snapshot.
+
+        :raises InvalidTasksListError: The file is not a valid binary tasks list.
+        """
+        try:
+            data, stat = read_file(self.path)
+        except ValueError as e:
+            raise InvalidTasksListError(self.path, [str(e)]) from e
+
+        header, pos = _decode_header(data)
+        if header is None:
+            raise InvalidTasksListError(self.path, ["Not a binary tasks list, or its header is damaged"])
+        problems = _header_problems(header)
+        if problems:
+            raise InvalidTasksListError(self.path, problems)
+
+        total = header["stats"]["total"]
+        try:
+            entries, pos = _decode_entries(data, pos, total)
+        except UnicodeDecodeError as e:
+            raise InvalidTasksListError(self.path, [f"A task title or id is damaged: {e}"]) from e
+        if len(entries) < total:
+            raise InvalidTasksListError(self.path, [f"Truncated: {len(entries)} of {total} tasks can be read"])
+        if pos != len(data):
+            raise InvalidTasksListError(self.path, [f"Unexpected {len(data) - pos} bytes after the last task"])
+
+        tasks = [Task(title, task_id=task_id, done=done) for task_id, title, done in entries]
+        records, self._journal_offset = self.journal.read_from(0)
+        self._snapshot_stamp = _stamp(stat)
+        self._snapshot_size = len(data)
+        return header["title"], tasks, [{"op": "stats", "version": header["version"]}, *records]
+
+    @override
+    def create(self, title: str, tasks: Iterable[Task] = (), *, version: int = 0) -> None:
+        """Write a snapshot and drop the journal.
+
+        The file is replaced atomically, like in :meth:`JsonStorage.create`.
+        """
+        body = bytearray()
+        total = done = 0
+        for task in tasks:
+            body += _encode_task(task)
+            total += 1
+            done += task.done
+        header = {
+            "title": title,
+            "version": version,
+            "stats": {"total": total, "done": done, "pending": total - done},
+        }
+        raw_header = json.dumps(header, ensure_ascii=False).encode()
+        body[:0] = BINARY_MAGIC + bytes([FORMAT_VERSION]) + _U32.pack(len(raw_header)) + raw_header
+        self._write_snapshot(body)
+
+    @override
+    def _open(self) -> IO[Any]:
+        return open_file(self.path, "rb")
+
+    @override
+    def _read_header(self, f: IO[Any]) -> dict[str, Any] | None:
+        """Read the header, leaving ``f`` at the first task."""
+        prefix = f.read(len(BINARY_MAGIC) + 1 + _U32.size)
+        if len(prefix) < len(BINARY_MAGIC) + 1 + _U32.size:
+            return None
+        (length,) = _U32.unpack_from(prefix, len(BINARY_MAGIC) + 1)
+        header, _ = _decode_header(prefix + f.read(length))
+        return header if header is not None and not _header_problems(header) else None
+
+    @override
+    def _read_entries(self, f: IO[Any], header: dict[str, Any]) -> Iterator[tuple[str, str, bool]]:
+        """Read snapshot tasks in chunks, so memory use does not depend on the list size.
+
+        :raises ValueError: The snapshot is truncated or damaged.
+        """
+        remaining = header["stats"]["total"]
+        data = b""
+        while remaining:
+            chunk = f.read(READ_CHUNK)
+            data += chunk
+            entries, pos = _decode_entries(data, 0, remaining)
+            if not entries and not chunk:
+                raise ValueError(f"Truncated list file, {remaining} task(s) missing")
+            data = data[pos:]
+            remaining -= len(entries)
+            yield from entries
+
+
+def _decode_header(data: bytes) -> tuple[dict[str, Any] | None, int]:
+    """Decode the magic and the header.
+
+    :return tuple[dict[str, Any] | None, int]: Header fields (None if there
+        is no valid header) and the position of the first task.
+    """
+    pos = len(BINARY_MAGIC) + 1
+    if not data.startswith(BINARY_MAGIC) or len(data) < pos + _U32.size or data[pos - 1] != FORMAT_VERSION:
+        return None, 0
+    (length,) = _U32.unpack_from(data, pos)
+    pos += _U32.size
+    try:
+        header = json.loads(data[pos : pos + length])
+    except ValueError:
+        return None, 0
+    return (header if isinstance(header, dict) else None), pos + length
+
+
+def _header_problems(header: dict[str, Any]) -> list[str]:
+    """Describe what is wrong with header fields."""
+    problems = []
+    if not isinstance(header.get("title"), str):
+        problems.append('"title" must be a string')
+    version = header.get("version")
+    if not isinstance(version, int) or isinstance(version, bool):
+        problems.append('"version" must be an integer')
+    stats = header.get("stats")
+    if not isinstance(stats, dict) or not isinstance(stats.get("total"), int) or not isinstance(stats.get("done"), int):
+        problems.append('"stats" must have integer "total" and "done"')
+    return problems
+
+
+def _encode_task(task: Task) -> bytes:
+    flags = DONE if task.done else 0
+    if _HEX_ID.fullmatch(task.id):
+        raw_id = bytes.fromhex(task.id)
+    else:
+        flags |= TEXT_ID
+        text_id = task.id.encode()
+        raw_id = _U16.pack(len(text_id)) + text_id
+    title = task.title.encode()
+    return bytes([flags]) + raw_id + _U32.pack(len(title)) + title
+
+
+def _decode_entries(data: bytes, pos: int, limit: int) -> tuple[list[tuple[str, str, bool]], int]:
+    """Decode up to ``limit`` complete task records.
+
+    Decoding stops at an incomplete record, so data may be fed in chunks.
+
+    :return tuple[list[tuple[str, str, bool]], int]: Tasks as ``(id, title, done)``
+        and the position right after the last decoded record.
+    """
+    entries: list[tuple[str, str, bool]] = []
+    append = entries.append
+    size = len(data)
+    unpack_u32 = _U32.unpack_from
+    while len(entries) < limit and pos < size:
+        flags = data[pos]
+        if flags & TEXT_ID:
+            if pos + 3 > size:
+                break
+            (id_length,) = _U16.unpack_from(data, pos + 1)
+            id_end = pos + 3 + id_length
+            if id_end > size:
+                break
+            task_id = data[pos + 3 : id_end].decode()
+        else:
+            id_end = pos + 17
+            task_id = data[pos + 1 : id_end].hex()
+        if id_end + 4 > size:
+            break
+        (title_length,) = unpack_u32(data, id_end)
+        end = id_end + 4 + title_length
+        if end > size:
+            break
+        append((task_id, data[id_end + 4 : end].decode(), bool(flags & DONE)))
+        pos = end
+    return entries, pos
@@ -0,0 +1,158 @@
+"""Transparent compression of list snapshots.
+
+Snapshots may be compressed with any of the stdlib codecs (:data:`CODECS`).
+A compressed file is recognized by its first bytes, and a new one
+by a compression suffix of its name (e.g. ``list.json.gz``). Journals
+are never compressed, so appending changes costs the same either way.
+"""
+
+import importlib
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any, Literal, NamedTuple
+
+Codec = Literal["gzip", "bz2", "lzma"]
+
+
+class CodecInfo(NamedTuple):
+    """How a compressed file is recognized and named."""
+
+    magic: bytes
+    suffix: str
+    options: dict[str, Any]
+    """Keyword arguments of the codec ``open`` for writing."""
+
+
+CODECS: dict[Codec, CodecInfo] = {
+    # Level 9 (the gzip default) is several times slower than 6 for the same size
+    "gzip": CodecInfo(b"\x1f\x8b", ".gz", {"compresslevel": 6}),
+    "bz2": CodecInfo(b"BZh", ".bz2", {}),
+    "lzma": CodecInfo(b"\xfd7zXZ\x00", ".xz", {}),
+}
+"""Supported codecs, named after their stdlib modules."""
+
+SUFFIXES: dict[str, Codec] = {
+    ".gz": "gzip",
+    ".bz2": "bz2",
+    ".xz": "lzma",
+    ".lzma": "lzma",
+}
+"""Codec names by file suffixes."""
+
+MAGIC_SIZE = max(len(info.magic) for info in CODECS.values())
+"""Bytes to read to recognize a compressed file."""
+
+
+@dataclass(frozen=True)
+class CompressionPolicy:
+    """When snapshots of list files are compressed.
+
+    Changes are appended to the uncompressed journal, so a snapshot is
+    only compressed when it is rewritten (created or compacted), which
+    rarely happens to read-mostly lists. Snapshots which are compressed
+    already, or are named with a compression suffix, stay compressed
+    with their codec whatever the policy is.
+    """
+
+    mode: Literal["never", "auto", "always"] = "never"
+    """Compress ``never``, ``always`` or (``auto``) when a snapshot is at least :attr:`min_size` bytes."""
+    codec: Codec = "gzip"
+    """Codec of newly compressed snapshots."""
+    min_size: int = 1024 * 1024
+    """Uncompressed snapshot size (in bytes) from which ``auto`` mode compresses."""
+
+    def codec_for(self, size: int) -> Codec | None:
+        """Get a codec for a snapshot of ``size`` bytes, None to leave it uncompressed."""
+        if self.mode == "always" or (self.mode == "auto" and size >= self.min_size):
+            return self.codec
+        return None
+
+
+def strip_suffix(path: Path) -> tuple[Path, Codec | None]:
+    """Split a compression suffix off a path.
+
+    :param Path path: A file path, e.g. ``list.json.gz``.
+    :return tuple[Path, Codec | None]: The path without a compression suffix
+        (``list.json``) and a codec it names, None if there is no such suffix.
+    """
+    codec = SUFFIXES.get(path.suffix.lower())
+    return (path.with_suffix(""), codec) if codec else (path, None)
+
+
+def detect_compression(path: Path) -> Codec | None:
+    """Detect a codec of a file.
+
+    Existing files are detected by their first bytes,
+    new ones by their suffix.
+
+    :param Path path: A file path.
+    :return Codec | None: A codec, None if the file is not compressed.
+    """
+    try:
+        with path.open("rb") as f:
+            magic = f.read(MAGIC_SIZE)
+    except OSError:
+        magic = b""
+    if not magic:
+        return strip_suffix(path)[1]
+    return _codec_of(magic)
+
+
+def open_file(path: Path, mode: str = "rb", codec: Codec | None = None) -> IO:
+    """Open a possibly compressed file.
+
+    :param Path path: A file path.
+    :param str mode: ``rb``, ``rt``, ``wb`` or ``wt``.
+    :param Codec | None codec: A codec to write with, files
+        opened for reading are decompressed with their own one.
+    :return IO: A file object, text ones use utf-8.
+    """
+    if "r" in mode:
+        codec = detect_compression(path)
+    encoding = "utf-8" if "t" in mode else None
+    if codec is None:
+        return path.open(mode, encoding=encoding)
+    options = CODECS[codec].options if "w" in mode else {}
+    # Codecs are imported only for compressed files
+    return importlib.import_module(codec).open(path, mode, encoding=encoding, **options)
+
+
+def read_file(path: Path) -> tuple[bytes, os.stat_result]:
+    """Read a whole file, decompressing it if it is compressed.
+
+    :param Path path: A file path.
+    :raises ValueError: The file is compressed and its data is damaged.
+    :return tuple[bytes, os.stat_result]: File data and stat of the file that was read.
+    """
+    with path.open("rb") as f:
+        stat = os.fstat(f.fileno())
+        data = f.read()
+    codec = _codec_of(data[:MAGIC_SIZE])
+    if codec is None:
+        return data, stat
+    try:
+        return importlib.import_module(codec).decompress(data), stat
+    except Exception as e:  # codecs raise their own errors (OSError, EOFError, LZMAError)
+        raise ValueError(f"Damaged {codec} data: {e}") from e
+
+
+def read_head(path: Path, size: int) -> bytes:
+    """Read first bytes of a file, decompressed if it is compressed.
+
+    :param Path path: A file path.
+    :param int size: Number of bytes to read.
+    :return bytes: Up to ``size`` bytes, empty if the file is missing or damaged.
+    """
+    try:
+        with open_file(path, "rb") as f:
+            return f.read(size)
+    except Exception:  # codecs raise their own errors on damaged data
+        return b""
+
+
+def _codec_of(magic: bytes) -> Codec | None:
+    for codec, info in CODECS.items():
+        if magic.startswith(info.magic):
+            return codec
+    return None
@@ -0,0 +1,415 @@
+"""Json storage with an append-only journal."""
+
+import json
+import os
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, override
+
+from ..errors import InvalidTasksListError
+from ..journal import Journal, Record
+from ..task import Task
+from .base import ListSummary, Storage
+from .compression import Codec, CompressionPolicy, detect_compression, open_file, read_file
+
+if TYPE_CHECKING:
+    from ..tasks_list import ListSnapshot
+
+COMPACT_MIN_BYTES = 64 * 1024
+"""Journal size (in bytes) below which compaction never runs."""
+
+COMPACT_RATIO = 0.5
+"""Journal to snapshot size ratio above which the journal is compacted."""
+
+MAX_PROBLEMS = 10
+"""Maximum number of problems reported for an invalid list file."""
+
+JSON_TYPES: dict[type, str] = {
+    type(None): "null",
+    bool: "boolean",
+    int: "number",
+    float: "number",
+    str: "string",
+    list: "array",
+    dict: "object",
+}
+"""Json type names of python types produced by :func:`json.loads`."""
+
+
+class TaskEncoder(json.JSONEncoder):
+    """Json encoder for a ``Task`` class."""
+
+    @override
+    def default(self, o: Any) -> dict[str, str | bool]:
+        if isinstance(o, Task):
+            return {"id": o.id, "title": o.title, "done": o.done}
+        return super().default(o)
+
+
+class JsonStorage(Storage):
+    """A json file (the snapshot) plus a journal of changes next to it.
+
+    In journaled mode (the default) changes are appended to the journal
+    instead of rewriting the whole file. The journal is replayed over
+    the snapshot on load and is compacted into the snapshot once it grows
+    big enough. Without journaling every change rewrites the snapshot.
+
+    The snapshot may be compressed (see :mod:`.compression`), then it is
+    decompressed on the fly, while the journal is kept uncompressed.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        journaled: bool = True,
+        compression: CompressionPolicy | None = None,
+    ) -> None:
+        super().__init__(path)
+        self.journaled = journaled
+        self.journal = Journal(path)
+        self.compression = compression
+        self._snapshot_stamp: tuple[int, int, int] | None = None
+        self._snapshot_size: int | None = None
+        self._journal_offset = 0
+
+    @override
+    def files(self) -> list[Path]:
+        return [self.path, self.journal.path]
+
+    @override
+    def version(self) -> int | None:
+        """Read the list version.
+
+        It is kept in the last journal ``stats`` record, or in the snapshot
+        header if the journal has none.
+        """
+        if self.journal.size > 0:
+            last = self.journal.last()
+            if last is None or last.get("op") != "stats":
+                # A torn line left by a crash, the journal is scanned back to the last complete write
+                last = next((record for record in reversed(self.journal.read()) if record.get("op") == "stats"), None)
+            if last is not None:
+                return last.get("version")
+        header = self.read_header()
+        return None if header is None else header.get("version", 0)
+
+    @override
+    def load(self) -> tuple[str, list[Task], list[Record]]:
+        """Load and validate the snapshot in a single pass.
+
+        :raises InvalidTasksListError: The file is not a valid tasks list.
+        """
+        try:
+            raw, stat = read_file(self.path)
+        except ValueError as e:
+            raise InvalidTasksListError(self.path, [str(e)]) from e
+
+        try:
+            data = json.loads(raw.decode("utf-8"))
+        except json.JSONDecodeError as e:
+            raise InvalidTasksListError(self.path, [f"Not a valid json: {e}"]) from e
+
+        if not isinstance(data, dict):
+            raise InvalidTasksListError(self.path, [f"Must be an object, got {_json_type(data)}"])
+
+        problems = []
+        title = data.get("title")
+        if not isinstance(title, str):
+            problems.append(f'"title" must be a string, got {_json_type(title)}')
+
+        raw_tasks = data.get("tasks")
+        if not isinstance(raw_tasks, dict):
+            problems.append(f'"tasks" must be an object, got {_json_type(raw_tasks)}')
+            raw_tasks = {}
+
+        version = data.get("version", 0)
+        if not isinstance(version, int) or isinstance(version, bool):
+            problems.append(f'"version" must be an integer, got {_json_type(version)}')
+
+        tasks = []
+        for task_id, v in raw_tasks.items():
+            if (
+                isinstance(v, dict)
+                and isinstance(v.get("title"), str)
+                and isinstance(v.get("done"), bool)
+                and v.get("id", task_id) == task_id
+            ):
+                # Keys are reused as ids, so each id string is stored once
+                tasks.append(Task(v["title"], task_id=task_id, done=v["done"]))
+            else:
+                problems.append(_task_problem(task_id, v))
+
+        if problems:
+            if len(problems) > MAX_PROBLEMS:
+                problems = [*problems[:MAX_PROBLEMS], f"... and {len(problems) - MAX_PROBLEMS} more"]
+            raise InvalidTasksListError(self.path, problems)
+
+        records, self._journal_offset = self.journal.read_from(0)
+        self._snapshot_stamp = _stamp(stat)
+        self._snapshot_size = len(raw)
+        return title, tasks, [{"op": "stats", "version": version}, *records]  # type: ignore
+
+    @override
+    def changes(self) -> list[Record] | None:
+        """Read records appended to the journal since the last call (or load).
+
+        :return list[Record] | None: New journal records, None if
+            the snapshot was replaced (e.g. compacted by another process).
+        """
+        try:
+            snapshot_stamp = _stamp(self.path.stat())
+        except FileNotFoundError:
+            return None
+        if self._snapshot_stamp is None or snapshot_stamp != self._snapshot_stamp:
+            return None
+        records, self._journal_offset = self.journal.read_from(self._journal_offset)
+        return records
+
+    @override
+    def write(self, records: list[Record], tasks: "ListSnapshot") -> None:
+        if not self.journaled:
+            self.save(tasks)
+            return
+
+        # Journaled writes end with a ``stats`` record holding up to date
+        # counters and version, so they can be read from the tail of the journal.
+        self.journal.append([*records, {"op": "stats", **tasks.stats, "version": tasks.version}])
+        # Compressed snapshots are compared by their uncompressed size
+        journal_size = self.journal.size
+        snapshot_size = self._snapshot_size or self.path.stat().st_size
+        if journal_size >= COMPACT_MIN_BYTES and journal_size > COMPACT_RATIO * snapshot_size:
+            self.save(tasks)
+
+    @override
+    def save(self, tasks: "ListSnapshot") -> None:
+        self.create(tasks.title, tasks, version=tasks.version)
+
+    @override
+    def create(self, title: str, tasks: Iterable[Task] = (), *, version: int = 0) -> None:
+        """Write a snapshot and drop the journal.
+
+        The file starts with a header (title, version and counters), one field
+        per line, followed by one task per line. This is still a valid json,
+        but the header can be read without parsing tasks (see :meth:`read_header`).
+
+        The file is replaced atomically, so a crash in the middle of
+        saving leaves either the old or the new snapshot (plus the journal).
+        """
+        encode = TaskEncoder().encode
+        lines = []
+        done = 0
+        for task in tasks:
+            lines.append(f"        {json.dumps(task.id)}: {encode(task)}")
+            done += task.done
+        stats = {"total": len(lines), "done": done, "pending": len(lines) - done}
+
+        text = (
+            "{\n"
+            f'    "title": {json.dumps(title)},\n'
+            f'    "version": {version},\n'
+            f'    "stats": {json.dumps(stats)},\n'
+            '    "tasks": {\n'
+        )
+        if lines:
+            text += ",\n".join(lines) + "\n"
+        text += "    }\n}\n"
+        self._write_snapshot(text.encode("utf-8"))
+
+    def _write_snapshot(self, data: bytes | bytearray) -> None:
+        """Replace the snapshot with a new one and drop the journal it includes.
+
+        An already compressed snapshot keeps its codec, an uncompressed one
+        is compressed if :attr:`compression` says so.
+        """
+        codec = detect_compression(self.path)
+        if codec is None and self.compression is not None:
+            codec = self.compression.codec_for(len(data))
+
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open_file(tmp_path, "wb", codec) as f:
+            f.write(data)
+        os.replace(tmp_path, self.path)
+        self.journal.clear()
+        self._snapshot_stamp = _stamp(self.path.stat())
+        self._snapshot_size = len(data)
+        self._journal_offset = 0
+
+    def compress(self, codec: Codec | None) -> None:
+        """Compress the snapshot with another codec, or decompress it.
+
+        The snapshot is rewritten as is, the journal is kept.
+        Hold the :meth:`lock` while doing this.
+
+        :param Codec | None codec: A codec, None to decompress.
+        :raises ValueError: The snapshot is compressed and damaged.
+        """
+        data, _ = read_file(self.path)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open_file(tmp_path, "wb", codec) as f:
+            f.write(data)
+        os.replace(tmp_path, self.path)
+        self._snapshot_stamp = _stamp(self.path.stat())
+
+    def read_header(self) -> dict[str, Any] | None:
+        """Read header fields of the snapshot without parsing its tasks.
+
+        Only snapshots written by :meth:`create` have a header
+        that can be read this way.
+
+        :return dict[str, Any] | None: Header fields (``title``, ``stats``)
+            or None if the file has no readable header.
+        """
+        with self._open() as f:
+            return self._read_header(f)
+
+    def _open(self) -> IO[Any]:
+        """Open the snapshot for reading its header and tasks."""
+        return open_file(self.path, "rt")
+
+    def _read_header(self, f: IO[Any]) -> dict[str, Any] | None:
+        """Read header fields, leaving ``f`` at the first task line."""
+        header: dict[str, Any] = {}
+        if f.readline().strip() != "{":
+            return None
+        for line in f:
+            key, _, value = line.strip().rstrip(",").partition(": ")
+            if key == '"tasks"':
+                return header
+            try:
+                header[json.loads(key)] = json.loads(value)
+            except json.JSONDecodeError:
+                return None
+        return None
+
+    @override
+    def stream(self) -> tuple[str, Iterator[Task]]:
+        """Read a list title and iterate over its tasks as they are read.
+
+        Snapshots written by :meth:`create` are read line by line, and
+        the journal is merged in on the fly. Other files, as well as
+        journals which reorder tasks, fall back to a full load.
+        """
+        f = self._open()
+        header = self._read_header(f)
+        records = self.journal.read()
+        reordered = any(r["op"] == "move" or "position" in r for r in records)
+        if header is None or "stats" not in header or reordered:
+            f.close()
+            return super().stream()
+        return header["title"], self._stream_tasks(f, header, records)
+
+    def _read_entries(self, f: IO[Any], header: dict[str, Any]) -> Iterator[tuple[str, str, bool]]:
+        """Read snapshot tasks as ``(id, title, done)``, ``f`` is left at the first task by :meth:`_read_header`.
+
+        :raises ValueError: The snapshot was not written by :meth:`create`.
+        """
+        decoder = json.JSONDecoder()
+        for line in f:
+            line = line.strip()
+            if line == "}":
+                return
+            task_id, end = decoder.raw_decode(line)
+            data, _ = decoder.raw_decode(line, end + 2)
+            yield task_id, data["title"], data["done"]
+
+    def _stream_tasks(self, f: IO[Any], header: dict[str, Any], records: list[Record]) -> Iterator[Task]:
+        """Yield snapshot tasks from ``f`` with ``records`` replayed over them.
+
+        Tasks touched by the journal keep their place unless they were deleted
+        at some point, otherwise they go to the end in order of (re)adding,
+        exactly as :meth:`TasksList._apply` would place them.
+        """
+        final: dict[str, Record | None] = {}
+        appended_at: dict[str, int] = {}
+        deleted: set[str] = set()
+        for i, record in enumerate(records):
+            if record["op"] == "delete":
+                final[record["id"]] = None
+                deleted.add(record["id"])
+                appended_at.pop(record["id"], None)
+            elif record["op"] in ("add", "update"):
+                final[record["id"]] = record
+                appended_at.setdefault(record["id"], i)
+
+        in_snapshot: set[str] = set()
+        yielded = 0
+        with f:
+            entries = self._read_entries(f, header)
+            while True:
+                try:
+                    entry = next(entries, None)
+                except (ValueError, TypeError, KeyError, EOFError, OSError):
+                    # Not written by us after all (or damaged), fall back to a full load
+                    _, tasks = super().stream()
+                    for _ in range(yielded):
+                        next(tasks)
+                    yield from tasks
+                    return
+                if entry is None:
+                    break
+
+                task_id, title, done = entry
+                if task_id in final:
+                    in_snapshot.add(task_id)
+                    if task_id in deleted:
+                        continue
+                    title, done = final[task_id]["title"], final[task_id]["done"]  # type: ignore
+                yield Task(title, task_id=task_id, done=done)
+                yielded += 1
+
+        tail = [
+            task_id for task_id, data in final.items() if data and (task_id in deleted or task_id not in in_snapshot)
+        ]
+        for task_id in sorted(tail, key=appended_at.__getitem__):
+            data = final[task_id]
+            yield Task(data["title"], task_id=task_id, done=data["done"])  # type: ignore
+
+    @override
+    def summary(self) -> ListSummary:
+        """Get a list summary.
+
+        Counters are taken from the snapshot header and from the last record
+        of the journal, so tasks are not parsed at all. Lists without a header
+        (e.g. written by older versions) are fully loaded instead.
+        """
+        header = self.read_header()
+        stats = header.get("stats") if header else None
+
+        if stats is not None and self.journal.size > 0:
+            last = self.journal.last()
+            stats = last if last and last.get("op") == "stats" else None
+
+        if header is None or stats is None:
+            from ..tasks_list import TasksList
+
+            tasks = TasksList(self.path, storage=self)
+            return ListSummary(tasks.title, len(tasks), tasks.completed_number)
+
+        return ListSummary(header["title"], stats["total"], stats["done"])
+
+    @override
+    def delete(self) -> None:
+        self.path.unlink()
+        self.journal.clear()
+
+
+def _stamp(stat: os.stat_result) -> tuple[int, int, int]:
+    """Identify a snapshot file version, a replaced file gets a new inode."""
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+def _json_type(value: Any) -> str:  # noqa: ANN401
+    return JSON_TYPES.get(type(value), type(value).__name__)
+
+
+def _task_problem(task_id: str, task: Any) -> str:  # noqa: ANN401
+    """Describe what is wrong with a task entry."""
+    prefix = f"Task {task_id!r}"
+    if not isinstance(task, dict):
+        return f"{prefix} must be an object, got {_json_type(task)}"
+    if not isinstance(task.get("title"), str):
+        return f'{prefix}: "title" must be a string, got {_json_type(task.get("title"))}'
+    if not isinstance(task.get("done"), bool):
+        return f'{prefix}: "done" must be a boolean, got {_json_type(task.get("done"))}'
+    return f'{prefix}: "id" does not match the key, got {task.get("id")!r}'
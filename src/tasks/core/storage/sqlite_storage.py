@@ -0,0 +1,214 @@
+"""SQLite storage."""
+
+import sqlite3
+from collections.abc import Generator, Iterable, Iterator
+from contextlib import closing, contextmanager
+from typing import TYPE_CHECKING, override
+
+from ..errors import InvalidTasksListError
+from ..journal import Record
+from ..task import Task
+from .base import ListSummary, Storage
+
+if TYPE_CHECKING:
+    from ..tasks_list import ListSnapshot
+
+SQLITE_MAGIC = b"SQLite format 3\x00"
+"""First bytes of any SQLite database file."""
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    done INTEGER NOT NULL DEFAULT 0,
+    position REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tasks_position ON tasks (position);
+CREATE INDEX IF NOT EXISTS tasks_done ON tasks (done);
+CREATE INDEX IF NOT EXISTS tasks_title ON tasks (title);
+"""
+"""Database schema."""
+
+
+class SqliteStorage(Storage):
+    """A tasks list stored in an SQLite database.
+
+    Every change touches only the rows it is about. Task order is kept
+    in a ``position`` column: positions are sparse, so inserting or moving
+    a task only updates that task (unless there is no gap left between
+    its neighbours and positions have to be renumbered).
+    """
+
+    @contextmanager
+    def _connect(self, create: bool = False) -> Generator[sqlite3.Connection]:
+        """Open a connection and run a single transaction in it.
+
+        :param bool create: Create a database if it does not exist.
+        """
+        mode = "rwc" if create else "rw"
+        with closing(sqlite3.connect(f"{self.path.absolute().as_uri()}?mode={mode}", uri=True)) as conn, conn:
+            yield conn
+
+    @override
+    def version(self) -> int | None:
+        if not self.path.exists():
+            return None
+        with self._connect() as conn:
+            return self._version(conn)
+
+    @override
+    def load(self) -> tuple[str, list[Task], list[Record]]:
+        """Load the list.
+
+        :raises InvalidTasksListError: The file is not a valid SQLite tasks list.
+        """
+        if not self.path.exists():
+            raise FileNotFoundError(self.path)
+
+        try:
+            with self._connect() as conn:
+                title = self._title(conn)
+                version = self._version(conn)
+                rows = conn.execute("SELECT id, title, done FROM tasks ORDER BY position")
+                tasks = [Task(task_title, task_id=task_id, done=bool(done)) for task_id, task_title, done in rows]
+        except sqlite3.DatabaseError as e:
+            raise InvalidTasksListError(self.path, [f"Not a valid SQLite tasks list: {e}"]) from e
+        return title, tasks, [{"op": "stats", "version": version}]
+
+    @override
+    def write(self, records: list[Record], tasks: "ListSnapshot") -> None:
+        with self._connect() as conn:
+            for record in records:
+                self._write_record(conn, record)
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)", (tasks.version,))
+
+    @override
+    def save(self, tasks: "ListSnapshot") -> None:
+        self.create(tasks.title, tasks, version=tasks.version)
+
+    @override
+    def create(self, title: str, tasks: Iterable[Task] = (), *, version: int = 0) -> None:
+        with self._connect(create=True) as conn:
+            conn.executescript(SCHEMA)
+            conn.execute("DELETE FROM tasks")
+            conn.executemany(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                [("title", title), ("version", version)],
+            )
+            conn.executemany(
+                "INSERT INTO tasks (id, title, done, position) VALUES (?, ?, ?, ?)",
+                ((task.id, task.title, task.done, i) for i, task in enumerate(tasks)),
+            )
+
+    @override
+    def stream(self) -> tuple[str, Iterator[Task]]:
+        if not self.path.exists():
+            raise FileNotFoundError(self.path)
+
+        with self._connect() as conn:
+            title = self._title(conn)
+        return title, self._stream_tasks()
+
+    def _stream_tasks(self) -> Iterator[Task]:
+        with self._connect() as conn:
+            for task_id, title, done in conn.execute("SELECT id, title, done FROM tasks ORDER BY position"):
+                yield Task(title, task_id=task_id, done=bool(done))
+
+    @override
+    def summary(self) -> ListSummary:
+        """Get a list summary, counted by the database."""
+        if not self.path.exists():
+            raise FileNotFoundError(self.path)
+
+        with self._connect() as conn:
+            title = self._title(conn)
+            total, done = conn.execute("SELECT COUNT(*), COALESCE(SUM(done), 0) FROM tasks").fetchone()
+        return ListSummary(title, total, done)
+
+    @override
+    def delete(self) -> None:
+        self.path.unlink()
+
+    def _title(self, conn: sqlite3.Connection) -> str:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'title'").fetchone()
+        return row[0] if row else ""
+
+    def _version(self, conn: sqlite3.Connection) -> int:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        return int(row[0]) if row else 0
+
+    def _write_record(self, conn: sqlite3.Connection, record: Record) -> None:
+        """Apply a single journal record to the database."""
+        op = record["op"]
+        task_id = record["id"]
+        if op in ("add", "update"):
+            updated = conn.execute(
+                "UPDATE tasks SET title = ?, done = ? WHERE id = ?",
+                (record["title"], record["done"], task_id),
+            ).rowcount
+            if not updated:
+                position = position_at(conn, "tasks", record.get("position"), task_id)
+                conn.execute(
+                    "INSERT INTO tasks (id, title, done, position) VALUES (?, ?, ?, ?)",
+                    (task_id, record["title"], record["done"], position),
+                )
+        elif op == "delete":
+            conn.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+        elif op == "move":
+            position = position_at(conn, "tasks", record["position"], task_id)
+            conn.execute("UPDATE tasks SET position = ? WHERE id = ?", (position, task_id))
+
+
+def position_at(conn: sqlite3.Connection, table: str, index: int | None, row_id: str) -> float:
+    """Get a position value that puts a row at ``index`` among other rows of a table.
+
+    Rows are ordered by a fractional ``position`` column, so a row is put
+    between its neighbours without renumbering other rows (almost always).
+
+    :param str table: Table name, it must have ``id`` and ``position`` columns.
+    :param int | None index: Row index, negative ones count from the end,
+        None to put the row to the end.
+    :param str row_id: Id of the row being placed, it is ignored among other rows.
+    """
+    if index is None:
+        # Going after every row, including this one, is fine, and a bare
+        # MAX() is answered from the position index without a scan
+        (last,) = conn.execute(f"SELECT MAX(position) FROM {table}").fetchone()
+        return 0.0 if last is None else last + 1
+
+    if index < 0:
+        (count,) = conn.execute(f"SELECT COUNT(*) FROM {table} WHERE id != ?", (row_id,)).fetchone()
+        index += count
+
+    if index <= 0:
+        (first,) = conn.execute(f"SELECT MIN(position) FROM {table} WHERE id != ?", (row_id,)).fetchone()
+        return 0.0 if first is None else first - 1
+
+    neighbours = [
+        position
+        for (position,) in conn.execute(
+            f"SELECT position FROM {table} WHERE id != ? ORDER BY position LIMIT 2 OFFSET ?",
+            (row_id, index - 1),
+        )
+    ]
+    if not neighbours:
+        return position_at(conn, table, None, row_id)
+    if len(neighbours) == 1:
+        return neighbours[0] + 1
+
+    before, after = neighbours
+    position = (before + after) / 2
+    if before < position < after:
+        return position
+
+    # No gap left between neighbours, spread positions out and retry
+    conn.execute(
+        f"UPDATE {table} SET position = ranked.rank "
+        f"FROM (SELECT id, ROW_NUMBER() OVER (ORDER BY position) AS rank FROM {table}) AS ranked "
+        f"WHERE ranked.id = {table}.id"
+    )
+    return position_at(conn, table, index, row_id)
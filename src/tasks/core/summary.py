@@ -0,0 +1,32 @@
+"""Tasks list summaries."""
+
+from collections.abc import Iterator
+from pathlib import Path
+
+from .profiling import timer
+from .storage import ListSummary, open_storage
+from .task import Task
+
+
+def read_summary(path: Path | str) -> ListSummary:
+    """Read a summary of a tasks list.
+
+    Storage backends answer it without loading all tasks where they can.
+
+    :param Path | str path: Tasks list file path.
+    :return ListSummary: Tasks list summary.
+    """
+    return open_storage(path).summary()
+
+
+def stream_tasks(path: Path | str) -> tuple[str, Iterator[Task]]:
+    """Read a list title and iterate over its tasks as they are read.
+
+    Unlike :class:`TasksList`, this does not keep the whole list in memory.
+
+    :param Path | str path: Tasks list file path.
+    :return tuple[str, Iterator[Task]]: List title and an iterator over tasks in list order.
+    """
+    with timer.phase("list load"):
+        title, tasks = open_storage(path).stream()
+    return title, iter(timer.iterate("list load", tasks))
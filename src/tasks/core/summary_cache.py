@@ -0,0 +1,117 @@
+"""Persistent cache of tasks lists summaries."""
+
+import json
+import logging
+import os
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+from .loader import Mode, load_summaries
+from .profiling import timer
+from .storage import ListSummary, files_fingerprint, normalize_fingerprint, open_storage
+
+logger = logging.getLogger()
+
+CACHE_VERSION = 2
+"""Version of the cache file format, a cache of another version is dropped."""
+
+
+class SummaryCache:
+    """A cache of tasks lists summaries stored in a json file.
+
+    Summaries are keyed by list path and invalidated by list files
+    modification times and sizes. Entries remember which files a list
+    is stored in, so for unchanged lists getting a summary costs a few
+    ``stat`` calls, without even detecting a storage backend.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._entries: dict[str, Any] = self._read()
+        self._dirty = False
+
+    def get(self, list_path: Path | str) -> ListSummary:
+        """Get a summary of a tasks list, reading it only if the list changed.
+
+        :param Path | str list_path: Tasks list file path.
+        :return ListSummary: Tasks list summary.
+        """
+        summary = self.get_many([list_path], mode="thread")[Path(list_path)]
+        if isinstance(summary, Exception):
+            raise summary
+        return summary
+
+    def get_many(self, list_paths: Iterable[Path | str], *, mode: Mode = "auto") -> dict[Path, ListSummary | Exception]:
+        """Get summaries of many tasks lists, reading changed lists concurrently.
+
+        :param Iterable[Path | str] list_paths: Tasks lists file paths.
+        :param Mode mode: Concurrency mode for reading changed lists (see :func:`load_many`).
+        :return dict[Path, ListSummary | Exception]: Summaries (or errors
+            raised while reading them) by list paths, in order of ``list_paths``.
+        """
+        summaries: dict[Path, ListSummary | Exception] = {}
+        misses: dict[Path, tuple[list[Path], list[Any]]] = {}
+        for list_path in map(Path, list_paths):
+            entry = self._entries.get(str(list_path))
+            if entry is not None:
+                fingerprint = normalize_fingerprint(files_fingerprint(map(Path, entry["files"])))
+                if entry["fingerprint"] == fingerprint:
+                    summaries[list_path] = ListSummary(*entry["summary"])
+                    continue
+
+            summaries[list_path] = Exception("Not read")  # a placeholder to keep the order
+            storage = open_storage(list_path)
+            misses[list_path] = (storage.files(), normalize_fingerprint(storage.fingerprint()))
+
+        if misses:
+            logger.debug(f"Summary cache misses: {len(misses)}")
+
+        for list_path, summary in timer.iterate("list load", load_summaries(misses, mode=mode)):
+            summaries[list_path] = summary
+            if isinstance(summary, ListSummary):
+                self.put(list_path, *misses[list_path], summary)
+        return summaries
+
+    def put(self, list_path: Path | str, files: list[Path], fingerprint: list[Any], summary: ListSummary) -> None:
+        """Put a summary into the cache.
+
+        :param Path | str list_path: Tasks list file path.
+        :param list[Path] files: Files the list is stored in (see :meth:`Storage.files`).
+        :param list[Any] fingerprint: List files fingerprint (see :meth:`Storage.fingerprint`).
+        :param ListSummary summary: Tasks list summary.
+        """
+        self._entries[str(list_path)] = {
+            "files": [str(path) for path in files],
+            "fingerprint": fingerprint,
+            "summary": list(summary),
+        }
+        self._dirty = True
+
+    def save(self) -> None:
+        """Write the cache to its file if anything changed."""
+        if not self._dirty:
+            return
+
+        with timer.phase("save"):
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(self.path.name + ".tmp")
+            with tmp_path.open("w", encoding="utf-8") as f:
+                json.dump({"version": CACHE_VERSION, "entries": self._entries}, f)
+            os.replace(tmp_path, self.path)
+        self._dirty = False
+
+    def _read(self) -> dict[str, Any]:
+        """Read cache entries, an unreadable cache is treated as empty."""
+        try:
+            with self.path.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, json.JSONDecodeError):
+            logger.warning(f"Summary cache is corrupted, dropping it: {self.path}")
+            return {}
+
+        if data.get("version") != CACHE_VERSION:
+            return {}
+        return data["entries"]
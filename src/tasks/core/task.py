@@ -4,9 +4,18 @@ import uuid
 
 
 class Task:
-    """A task."""
+    """A task.
+
+    Tasks are slotted: they have no per-instance ``__dict__``,
+    which makes each task several times smaller in memory.
+    """
+
+    __slots__ = ("done", "id", "title")
 
     def __init__(self, title: str, *, task_id: str | None = None, done: bool = False) -> None:
-        self.id = task_id or str(uuid.uuid4()).replace("-", "")
+        self.id = task_id or uuid.uuid4().hex
         self.title = title or "Untitled"
         self.done = done
+
+    def __repr__(self) -> str:  # noqa: D105
+        return f"Task({self.title!r}, task_id={self.id!r}, done={self.done!r})"
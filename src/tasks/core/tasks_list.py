@@ -1,40 +1,134 @@
 """Tasks list handler."""
 
-import json
-from collections.abc import Iterator
+import functools
+import threading
+from collections.abc import Callable, Generator, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, override
+from typing import Any, cast
 
+from .journal import Record
+from .profiling import timer
+from .search import SearchIndex
+from .storage import CompressionPolicy, Storage, open_storage
 from .task import Task
+from .watch import FileWatcher
 
 
-class TaskEncoder(json.JSONEncoder):
-    """Json encoder for a ``Task`` class."""
+def _mutation[F: Callable[..., Any]](method: F) -> F:
+    """Run a method changing the list holding the list lock.
 
-    @override
-    def default(self, o: Any) -> dict[str, str | bool]:
-        if isinstance(o, Task):
-            return {"id": o.id, "title": o.title, "done": o.done}
-        return super().default(o)
+    If ``autoflush`` is on and no batch is in progress, the change
+    is written once the lock is released (see :meth:`TasksList._flush`).
+    """
+
+    @functools.wraps(method)
+    def wrapper(self: "TasksList", *args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+        with self._lock:
+            result = method(self, *args, **kwargs)
+            flush = self.autoflush and self._batch_depth == 0
+        if flush:
+            self._flush()
+        return result
+
+    return cast(F, wrapper)
+
+
+@dataclass(frozen=True)
+class ListSnapshot:
+    """A list as it is written, handed to a :class:`Storage` along with the written records.
+
+    Tasks are copied only if the storage iterates them (e.g. to compact
+    a journal), so writing records does not depend on the list size.
+    """
+
+    title: str
+    version: int
+    stats: dict[str, int]
+    """Counters as of the written records."""
+    copy_tasks: Callable[[], list[Task]]
+    """Copy tasks in list order, holding the list lock."""
+
+    def __iter__(self) -> Iterator[Task]:  # noqa: D105
+        return iter(self.copy_tasks())
 
 
 class TasksList:
-    """A handler to operate on a single tasks list."""
+    """A handler to operate on a single tasks list.
+
+    Tasks are stored in a ``id -> Task`` dict, while their order is kept
+    in a separate list of ids, so positional access is O(1).
+
+    The whole list is kept in memory, and every change is described
+    as a journal record that is handed to a :class:`Storage` backend.
+    A backend is picked by the list file (see :func:`open_storage`)
+    unless it is given explicitly. List files may be compressed
+    (see :class:`CompressionPolicy`). If the list has a search index,
+    written records are applied to it as well.
+
+    Changes are written right away unless ``autoflush`` is off, then
+    they are kept until :meth:`flush` is called (e.g. by a background
+    thread). Mutations hold the list lock, while files are read and written
+    holding a separate I/O lock, so the list can be changed while another
+    thread is flushing it.
 
-    def __init__(self, path: Path | str) -> None:
+    Long-lived lists can pick up changes made by other processes
+    with :meth:`sync`, e.g. whenever their :meth:`watcher` reports a change.
+
+    Writes are safe across processes: a writer holds the storage lock
+    and checks the stored list :attr:`version`. If another process wrote
+    since this list was loaded, the list is loaded again and unwritten
+    changes are applied on top of it before writing, so nothing is lost.
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        *,
+        journaled: bool = True,
+        compression: CompressionPolicy | None = None,
+        storage: Storage | None = None,
+        autoflush: bool = True,
+    ) -> None:
         self.path = Path(path)
         self.title = ""
+        self.version = 0
         self.tasks: dict[str, Task] = {}
+        self.order: list[str] = []
+        self._done_ids: set[str] = set()
+        self._storage = storage or open_storage(self.path, journaled=journaled, compression=compression)
+        self.autoflush = autoflush
+        self._pending: list[Record] = []
+        self._writing: list[Record] = []
+        self._batch_depth = 0
+        self._lock = threading.RLock()
+        self._io_lock = threading.RLock()
+        self._fingerprint: list[tuple[int, int] | None] = []
+        self._index = SearchIndex(self.path)
         self._load()
 
     @property
     def completed_number(self) -> int:
-        """Get a number of completed tasks."""
-        completed = 0
-        for task in self.tasks.values():
-            if task.done:
-                completed += 1
-        return completed
+        """Number of completed tasks."""
+        return len(self._done_ids)
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Aggregate counters of the list.
+
+        Counters are maintained on every change, so this is O(1).
+
+        :return dict[str, int]: Total, done and pending tasks numbers.
+        """
+        total = len(self.tasks)
+        done = len(self._done_ids)
+        return {"total": total, "done": done, "pending": total - done}
+
+    @property
+    def has_unsaved_changes(self) -> bool:
+        """Check if there are changes which are not written yet."""
+        return bool(self._pending or self._writing)
 
     def at(self, index: int) -> Task | None:
         """Get a task by index.
@@ -42,16 +136,40 @@ class TasksList:
         :param int index: Task index.
         :return Task | None: Task instance if exists, None otherwise.
         """
-        if index >= len(self.tasks) or index < 0:
+        if index >= len(self.order) or index < 0:
             return None
-        return list(self.tasks.values())[index]
+        return self.tasks[self.order[index]]
+
+    def window(self, start: int, stop: int) -> tuple[int, list[Task]]:
+        """Get tasks of a slice of the list along with the list length.
+
+        Both are taken at once, so they agree with each other even if
+        another thread changes the list meanwhile (e.g. :meth:`sync`
+        running in a watcher thread).
+
+        :param int start: Index of the first task, same as in a slice.
+        :param int stop: Index after the last task, same as in a slice.
+        :return tuple[int, list[Task]]: Number of tasks in the list and tasks of the slice.
+        """
+        with self._lock:
+            return len(self.order), [self.tasks[task_id] for task_id in self.order[start:stop]]
+
+    def index(self, task_id: str) -> int:
+        """Get a position of a task in the list.
+
+        :param str task_id: Task id.
+        :raises ValueError: There is no task with such id.
+        :return int: Task index.
+        """
+        return self.order.index(task_id)
 
     def get(self, task_id: str) -> Task:
         """Get a task by task."""
         return self.tasks[task_id]
 
+    @_mutation
     def add(self, title: str) -> str:
-        """Add a new task.
+        """Add a new task to the end of the list.
 
         :param Task task: A task to add.
         :return str: Id of a new task.
@@ -59,9 +177,41 @@ class TasksList:
         task = Task(title)
         task_id = task.id
         self.tasks[task_id] = task
-        self._save()
+        self.order.append(task_id)
+        self._commit({"op": "add", "id": task.id, "title": task.title, "done": task.done})
         return task_id
 
+    @_mutation
+    def insert(self, position: int, title: str) -> str:
+        """Add a new task at a given position.
+
+        :param int position: Position of a new task, same as in :meth:`list.insert`.
+        :param str title: Title of a new task.
+        :return str: Id of a new task.
+        """
+        task = Task(title)
+        position = self._normalize_position(position)
+        self.tasks[task.id] = task
+        self.order.insert(position, task.id)
+        self._commit({"op": "add", "id": task.id, "title": task.title, "done": task.done, "position": position})
+        return task.id
+
+    @_mutation
+    def move(self, task_id: str, position: int) -> None:
+        """Move a task to a given position.
+
+        :param str task_id: Id of a task to move.
+        :param int position: New position of a task, same as in :meth:`list.insert`.
+        :raises KeyError: There is no task with such id.
+        """
+        if task_id not in self.tasks:
+            raise KeyError(task_id)
+        self.order.remove(task_id)
+        position = self._normalize_position(position)
+        self.order.insert(position, task_id)
+        self._commit({"op": "move", "id": task_id, "position": position})
+
+    @_mutation
     def delete(self, task_id: str) -> None:
         """Delete a task by id.
 
@@ -74,29 +224,276 @@ class TasksList:
             del self.tasks[task_id]
         except KeyError:
             return
-        self._save()
+        self.order.remove(task_id)
+        self._done_ids.discard(task_id)
+        self._commit({"op": "delete", "id": task_id})
 
+    @_mutation
     def update(self, task: Task) -> None:
-        """Update a task."""
+        """Update a task.
+
+        A task which is not in the list yet is added to the end of the list.
+        """
+        if task.id not in self.tasks:
+            self.order.append(task.id)
         self.tasks[task.id] = task
-        self._save()
+        self._track_done(task)
+        self._commit({"op": "update", "id": task.id, "title": task.title, "done": task.done})
+
+    @contextmanager
+    def batch(self) -> Generator["TasksList"]:
+        """Group several mutations into a single write.
+
+        Changes made inside the block are applied in memory right away
+        and persisted once, when the block exits. If the block raises,
+        in-memory changes are rolled back (the list is loaded again)
+        and nothing is written.
+        Nested batches join the outermost one. Other threads
+        can neither change nor write the list during a batch.
+
+        .. code-block:: python
+
+            with tasks.batch():
+                for title in titles:
+                    tasks.add(title)
+        """
+        with self._io_lock:
+            with self._lock:
+                if self._batch_depth > 0:
+                    self._batch_depth += 1
+                    try:
+                        yield self
+                    finally:
+                        self._batch_depth -= 1
+                    return
+
+                pending = len(self._pending)
+                self._batch_depth = 1
+                try:
+                    yield self
+                except BaseException:
+                    # Rolling back is rare, so nothing is copied up front: the list
+                    # is loaded again with the changes made before the batch on top.
+                    del self._pending[pending:]
+                    self._reload()
+                    raise
+                finally:
+                    self._batch_depth = 0
+            if self.autoflush:
+                self._flush()
+
+    def flush(self) -> None:
+        """Write changes kept because ``autoflush`` is off."""
+        self._flush()
+
+    def sync(self) -> set[str]:
+        """Apply changes made to the stored list by other processes.
+
+        Where the storage can tell what has changed (e.g. records appended
+        to a journal) only those changes are read and applied, otherwise
+        the list is loaded again. Changes which are not written yet
+        are applied on top, so they win.
+
+        :return set[str]: Ids of tasks which were added, changed, moved or deleted.
+        """
+        with self._io_lock:
+            fingerprint = self._storage.fingerprint()
+            if fingerprint == self._fingerprint:
+                return set()
+
+            self._fingerprint = fingerprint
+            records = self._storage.changes()
+            with self._lock:
+                if records is not None and not self._pending:
+                    touched = {record["id"] for record in records if "id" in record}
+                    before = {task_id: self._task_state(task_id) for task_id in touched}
+                    for record in records:
+                        self._apply(record)
+                    moved = {r["id"] for r in records if r["op"] == "move" or "position" in r}
+                    return {task_id for task_id in touched if self._task_state(task_id) != before[task_id]} | moved
+            # Pending changes have to go after the new ones, as they will be written after them
+            return self._reload()
+
+    def watcher(self, *, poll_interval: float = 1.0) -> FileWatcher:
+        """Make a watcher of the stored list files, see :meth:`sync`.
+
+        :param float poll_interval: Seconds between checks, where files have to be polled.
+        :return FileWatcher: A watcher of the list files.
+        """
+        return FileWatcher(self._storage.files(), poll_interval=poll_interval)
+
+    def compact(self) -> None:
+        """Rewrite the whole stored list, e.g. to fold a journal into the list file."""
+        self._write(compact=True)
+
+    def __getstate__(self) -> dict[str, Any]:  # noqa: D105
+        # Locks cannot be pickled, e.g. to return a list from another process
+        state = self.__dict__.copy()
+        del state["_lock"], state["_io_lock"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:  # noqa: D105
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+        self._io_lock = threading.RLock()
 
     def __iter__(self) -> Iterator[Task]:  # noqa: D105
-        return iter(self.tasks.values())
+        tasks = self.tasks
+        return (tasks[task_id] for task_id in self.order)
 
     def __len__(self) -> int:  # noqa: D105
         return len(self.tasks)
 
+    def _apply(self, record: Record) -> None:
+        """Apply a journal record to in-memory tasks.
+
+        Records are idempotent, so replaying a journal over a snapshot
+        that already contains some of its changes is safe.
+        """
+        op = record["op"]
+        if op == "stats":
+            self.version = record.get("version", self.version)
+            return
+
+        task_id = record["id"]
+        if op in ("add", "update"):
+            if task_id not in self.tasks:
+                self.order.insert(self._normalize_position(record.get("position", len(self.order))), task_id)
+            task = Task(record["title"], task_id=task_id, done=record["done"])
+            self.tasks[task_id] = task
+            self._track_done(task)
+        elif op == "delete":
+            if self.tasks.pop(task_id, None) is not None:
+                self.order.remove(task_id)
+                self._done_ids.discard(task_id)
+        elif op == "move":
+            if task_id in self.tasks:
+                self.order.remove(task_id)
+                self.order.insert(self._normalize_position(record["position"]), task_id)
+
+    def _track_done(self, task: Task) -> None:
+        """Update completion counters for a changed task."""
+        if task.done:
+            self._done_ids.add(task.id)
+        else:
+            self._done_ids.discard(task.id)
+
+    def _normalize_position(self, position: int) -> int:
+        """Convert a possibly negative position into a position in ``[0, len(self)]``."""
+        if position < 0:
+            position += len(self.order)
+        return min(max(position, 0), len(self.order))
+
+    def _commit(self, record: Record) -> None:
+        """Persist a mutation which is already applied in memory.
+
+        The record is written by :func:`_mutation` (or by :meth:`batch`
+        when it exits), once the list lock is released.
+        """
+        self._pending.append(record)
+
+    def _flush(self) -> None:
+        """Write pending records."""
+        if self._pending:
+            self._write()
+
+    def _write(self, *, compact: bool = False) -> None:
+        """Write pending records, or rewrite the whole stored list if ``compact``.
+
+        Files are read and written holding the I/O lock, while the list lock
+        is held only to take pending records, so the list can be changed
+        meanwhile. Changes made after that are written by the next flush.
+        Must not be called holding the list lock (only the I/O lock).
+
+        Tasks are rewritten in list order, so the order survives reloads.
+        """
+        with self._io_lock, timer.phase("save"), self._storage.lock():
+            self._catch_up()
+            with self._lock:
+                records, self._pending = self._pending, []
+                if not records and not compact:
+                    return
+                self._writing = records
+                self.version += 1
+                snapshot = ListSnapshot(self.title, self.version, self.stats, self._copy_tasks)
+            try:
+                previous = self._storage.fingerprint()
+                if compact:
+                    self._storage.save(snapshot)
+                else:
+                    self._storage.write(records, snapshot)
+            except BaseException:
+                with self._lock:
+                    self._pending[:0] = records
+                raise
+            finally:
+                self._writing = []
+            self._written(records, previous)
+
+    def _copy_tasks(self) -> list[Task]:
+        with self._lock:
+            return list(self)
+
     def _load(self) -> None:
-        """Load tasks list from a file."""
-        with self.path.open("r") as f:
-            raw_text = f.read()
-
-        data: dict[str, str | dict] = json.loads(raw_text)
-        self.title = data["title"]  # type: ignore
-        self.tasks = {k: Task(v["title"], task_id=v["id"], done=v["done"]) for k, v in data["tasks"].items()}  # type: ignore
-
-    def _save(self) -> None:
-        """Save current tasks list to a file."""
-        with self.path.open("w") as f:
-            json.dump({"title": self.title, "tasks": self.tasks}, f, indent=4, cls=TaskEncoder)
+        """Load tasks list from a storage and replay records it returned.
+
+        Files are read without the list lock, it is held only to replace
+        tasks in memory and to apply changes which are not written yet.
+        """
+        with timer.phase("list load"):
+            fingerprint = self._storage.fingerprint()
+            title, tasks, records = self._storage.load()
+            with self._lock:
+                self._fingerprint = fingerprint
+                self.title = title
+                self.tasks = {task.id: task for task in tasks}
+                self.order = list(self.tasks)
+                self._done_ids = {task.id for task in tasks if task.done}
+                for record in [*records, *self._pending]:
+                    self._apply(record)
+
+    def _catch_up(self) -> None:
+        """Merge changes written by other processes, before writing.
+
+        Must be called holding the I/O and storage locks. If the stored version
+        differs from the one seen by this list, the list is loaded again
+        and pending changes are applied on top, exactly as other readers
+        will see them once they are written.
+        """
+        if self._storage.version() != self.version:
+            self._reload()
+
+    def _written(self, records: list[Record], previous: list[tuple[int, int] | None]) -> None:
+        """Catch up with list files after writing records to them.
+
+        Written records are applied to the search index, if the list has one.
+
+        :param list[Record] records: Written records.
+        :param list[tuple[int, int] | None] previous: Fingerprint of the list files before writing.
+        """
+        fingerprint = self._storage.fingerprint()
+        if self._index.exists:
+            self._index.apply(records, previous, fingerprint)
+        if previous == self._fingerprint:
+            # Nobody else wrote since the last sync, so there is nothing to sync
+            self._fingerprint = fingerprint
+
+    def _reload(self) -> set[str]:
+        """Load the list again, keeping changes which are not written yet.
+
+        :return set[str]: Ids of tasks which were added, changed, moved or deleted.
+        """
+        with self._lock:
+            old_states = {task_id: (task.title, task.done) for task_id, task in self.tasks.items()}
+            old_order = self.order
+        self._load()
+
+        with self._lock:
+            changed = {task_id for task_id, state in old_states.items() if self._task_state(task_id) != state}
+            changed.update(task_id for task_id in self.tasks if task_id not in old_states)
+            changed.update(old for old, new in zip(old_order, self.order, strict=False) if old != new)
+        return changed
+
+    def _task_state(self, task_id: str) -> tuple[str, bool] | None:
+        task = self.tasks.get(task_id)
+        return None if task is None else (task.title, task.done)
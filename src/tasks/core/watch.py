@@ -0,0 +1,157 @@
+"""Watching tasks list files for changes made by other processes."""
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import sys
+import time
+from collections.abc import Iterable
+from pathlib import Path
+from types import TracebackType
+
+logger = logging.getLogger()
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+"""Inotify events which mean a file in a watched directory has changed."""
+
+_EVENT = struct.Struct("iIII")
+"""Header of ``struct inotify_event``: wd, mask, cookie, len (followed by a name)."""
+
+
+class FileWatcher:
+    """Wait for changes of a few files.
+
+    On Linux inotify is used (through :mod:`ctypes`, no extra dependencies),
+    elsewhere files are polled for modification times and sizes. Parent
+    directories are watched rather than files, so files replaced
+    atomically (see :meth:`JsonStorage.create`) are still watched.
+
+    .. code-block:: python
+
+        with FileWatcher(paths) as watcher:
+            while running:
+                if watcher.wait(timeout=1):
+                    reload()
+    """
+
+    def __init__(self, paths: Iterable[Path], *, poll_interval: float = 1.0) -> None:
+        self.paths = [Path(p).absolute() for p in paths]
+        self.poll_interval = poll_interval
+        self._fd: int | None = None
+        self._names: dict[int, set[str]] = {}
+        self._stamps = self._stat()
+        if sys.platform.startswith("linux"):
+            self._init_inotify()
+
+    @property
+    def uses_inotify(self) -> bool:
+        """Check if changes are reported by inotify (otherwise files are polled)."""
+        return self._fd is not None
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Wait until any of the files changes.
+
+        A change may be reported for a file which was rewritten with
+        the same contents, so callers should be fine with false alarms.
+
+        :param float | None timeout: Maximal number of seconds to wait, None to wait forever.
+        :return bool: True if a file has changed, False on timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if self._fd is not None:
+                if self._wait_inotify(remaining):
+                    return True
+            else:
+                time.sleep(self.poll_interval if remaining is None else min(self.poll_interval, remaining))
+                stamps = self._stat()
+                if stamps != self._stamps:
+                    self._stamps = stamps
+                    return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+
+    def close(self) -> None:
+        """Stop watching."""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self) -> "FileWatcher":  # noqa: D105
+        return self
+
+    def __exit__(  # noqa: D105
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def _stat(self) -> list[tuple[int, int] | None]:
+        stamps: list[tuple[int, int] | None] = []
+        for path in self.paths:
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                stamps.append(None)
+            else:
+                stamps.append((stat.st_mtime_ns, stat.st_size))
+        return stamps
+
+    def _init_inotify(self) -> None:
+        """Set up inotify watches, falling back to polling if that fails."""
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+            if fd < 0:
+                raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+            names_by_dir: dict[Path, set[str]] = {}
+            for path in self.paths:
+                names_by_dir.setdefault(path.parent, set()).add(path.name)
+            for directory, names in names_by_dir.items():
+                wd = libc.inotify_add_watch(fd, os.fsencode(directory), WATCH_MASK)
+                if wd < 0:
+                    os.close(fd)
+                    raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+                self._names[wd] = names
+        except (OSError, AttributeError) as e:
+            logger.debug(f"Cannot use inotify, polling files instead: {e}")
+            return
+        self._fd = fd
+
+    def _wait_inotify(self, timeout: float | None) -> bool:
+        """Wait for inotify events, return True if any of them is about watched files."""
+        assert self._fd is not None
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return False
+
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return False
+
+        changed = False
+        offset = 0
+        while offset + _EVENT.size <= len(data):
+            wd, _, _, name_len = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = data[offset : offset + name_len].rstrip(b"\0").decode(errors="replace")
+            offset += name_len
+            if name in self._names.get(wd, ()):
+                changed = True
+        return changed
@@ -0,0 +1,9 @@
+"""Resident daemon keeping tasks lists in memory, and its thin CLI client.
+
+The client is imported on every CLI run, so only light modules are re-exported
+here. The server is in :mod:`tasks.daemon.server`.
+"""
+
+from .client import DaemonClient as DaemonClient
+from .client import DaemonError as DaemonError
+from .protocol import socket_path as socket_path
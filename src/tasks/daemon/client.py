@@ -0,0 +1,231 @@
+"""Thin CLI client of the tasks daemon.
+
+``tasks`` starts here. When a daemon (``tasks serve``) is running,
+``ls``, ``add`` and ``pick`` are forwarded to it, which skips importing
+the CLI framework, loading the config and parsing the list. Their arguments
+are parsed by the daemon, with the same options as the CLI. Any other
+command, or any command when no daemon is running, is run by the full
+CLI (see :func:`tasks.cli.app.run_cli`). Output and behaviour are the same either way.
+"""
+
+import os
+import sys
+from types import TracebackType
+
+from .protocol import NO_DAEMON_ENV, decode, encode, socket_path
+
+
+class DaemonError(Exception):
+    """A daemon failed to run a command."""
+
+    def __init__(self, message: str, advice: str | None = None, rc: int = 1) -> None:
+        self.message = message
+        self.advice = advice
+        self.rc = rc
+        super().__init__(message)
+
+
+class DaemonClient:
+    """A connection to a running daemon.
+
+    .. code-block:: python
+
+        client = DaemonClient.connect()
+        if client is not None:
+            with client:
+                client.request("add", titles=["Buy milk"])
+    """
+
+    def __init__(self, path: str | None = None, *, timeout: float | None = None) -> None:
+        import socket  # only needed when a daemon runs
+
+        self.path = path or socket_path()
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self._sock.settimeout(timeout)
+            self._sock.connect(self.path)
+        except BaseException:
+            self._sock.close()
+            raise
+        self._file = self._sock.makefile("rwb")
+
+    @classmethod
+    def connect(cls, path: str | None = None) -> "DaemonClient | None":
+        """Connect to a daemon if it is running.
+
+        :param str | None path: Socket path, see :func:`socket_path` by default.
+        :return DaemonClient | None: A connection, None if no daemon is running.
+        """
+        if os.name != "posix":
+            return None
+        path = path or socket_path()
+        if not os.path.exists(path):
+            return None
+        try:
+            return cls(path)
+        except OSError:  # a stale socket of a daemon that was killed
+            return None
+
+    def request(self, cmd: str, **params: object) -> dict:
+        """Run a command in the daemon.
+
+        :param str cmd: Command name.
+        :raises DaemonError: The daemon failed to run the command.
+        :raises ConnectionError: The daemon has gone.
+        :return dict: Command result.
+        """
+        self._file.write(encode({"cmd": cmd, **params}))
+        self._file.flush()
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError("The daemon closed the connection")
+        response = decode(line)
+        if not response.pop("ok", False):
+            raise DaemonError(response.get("error", "Unknown error"), response.get("advice"), response.get("rc", 1))
+        return response
+
+    def close(self) -> None:
+        """Close the connection."""
+        self._file.close()
+        self._sock.close()
+
+    def __enter__(self) -> "DaemonClient":  # noqa: D105
+        return self
+
+    def __exit__(  # noqa: D105
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+def list_tasks(client: DaemonClient, params: dict) -> None:
+    """Print tasks, like ``tasks ls``."""
+    from tasks.cli.render import print_tasks
+
+    result = client.request("ls", **params)
+    print_tasks(result["title"], ((position, title, done) for _, title, done, position in result["tasks"]))
+
+
+def add_tasks(client: DaemonClient, params: dict) -> None:
+    """Add tasks, like ``tasks add``."""
+    titles: list[str] = []
+    for title in [*(params["titles"] or []), *params["title"]]:
+        if title == "-":
+            titles.extend(line.strip() for line in sys.stdin if line.strip())
+        else:
+            titles.append(title)
+
+    if not titles:
+        titles.append(input("Add task title: "))
+    client.request("add", titles=titles)
+
+
+def pick_task(client: DaemonClient) -> None:
+    """Pick a task for editing, like ``tasks pick``."""
+    tasks = client.request("ls")["tasks"]
+    if not tasks:
+        print("No tasks")
+        return
+
+    for i, (_, title, done, _) in enumerate(tasks):
+        print(f"[{i}]: [{'X' if done else ' '}] {title}")
+
+    try:
+        answer = input("Pick a task number (q to quit): ")
+        if answer == "q":
+            return
+        index = int(answer)
+        if not 0 <= index < len(tasks):
+            raise ValueError(index)
+    except ValueError:
+        print("Invalid task number")
+        return
+    task_id, title, done, _ = tasks[index]
+
+    action = input("[d]elete / [e]dit title / [c]hange done / [m]ove: ")
+
+    if action == "d":
+        client.request("delete", id=task_id)
+        print(f"Deleted: {title}")
+        return
+
+    if action == "e":
+        new_title = input("New task title: ")
+        client.request("update", id=task_id, title=new_title)
+        print(f"Changed title: {title} -> {new_title}")
+        return
+
+    if action == "c":
+        client.request("update", id=task_id, done=not done)
+        not_ = "not " if done else ""
+        print(f"Task {not_}done: {title}")
+        return
+
+    if action == "m":
+        try:
+            position = int(input("New task number: "))
+        except ValueError:
+            print("Invalid task number")
+            return
+        result = client.request("move", id=task_id, position=position)
+        print(f"Moved: {title} -> [{result['index']}]")
+        return
+
+    print("Invalid action")
+
+
+def forward(client: DaemonClient, args: list[str]) -> bool:
+    """Run a command in a daemon.
+
+    :param DaemonClient client: A connection to a daemon.
+    :param list[str] args: Command line arguments.
+    :return bool: True if the command was run, False if the daemon cannot run it.
+    """
+    if args == ["pick"]:
+        pick_task(client)
+        return True
+
+    # Arguments are parsed by the daemon, which has the CLI loaded
+    parsed = client.request("parse", args=args)
+    match parsed["command"]:
+        case "ls":
+            list_tasks(client, parsed["params"])
+        case "add":
+            add_tasks(client, parsed["params"])
+        case _:
+            return False
+    return True
+
+
+def main() -> None:
+    """Run a command through a daemon if it is running, otherwise run the full CLI."""
+    args = sys.argv[1:]
+    client = None
+    if args and args[0] in ("ls", "add", "pick") and not os.environ.get(NO_DAEMON_ENV):
+        client = DaemonClient.connect()
+
+    if client is not None:
+        try:
+            with client:
+                forwarded = forward(client, args)
+        except DaemonError as e:
+            print(e.message)
+            if e.advice:
+                print(f"Hint: {e.advice}")
+            sys.exit(e.rc)
+        except BrokenPipeError:
+            # See run_cli
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            sys.exit(1)
+        except ConnectionError as e:
+            print(f"Lost connection to the daemon: {e}")
+            sys.exit(1)
+        if forwarded:
+            return
+
+    from tasks.cli.app import run_cli
+
+    run_cli()
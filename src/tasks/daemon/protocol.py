@@ -0,0 +1,58 @@
+"""Protocol of the tasks daemon.
+
+Clients talk to a daemon over a Unix socket, one JSON object per line.
+A request is ``{"cmd": <command>, <params>...}`` and every request gets
+a response, either ``{"ok": true, <result>...}`` or
+``{"ok": false, "error": <message>, "advice": <hint>, "rc": <exit code>}``.
+A connection can be kept open for any number of requests.
+
+.. code-block:: console
+
+    $ echo '{"cmd": "add", "titles": ["Buy milk"]}' | socat - UNIX-CONNECT:$XDG_RUNTIME_DIR/tasks.sock
+    {"ok":true,"ids":["9f2c..."]}
+
+This module is imported on every CLI run, so it only uses a couple of standard modules.
+"""
+
+import json
+import os
+
+SOCKET_ENV = "TASKS_SOCKET"
+"""Environment variable to set a daemon socket path, e.g. to run several daemons."""
+
+NO_DAEMON_ENV = "TASKS_NO_DAEMON"
+"""Environment variable which makes the CLI access list files directly even if a daemon is running."""
+
+
+def socket_path() -> str:
+    """Get a daemon socket path.
+
+    The socket is placed into the user runtime directory (``$XDG_RUNTIME_DIR``),
+    or into a private directory in ``/tmp`` where there is none.
+
+    :return str: Socket path.
+    """
+    path = os.environ.get(SOCKET_ENV)
+    if path:
+        return path
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "tasks.sock")
+    uid = os.getuid() if hasattr(os, "getuid") else 0
+    return os.path.join(os.environ.get("TMPDIR", "/tmp"), f"tasks-{uid}", "daemon.sock")
+
+
+def encode(message: dict) -> bytes:
+    """Encode a request or a response into a line."""
+    return json.dumps(message, ensure_ascii=False, separators=(",", ":")).encode() + b"\n"
+
+
+def decode(line: bytes) -> dict:
+    """Decode a request or a response line.
+
+    :raises ValueError: The line is not a JSON object.
+    """
+    message = json.loads(line)
+    if not isinstance(message, dict):
+        raise ValueError(f"Expected a JSON object, got {type(message).__name__}")
+    return message
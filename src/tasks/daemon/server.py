@@ -0,0 +1,277 @@
+"""Tasks daemon, keeping tasks lists in memory and running commands sent over a Unix socket."""
+
+import logging
+import os
+import re
+import signal
+import socket
+import socketserver
+import threading
+from collections.abc import Callable
+from pathlib import Path
+from types import FrameType
+from typing import Any
+
+from rich.text import Text
+
+from tasks import APP_VERSION
+from tasks.app_config import load_app_config
+from tasks.cli.errors import CLIError, DaemonRunningError, InvalidListError, NoActiveListError
+from tasks.cli.tasks import parse_command
+from tasks.core import InvalidTasksListError, Task, TaskQuery, TasksList, load_tasks_list, select_tasks
+
+from .protocol import decode, encode, socket_path
+
+logger = logging.getLogger()
+
+
+class RequestError(Exception):
+    """A request cannot be run, e.g. it refers to a task that does not exist."""
+
+
+class TasksServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """A daemon serving commands for tasks lists.
+
+    Lists are loaded once and kept in memory. Before a command runs,
+    its list picks up changes made by other processes (see :meth:`TasksList.sync`),
+    which costs a couple of ``stat`` calls when nothing has changed.
+    The config is checked on every command too, so ``tasks lists select``
+    takes effect right away.
+
+    Commands are run one at a time, each connection is served in its own thread.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, path: str) -> None:
+        self.lists: dict[Path, TasksList] = {}
+        self._lock = threading.Lock()
+        self._commands: dict[str, Callable[[dict], dict[str, Any]]] = {
+            "ping": self.cmd_ping,
+            "parse": self.cmd_parse,
+            "ls": self.cmd_ls,
+            "add": self.cmd_add,
+            "delete": self.cmd_delete,
+            "update": self.cmd_update,
+            "move": self.cmd_move,
+            "stop": self.cmd_stop,
+        }
+        super().__init__(path, RequestHandler)
+
+    def preload(self) -> None:
+        """Load all configured lists."""
+        config = load_app_config()
+        for path in config.task_lists:
+            try:
+                self.lists[path] = load_tasks_list(path, compression=config.compression_policy)
+            except InvalidTasksListError as e:
+                logger.warning(f"Cannot load tasks list {path}: {', '.join(e.problems)}")
+        logger.info(f"Loaded {len(self.lists)} tasks list(s)")
+
+    def respond(self, request: dict) -> dict[str, Any]:
+        """Run a command and make a response.
+
+        :param dict request: A request, see :mod:`tasks.daemon.protocol`.
+        :return dict[str, Any]: A response.
+        """
+        command = self._commands.get(request.get("cmd", ""))
+        if command is None:
+            return {"ok": False, "error": f"Unknown command: {request.get('cmd')!r}", "rc": 2}
+
+        try:
+            with self._lock:
+                result = command(request)
+        except CLIError as e:
+            advice = Text.from_markup(e.advice).plain if e.advice else None
+            return {"ok": False, "error": e.message, "advice": advice, "rc": e.rc}
+        except (RequestError, KeyError, TypeError, ValueError) as e:
+            return {"ok": False, "error": f"Bad request: {e}", "rc": 2}
+        except Exception as e:
+            logger.exception(f"Command {request['cmd']!r} failed")
+            return {"ok": False, "error": f"Daemon error: {e!r}", "rc": 255}
+        return {"ok": True, **result}
+
+    def active_list(self) -> TasksList:
+        """Get the active tasks list, up to date with its files.
+
+        :raises NoActiveListError: Active tasks list is not set.
+        :raises InvalidListError: Active tasks list cannot be loaded.
+        :return TasksList: A tasks list.
+        """
+        config = load_app_config()
+        path = config.active_list
+        if path is None:
+            raise NoActiveListError()
+
+        tasks = self.lists.get(path)
+        if tasks is not None:
+            try:
+                tasks.sync()
+                return tasks
+            except Exception as e:
+                logger.warning(f"Cannot sync tasks list {path}, loading it again: {e!r}")
+                del self.lists[path]
+
+        try:
+            tasks = load_tasks_list(path, compression=config.compression_policy)
+        except InvalidTasksListError as e:
+            raise InvalidListError(e) from e
+        self.lists[path] = tasks
+        return tasks
+
+    def cmd_ping(self, request: dict) -> dict[str, Any]:
+        """Check that the daemon is alive."""
+        return {"version": APP_VERSION, "pid": os.getpid()}
+
+    def cmd_parse(self, request: dict) -> dict[str, Any]:
+        """Parse ``args`` of ``tasks ls`` or ``tasks add``, the same way the CLI does.
+
+        Returns the ``command`` name and its ``params`` for the request
+        running it, or a None ``command`` if the client has to run
+        the full CLI instead (e.g. for ``--help`` or an invalid option).
+        """
+        args = request["args"]
+        if not isinstance(args, list) or not all(isinstance(arg, str) for arg in args):
+            raise RequestError("args must be a list of strings")
+        parsed = parse_command(args) if args[:1] in (["ls"], ["add"]) else None
+        if parsed is None:
+            return {"command": None, "params": {}}
+        return {"command": parsed[0], "params": parsed[1]}
+
+    def cmd_ls(self, request: dict) -> dict[str, Any]:
+        """List tasks of the active list as ``[id, title, done, position]``.
+
+        Tasks may be filtered by ``done`` and ``match`` (a title substring,
+        or a pattern if ``regex`` is set) and paginated by ``offset`` and ``limit``,
+        see :func:`select_tasks`.
+        """
+        query = None
+        if request.get("done") is not None or request.get("match"):
+            try:
+                query = TaskQuery(request.get("match"), regex=bool(request.get("regex")), done=request.get("done"))
+            except re.error as e:
+                raise RequestError(f"Not a valid regular expression: {e}") from e
+        offset = int(request.get("offset") or 0)
+        limit = None if request.get("limit") is None else int(request["limit"])
+        if offset < 0 or (limit is not None and limit < 0):
+            raise RequestError("offset and limit must not be negative")
+
+        tasks = self.active_list()
+        selected = select_tasks(tasks, query, offset=offset, limit=limit)
+        return {"title": tasks.title, "tasks": [[task.id, task.title, task.done, i] for i, task in selected]}
+
+    def cmd_add(self, request: dict) -> dict[str, Any]:
+        """Add tasks with ``titles`` to the active list with a single write."""
+        titles = request["titles"]
+        if not isinstance(titles, list) or not all(isinstance(title, str) for title in titles):
+            raise RequestError("titles must be a list of strings")
+        tasks = self.active_list()
+        with tasks.batch():
+            ids = [tasks.add(title) for title in titles]
+        logger.info(f"Added {len(ids)} task(s) to {tasks.path}")
+        return {"ids": ids}
+
+    def cmd_delete(self, request: dict) -> dict[str, Any]:
+        """Delete a task with ``id``."""
+        tasks = self.active_list()
+        tasks.delete(self._task(tasks, request).id)
+        return {}
+
+    def cmd_update(self, request: dict) -> dict[str, Any]:
+        """Change ``title`` and/or ``done`` of a task with ``id``."""
+        tasks = self.active_list()
+        task = self._task(tasks, request)
+        if "title" in request:
+            task.title = str(request["title"])
+        if "done" in request:
+            task.done = bool(request["done"])
+        tasks.update(task)
+        return {}
+
+    def cmd_move(self, request: dict) -> dict[str, Any]:
+        """Move a task with ``id`` to ``position``, return its new ``index``."""
+        tasks = self.active_list()
+        task = self._task(tasks, request)
+        tasks.move(task.id, int(request["position"]))
+        return {"index": tasks.index(task.id)}
+
+    def cmd_stop(self, request: dict) -> dict[str, Any]:
+        """Stop the daemon after responding."""
+        # shutdown() waits for serve_forever() to return, which runs in another thread
+        threading.Thread(target=self.shutdown).start()
+        return {}
+
+    @staticmethod
+    def _task(tasks: TasksList, request: dict) -> Task:
+        task_id = request["id"]
+        if task_id not in tasks.tasks:
+            raise RequestError(f"No task with id {task_id!r}, it may have been deleted")
+        return tasks.get(task_id)
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    """Serve requests of a single connection, see :mod:`tasks.daemon.protocol`."""
+
+    server: TasksServer
+
+    def handle(self) -> None:  # noqa: D102
+        for line in self.rfile:
+            try:
+                request = decode(line)
+            except ValueError as e:
+                response: dict[str, Any] = {"ok": False, "error": f"Bad request: {e}", "rc": 2}
+            else:
+                response = self.server.respond(request)
+            self.wfile.write(encode(response))
+
+
+def _prepare_socket(path: str) -> None:
+    """Make a socket directory and remove a stale socket.
+
+    :raises DaemonRunningError: Another daemon is listening on the socket.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+    if not os.path.exists(path):
+        return
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(path)
+        except OSError:
+            logger.debug(f"Removing a stale socket {path}")
+            os.unlink(path)
+            return
+    raise DaemonRunningError(path)
+
+
+def _terminate(signum: int, frame: FrameType | None) -> None:
+    raise SystemExit(0)
+
+
+def serve(path: str | None = None) -> None:
+    """Run a daemon until it is stopped.
+
+    :param str | None path: Socket path, see :func:`socket_path` by default.
+    :raises DaemonRunningError: Another daemon is already running.
+    """
+    path = path or socket_path()
+    _prepare_socket(path)
+    umask = os.umask(0o177)  # only the user can connect
+    try:
+        server = TasksServer(path)
+    finally:
+        os.umask(umask)
+
+    signal.signal(signal.SIGTERM, _terminate)
+    try:
+        server.preload()
+        logger.info(f"Serving on {path}")
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        os.unlink(path)
+        logger.info("Stopped")
@@ -1,15 +1,37 @@
 """Main TUI application class."""
 
+import time
+
 from textual.app import App, ComposeResult
+from textual.timer import Timer
 from textual.widgets import Footer, Header
+from textual.worker import get_current_worker
 
 from tasks.core import TasksList as TasksListRepo
 
 from .tasks_list import TasksList
 
+SAVE_DELAY = 0.5
+"""Seconds without changes after which changes are saved."""
+
+SAVE_MAX_DELAY = 3.0
+"""Seconds after which changes are saved even if editing goes on."""
+
+WATCH_TIMEOUT = 0.5
+"""Seconds a list watcher waits for changes before checking if it has to stop."""
+
 
 class TasksApp(App):
-    """A Textual app to manage tasks."""
+    """A Textual app to manage tasks.
+
+    Changes are not written right away: they are saved in a background
+    thread once editing pauses for :data:`SAVE_DELAY` seconds, so quick
+    edits are merged into a single write and the UI never waits for disk.
+    Saving state is shown in the header.
+
+    The list files are watched, and changes made by other processes
+    (e.g. ``tasks add`` in another shell) are applied as they happen.
+    """
 
     BINDINGS = [
         ("d", "toggle_dark", "Toggle dark mode"),
@@ -22,15 +44,81 @@ class TasksApp(App):
     def __init__(self, tasks: TasksListRepo) -> None:
         super().__init__()
         self.tasks = tasks
+        self.tasks.autoflush = False
+        self._save_timer: Timer | None = None
+        self._unsaved_since: float | None = None
 
     def compose(self) -> ComposeResult:
         """Compose widget."""
-        tasks_list = TasksList()
-        tasks_list.tasks = {task.id: task for task in self.tasks}
         yield Header()
-        yield tasks_list
+        yield TasksList(self.tasks)
         yield Footer()
 
+    def on_mount(self) -> None:  # noqa: D102
+        self.title = self.tasks.title
+        self.sub_title = "Saved"
+        self.run_worker(self._watch_list, thread=True, group="watch", exit_on_error=False)
+
+    def _watch_list(self) -> None:
+        """Watch the list files, runs in a worker thread."""
+        worker = get_current_worker()
+        with self.tasks.watcher() as watcher:
+            while not worker.is_cancelled:
+                if watcher.wait(timeout=WATCH_TIMEOUT) and not worker.is_cancelled:
+                    self._sync_list()
+
+    def _sync_list(self) -> None:
+        """Apply changes made to the list by other processes, runs in a worker thread.
+
+        Files are read here, only the changed rows are redrawn on the UI thread.
+        """
+        try:
+            changed = self.tasks.sync()
+        except Exception as e:
+            self.call_from_thread(self.notify, f"Cannot reload the list: {e}", severity="error")
+            return
+        if changed:
+            self.call_from_thread(self._synced, changed)
+
+    def _synced(self, changed: set[str]) -> None:
+        self.title = self.tasks.title
+        self.query_one(TasksList).refresh_rows()
+        self.notify(f"The list was changed outside: {len(changed)} task(s) updated")
+
+    def schedule_save(self) -> None:
+        """Save changes after a short delay, merging changes made in the meantime."""
+        now = time.monotonic()
+        if self._unsaved_since is None:
+            self._unsaved_since = now
+        if self._save_timer is not None:
+            self._save_timer.stop()
+        delay = min(SAVE_DELAY, max(0.0, self._unsaved_since + SAVE_MAX_DELAY - now))
+        self._save_timer = self.set_timer(delay, self._save_in_background)
+        self.sub_title = "Unsaved changes"
+
+    def _save_in_background(self) -> None:
+        self._save_timer = None
+        self._unsaved_since = None
+        self.sub_title = "Saving..."
+        self.run_worker(self._save, thread=True, group="save", exit_on_error=False)
+
+    def _save(self) -> None:
+        """Write changes, runs in a worker thread."""
+        try:
+            self.tasks.flush()
+        except Exception as e:
+            self.call_from_thread(self._save_failed, e)
+            return
+        self.call_from_thread(self._saved)
+
+    def _saved(self) -> None:
+        if self._save_timer is None and not self.tasks.has_unsaved_changes:
+            self.sub_title = "Saved"
+
+    def _save_failed(self, error: Exception) -> None:
+        self.sub_title = "Not saved!"
+        self.notify(f"Cannot save changes: {error}", severity="error")
+
     def action_toggle_dark(self) -> None:
         """Toggle dark mode."""
         self.theme = "textual-dark" if self.theme == "textual-light" else "textual-light"
@@ -42,3 +130,9 @@ class TasksApp(App):
     def action_quit_app(self) -> None:
         """Quit the application."""
         self.exit(message="Exited!")
+
+    def on_unmount(self) -> None:
+        """Save pending changes before exiting, however the app is closed."""
+        if self._save_timer is not None:
+            self._save_timer.stop()
+        self.tasks.flush()
@@ -1,5 +1,7 @@
 """Task form modal screen."""
 
+from contextlib import suppress
+
 from textual import on
 from textual.app import ComposeResult
 from textual.containers import Container, Horizontal
@@ -45,9 +47,10 @@ class TaskFormModal(ModalScreen[str]):
         self.input = Input(value=None, placeholder="Enter a task title...")
 
     def compose(self) -> ComposeResult:  # noqa: D102
-        task = self.tasks.get(self.task_id) if self.task_id else None
-        if task:
-            self.input.value = task.title
+        if self.task_id:
+            # A task deleted by another process is left for the list sync to handle
+            with suppress(KeyError):
+                self.input.value = self.tasks.get(self.task_id).title
         with Container():
             yield Label("Input a new name for task:")
             yield self.input
@@ -3,19 +3,27 @@
 from textual import on
 from textual.app import ComposeResult
 from textual.containers import VerticalScroll
-from textual.reactive import reactive
 from textual.widget import Widget
-from textual.widgets import Button
+from textual.widgets import Button, Static
 
 from tasks.core import Task
 from tasks.core import TasksList as TasksListRepo
 
 from .task_form_modal import TaskFormModal
-from .tasks_list_item import TasksListItem
+from .tasks_list_item import ROW_HEIGHT, TasksListItem
+
+OVERSCAN = 5
+"""Number of rows mounted above and below the visible ones, for smooth scrolling."""
 
 
 class TasksList(Widget):
-    """A widget that displays a list of tasks."""
+    """A widget that displays a list of tasks.
+
+    Only rows which are visible (plus a few around them) are mounted.
+    The rest of the list is represented by two spacers of the same height,
+    so the scrollbar behaves as if all rows were there. Mounted rows
+    are keyed by task id: a change touches only the row of a changed task.
+    """
 
     DEFAULT_CSS = """
     TasksList > VerticalScroll > Button {
@@ -24,16 +32,69 @@ class TasksList(Widget):
     #add_task {
         align: center top;
     }
+    TasksList > VerticalScroll > .rows-spacer {
+        height: 0;
+    }
     """
 
-    tasks: reactive[dict[str, Task]] = reactive(dict, recompose=True)
+    def __init__(self, tasks: TasksListRepo) -> None:
+        super().__init__()
+        self.tasks = tasks
+        self._rows: dict[str, TasksListItem] = {}
 
     def compose(self) -> ComposeResult:
         """Compose widget."""
         with VerticalScroll():
-            yield from [TasksListItem(t.id, t.title, t.done) for t in self.tasks.values()]
+            yield Static(id="rows_top", classes="rows-spacer")
+            yield Static(id="rows_bottom", classes="rows-spacer")
             yield Button("+", variant="success", id="add_task")
 
+    def on_mount(self) -> None:  # noqa: D102
+        self.watch(self.query_one(VerticalScroll), "scroll_y", self.refresh_rows)
+
+    def on_resize(self) -> None:  # noqa: D102
+        self.refresh_rows()
+
+    def refresh_rows(self) -> None:
+        """Sync mounted rows with the visible part of the list.
+
+        Rows scrolled out of view are removed, rows scrolled into view
+        are mounted, and rows which stay are updated in place
+        if their task has changed.
+        """
+        scroll = self.query_one(VerticalScroll)
+        top = self.query_one("#rows_top", Static)
+        bottom = self.query_one("#rows_bottom", Static)
+
+        scroll_y = int(scroll.scroll_y)
+        height = scroll.size.height
+        first = max(0, scroll_y // ROW_HEIGHT - OVERSCAN)
+        # The list may be synced in the watcher thread, so it is read at once
+        total, visible = self.tasks.window(first, (scroll_y + height) // ROW_HEIGHT + 1 + OVERSCAN)
+        first = min(first, total)
+        last = first + len(visible)
+
+        with self.app.batch_update():
+            visible_ids = {task.id for task in visible}
+            for task_id in [task_id for task_id in self._rows if task_id not in visible_ids]:
+                self._rows.pop(task_id).remove()
+
+            previous: Widget = top
+            for task in visible:
+                row = self._rows.get(task.id)
+                if row is None:
+                    row = self._rows[task.id] = TasksListItem(task.id, task.title, task.done)
+                    scroll.mount(row, after=previous)
+                else:
+                    row.title = task.title
+                    row.done = task.done
+                    if scroll.children.index(row) != scroll.children.index(previous) + 1:
+                        scroll.move_child(row, after=previous)
+                previous = row
+
+            top.styles.height = first * ROW_HEIGHT
+            bottom.styles.height = (total - last) * ROW_HEIGHT
+
     @on(Button.Pressed, "#add_task")
     def add_task(self) -> None:
         """Add a new task to the list.
@@ -50,36 +111,60 @@ class TasksList(Widget):
                 self.app.notify("A task cannot have an empty title!", severity="error")
                 return
 
-            task_id = self.app.tasks.add(result)  # type: ignore
-            self.tasks[task_id] = self.app.tasks.get(task_id)  # type: ignore
-            self.mutate_reactive(TasksList.tasks)
+            self.tasks.add(result)
+            self.app.schedule_save()  # type: ignore
+            self.refresh_rows()
+            self.query_one(VerticalScroll).scroll_end(animate=False)
             self.app.notify("Created a new task!")
-            # self.refresh()
 
         self.app.push_screen(TaskFormModal(), handle_task_input)
 
+    def _row_task(self, task_id: str) -> Task | None:
+        """Get a task of a row.
+
+        A task may be deleted by another process before the list is synced.
+        Then rows are refreshed and None is returned.
+
+        :param str task_id: Task id.
+        :return Task | None: Task instance if it is still in the list, None otherwise.
+        """
+        try:
+            return self.tasks.get(task_id)
+        except KeyError:
+            self.app.notify("The task was deleted outside", severity="warning")
+            self.refresh_rows()
+            return None
+
     def on_tasks_list_item_deleted(self, event: TasksListItem.Deleted) -> None:
         """Remove a task when TasksListItem emited a Delete message."""
-        tasks: TasksListRepo = self.app.tasks  # type: ignore
-        task = tasks.get(event.task_id)
+        task = self._row_task(event.task_id)
+        if task is None:
+            return
         self.app.notify(f"Task deleted: '{task.title}'")
-        del self.tasks[event.task_id]
-        tasks.delete(event.task_id)
-        self.mutate_reactive(TasksList.tasks)
+        self.tasks.delete(event.task_id)
+        self.app.schedule_save()  # type: ignore
+        self.refresh_rows()
 
     def on_tasks_list_item_state_changed(self, event: TasksListItem.StateChanged) -> None:
         """Change the state of a task when TasksListItem emited a StateChanged message."""
-        tasks: TasksListRepo = self.app.tasks  # type: ignore
-        task = tasks.get(event.task_id)
+        task = self._row_task(event.task_id)
+        if task is None:
+            return
         task.done = not task.done
-        tasks.update(task)
-        self.tasks[event.task_id] = task
-        self.mutate_reactive(TasksList.tasks)
+        self.tasks.update(task)
+        self.app.schedule_save()  # type: ignore
+        row = self._rows.get(event.task_id)
+        if row is not None:
+            row.done = task.done
 
     def on_tasks_list_item_title_changed(self, event: TasksListItem.TitleChanged) -> None:
         """Change the title of a task when TasksListItem emited a TitleChanged message."""
-        tasks: TasksListRepo = self.app.tasks  # type: ignore
-        task = self.tasks[event.task_id]
+        task = self._row_task(event.task_id)
+        if task is None:
+            return
         task.title = event.new_title
-        tasks.update(task)
-        self.mutate_reactive(TasksList.tasks)
+        self.tasks.update(task)
+        self.app.schedule_save()  # type: ignore
+        row = self._rows.get(event.task_id)
+        if row is not None:
+            row.title = task.title
@@ -9,11 +9,17 @@ from textual.widgets import Button, Checkbox, Label, Static
 
 from .task_form_modal import TaskFormModal
 
+ROW_HEIGHT = 3
+"""Height of a single tasks list item, in lines."""
+
 
 class TasksListItem(Static):
     """A tasks list item widget."""
 
     DEFAULT_CSS = """
+    TasksListItem {
+        height: 3;
+    }
     .spacer {
         width: 1fr;
     }
@@ -59,6 +65,20 @@ class TasksListItem(Static):
             yield Button(":pen:  Edit", id="edit")
             yield Button(":wastebasket:  Delete", variant="error", id="delete")
 
+    def watch_done(self, done: bool) -> None:
+        """Update the checkbox in place, without emitting a StateChanged message."""
+        if not self.is_mounted:
+            return
+        checkbox = self.query_one("#checkbox", Checkbox)
+        with checkbox.prevent(Checkbox.Changed):
+            checkbox.value = done
+
+    def watch_title(self, title: str) -> None:
+        """Update the title label in place."""
+        if not self.is_mounted:
+            return
+        self.query_one("#title", Label).update(f"[b]{title}[/b]")
+
     @on(Button.Pressed, "#delete")
     def delete_task(self) -> None:
         """Delete task."""
@@ -0,0 +1,75 @@
+"""Shared fixtures."""
+
+import io
+import sys
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+
+from tasks.core import Task, open_storage
+
+LIST_FILES = ["list.json", "list.tasks", "list.sqlite", "list.json.gz", "list.tasks.xz"]
+"""List file names covering every storage backend and compression."""
+
+type RunCli = Callable[..., tuple[int, str]]
+
+
+@pytest.fixture(params=LIST_FILES)
+def list_path(request: pytest.FixtureRequest, tmp_path: Path) -> Path:
+    """Make a list of 30 tasks, every third one done, in every storage format."""
+    path = tmp_path / request.param
+    open_storage(path).create("Test list", (Task(f"Task {i}", done=i % 3 == 0) for i in range(30)))
+    return path
+
+
+@pytest.fixture
+def active_list(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Keep app config, data and cache in a temporary folder, with an active json list like :func:`list_path`."""
+    from tasks import app_config
+
+    for name, path in {
+        "CONFIG_DIR": tmp_path / "config",
+        "DATA_DIR": tmp_path / "data",
+        "CACHE_DIR": tmp_path / "cache",
+        "CONFIG_FILE_PATH": tmp_path / "config" / "config.json",
+        "SUMMARY_CACHE_PATH": tmp_path / "cache" / "summaries.json",
+        "CONFIG_SNAPSHOT_PATH": tmp_path / "cache" / "config.snapshot.json",
+        "DEFAULT_LIST_PATH": tmp_path / "data" / "default.json",
+    }.items():
+        monkeypatch.setattr(app_config, name, path)
+
+    path = tmp_path / "data" / "list.json"
+    path.parent.mkdir()
+    open_storage(path).create("Test list", (Task(f"Task {i}", done=i % 3 == 0) for i in range(30)))
+    app_config.CONFIG_DIR.mkdir()
+    app_config.save_app_config(app_config.AppConfig(active_list=path, task_lists=[path]))
+    return path
+
+
+@pytest.fixture
+def run_cli(active_list: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]) -> RunCli:
+    """Run ``tasks`` with arguments and stdin, get its exit code and output.
+
+    The CLI accesses list files directly, unless ``daemon`` is set.
+    """
+    from tasks.daemon.client import main
+    from tasks.daemon.protocol import NO_DAEMON_ENV
+
+    def run(*args: str, stdin: str = "", daemon: bool = False) -> tuple[int, str]:
+        capsys.readouterr()
+        monkeypatch.setattr(sys, "argv", ["tasks", *args])
+        monkeypatch.setattr(sys, "stdin", io.StringIO(stdin))
+        if daemon:
+            monkeypatch.delenv(NO_DAEMON_ENV, raising=False)
+        else:
+            monkeypatch.setenv(NO_DAEMON_ENV, "1")
+        try:
+            main()
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else 1
+        else:
+            code = 0
+        return code, capsys.readouterr().out
+
+    return run
@@ -0,0 +1,51 @@
+"""App config: a validated snapshot is reused while the config file is unchanged."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from tasks import app_config
+from tasks.app_config import AppConfig, load_app_config, save_app_config
+
+
+def test_snapshot_is_reused(active_list: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """A saved config is loaded without validating it again."""
+
+    def validate(data: str) -> AppConfig:
+        raise AssertionError("The config is validated")
+
+    monkeypatch.setattr(app_config, "_validate", validate)
+    assert load_app_config() == AppConfig(active_list=active_list, task_lists=[active_list])
+
+
+def test_changed_config_is_validated(active_list: Path) -> None:
+    """A config file changed by hand is validated, and its snapshot is updated."""
+    other = active_list.with_name("other.json")
+    config = {"active_list": None, "task_lists": [str(active_list), str(other)], "compression": "always"}
+    app_config.CONFIG_FILE_PATH.write_text(json.dumps(config))
+
+    expected = AppConfig(active_list=None, task_lists=[active_list, other], compression="always")
+    assert load_app_config() == expected
+    snapshot = json.loads(app_config.CONFIG_SNAPSHOT_PATH.read_text())
+    assert {key: snapshot["config"][key] for key in config} == config
+    assert load_app_config() == expected
+
+
+@pytest.mark.parametrize("content", ["", '{"active_list": null, "task_lists": [], "storage": "csv"}'])
+def test_invalid_config_is_reset(content: str, active_list: Path) -> None:
+    """An empty or invalid config file is replaced by the default config."""
+    app_config.CONFIG_FILE_PATH.write_text(content)
+    default = json.loads(app_config.DEFAULT_CONFIG)
+    assert load_app_config() == AppConfig(Path(default["active_list"]), [Path(p) for p in default["task_lists"]])
+    assert json.loads(app_config.CONFIG_FILE_PATH.read_text()) == default
+
+
+def test_save(active_list: Path) -> None:
+    """A saved config is loaded back the same way, with and without its snapshot."""
+    config = AppConfig(active_list=None, task_lists=[active_list], storage="sqlite")
+    save_app_config(config)
+    assert load_app_config() == config
+
+    app_config.CONFIG_SNAPSHOT_PATH.unlink()
+    assert load_app_config() == config
@@ -0,0 +1,160 @@
+"""CLI: commands run against the active list."""
+
+from pathlib import Path
+
+import pytest
+
+from tasks.core import TasksList
+
+from .conftest import RunCli
+
+
+def titles(path: Path) -> list[str]:
+    """Get task titles of a stored list."""
+    return [task.title for task in TasksList(path)]
+
+
+def test_add(active_list: Path, run_cli: RunCli) -> None:
+    """``tasks add`` takes titles from arguments, options and stdin."""
+    code, _ = run_cli("add", "First", "-", "-t", "Second", "--title=Third", stdin="From stdin\n\n")
+    assert code == 0
+    assert titles(active_list)[30:] == ["First", "From stdin", "Second", "Third"]
+
+
+def test_add_prompts_for_title(active_list: Path, run_cli: RunCli) -> None:
+    """``tasks add`` without titles asks for one."""
+    code, out = run_cli("add", stdin="Prompted\n")
+    assert code == 0
+    assert "Add task title" in out
+    assert titles(active_list)[30:] == ["Prompted"]
+
+
+def test_pick_move(active_list: Path, run_cli: RunCli) -> None:
+    """``tasks pick`` moves a task to another position."""
+    code, out = run_cli("pick", stdin="3\nm\n0\n")
+    assert code == 0
+    assert "Moved: Task 3 -> [0]" in out
+    assert titles(active_list)[:2] == ["Task 3", "Task 0"]
+
+
+def test_lists_overview(active_list: Path, run_cli: RunCli) -> None:
+    """``tasks lists`` shows counters of every list, also when they are cached."""
+    code, out = run_cli("lists")
+    assert code == 0
+    assert "Test list" in out
+    assert "10/30" in out
+
+    TasksList(active_list).add("Added")
+    code, out = run_cli("lists")
+    assert "10/31" in out
+
+
+def test_lists_new(active_list: Path, run_cli: RunCli) -> None:
+    """``tasks lists new`` creates a list in a chosen storage and makes it active."""
+    code, _ = run_cli("lists", "new", "Second list", "-s", "sqlite", "-a")
+    assert code == 0
+    path = active_list.parent / "second_list.sqlite"
+    assert TasksList(path).title == "Second list"
+
+    run_cli("add", "-t", "In the second list")
+    assert titles(path) == ["In the second list"]
+    code, out = run_cli("lists")
+    assert "Second list" in out
+    assert "0/1" in out
+
+
+def test_lists_convert(active_list: Path, run_cli: RunCli) -> None:
+    """``tasks lists convert`` rewrites a list in another storage and replaces it in the config."""
+    TasksList(active_list).add("Journaled")
+    expected = titles(active_list)
+    binary = active_list.with_suffix(".tasks")
+
+    code, out = run_cli("lists", "convert", "--to", "binary")
+    assert code == 0
+    assert "Converted 31 task(s)" in out
+    assert not active_list.exists()
+    assert titles(binary) == expected
+    assert run_cli("ls")[1].splitlines()[-3:] == ["[ ] Journaled", "-------------", "31 items"]
+
+    code, _ = run_cli("lists", "convert", "--to", "json", "--keep")
+    assert code == 0
+    assert binary.exists()
+    assert titles(active_list) == expected
+    code, out = run_cli("lists", "convert", "--to", "binary")
+    assert "already exists" in out
+
+
+def test_lists_compress(active_list: Path, run_cli: RunCli) -> None:
+    """``tasks lists compress`` compresses the active list in place, ``-d`` decompresses it."""
+    TasksList(active_list).add("Journaled")
+    expected = titles(active_list)
+
+    code, out = run_cli("lists", "compress", "-c", "lzma")
+    assert code == 0
+    assert "Compressed with lzma" in out
+    assert active_list.read_bytes().startswith(b"\xfd7zXZ\x00")
+    assert titles(active_list) == expected
+
+    run_cli("lists", "compress", "-d")
+    assert active_list.read_bytes().startswith(b"{")
+    assert titles(active_list) == expected
+    assert run_cli("lists", "compress", "-c", "zip") == (0, "Unknown codec: zip\n")
+
+
+def test_ls(active_list: Path, run_cli: RunCli) -> None:
+    """``tasks ls`` prints every task of the list."""
+    TasksList(active_list).add("Journaled")
+    code, out = run_cli("ls")
+    assert code == 0
+    lines = out.splitlines()
+    assert lines[:3] == ["Test list", "[X] Task 0", "[ ] Task 1"]
+    assert lines[-3:] == ["[ ] Journaled", "-------------", "31 items"]
+
+
+def test_ls_filters(active_list: Path, run_cli: RunCli) -> None:
+    """``tasks ls`` shows a page of tasks matching filters."""
+    code, out = run_cli("ls", "--pending", "-n", "2", "--offset", "1")
+    assert (code, out) == (0, "Test list\n[ ] Task 2\n[ ] Task 4\n-------------\n2 items\n")
+
+    code, out = run_cli("ls", "--done", "--match", "^task 1", "--regex")
+    assert out.splitlines()[1:-2] == ["[X] Task 12", "[X] Task 15", "[X] Task 18"]
+    assert run_cli("ls", "-m", "(", "-r") == (2, "")
+
+
+def test_invalid_active_list(active_list: Path, run_cli: RunCli) -> None:
+    """An invalid active list is reported with its problems."""
+    active_list.write_text('{"title": "List", "tasks": {"1": {"title": "Task"}}}')
+    code, out = run_cli("add", "-t", "Title")
+    assert code == 1
+    assert "Not a valid tasks list" in out
+    assert active_list.name in out
+    assert "Task '1': \"done\" must be a boolean, got null" in out
+
+
+@pytest.mark.parametrize(
+    ("content", "problem"),
+    [
+        (None, "File does not exist"),
+        (b"\xff\xfe", "Not a text file"),
+        (b"[]", "Must be an object, got array"),
+    ],
+)
+def test_unreadable_active_list_ls(content: bytes | None, problem: str, active_list: Path, run_cli: RunCli) -> None:
+    """``tasks ls`` reports an active list which cannot be read instead of crashing."""
+    if content is None:
+        active_list.unlink()
+    else:
+        active_list.write_bytes(content)
+    code, out = run_cli("ls")
+    assert code == 1
+    assert "Not a valid tasks list" in out
+    assert problem in out
+
+
+def test_lists_add_invalid(active_list: Path, run_cli: RunCli) -> None:
+    """``tasks lists add`` refuses files which are not tasks lists."""
+    path = active_list.with_name("other.json")
+    path.write_text("{}")
+    code, out = run_cli("lists", "add", str(path))
+    assert code == 1
+    assert '"title" must be a string, got null' in out
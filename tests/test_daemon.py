@@ -0,0 +1,122 @@
+"""Daemon: commands forwarded by the client behave the same as the CLI."""
+
+import tempfile
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from tasks.core import TasksList
+from tasks.daemon import DaemonClient, DaemonError
+from tasks.daemon.protocol import SOCKET_ENV
+from tasks.daemon.server import TasksServer
+
+from .conftest import RunCli
+
+
+@pytest.fixture
+def server(active_list: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[TasksServer]:
+    """Run a daemon in a thread, on a socket the client connects to."""
+    with tempfile.TemporaryDirectory(prefix="tasks-") as directory:  # socket paths are short
+        path = str(Path(directory, "daemon.sock"))
+        monkeypatch.setenv(SOCKET_ENV, path)
+        server = TasksServer(path)
+        server.preload()
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        try:
+            yield server
+        finally:
+            server.shutdown()
+            server.server_close()
+            thread.join()
+
+
+def request(cmd: str, **params: object) -> dict:
+    """Send a single request to the daemon."""
+    client = DaemonClient.connect()
+    assert client is not None
+    with client:
+        return client.request(cmd, **params)
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["ls"],
+        ["ls", "-n", "3", "--offset=2"],
+        ["ls", "--pending", "--match", "task 2"],
+        ["ls", "--done", "-rm", "^Task [12]"],
+        ["ls", "-n", "many"],
+        ["ls", "--bogus"],
+        ["ls", "--help"],
+    ],
+)
+def test_ls_round_trip(args: list[str], server: TasksServer, run_cli: RunCli) -> None:
+    """``tasks ls`` prints the same through the daemon and without it, invalid options included."""
+    assert run_cli(*args, daemon=True) == run_cli(*args)
+
+
+def test_commands_are_forwarded(server: TasksServer, monkeypatch: pytest.MonkeyPatch, run_cli: RunCli) -> None:
+    """Valid ``ls`` and ``add`` are run by the daemon, without the full CLI."""
+    from tasks.cli import app
+
+    def run_full_cli() -> None:
+        raise AssertionError("The full CLI is run")
+
+    monkeypatch.setattr(app, "run_cli", run_full_cli)
+    assert run_cli("add", "-t", "Forwarded", daemon=True) == (0, "")
+    code, out = run_cli("ls", "--pending", "-n", "1", "--offset", "20", daemon=True)
+    assert (code, out) == (0, "Test list\n[ ] Forwarded\n-------------\n1 items\n")
+
+
+def test_add_round_trip(server: TasksServer, active_list: Path, run_cli: RunCli) -> None:
+    """``tasks add`` takes titles from arguments, options and stdin through the daemon too."""
+    code, _ = run_cli("add", "First", "-", "-t", "Second", "--title=Third", stdin="From stdin\n\n", daemon=True)
+    assert code == 0
+    code, _ = run_cli("add", "--", "--help", daemon=True)
+    assert code == 0
+
+    titles = [task.title for task in TasksList(active_list)][30:]
+    assert titles == ["First", "From stdin", "Second", "Third", "--help"]
+
+
+def test_pick_round_trip(server: TasksServer, active_list: Path, run_cli: RunCli) -> None:
+    """``tasks pick`` edits tasks through the daemon."""
+    code, out = run_cli("pick", stdin="1\ne\nRenamed\n", daemon=True)
+    assert code == 0
+    assert "[1]: [ ] Task 1" in out
+    assert "Changed title: Task 1 -> Renamed" in out
+
+    run_cli("pick", stdin="0\nc\n", daemon=True)
+    run_cli("pick", stdin="2\nm\n0\n", daemon=True)
+    run_cli("pick", stdin="3\nd\n", daemon=True)
+    tasks = TasksList(active_list)
+    assert [(task.title, task.done) for task in tasks][:3] == [("Task 2", False), ("Task 0", False), ("Renamed", False)]
+    assert "Task 3" not in [task.title for task in tasks]
+
+
+def test_list_changed_outside(server: TasksServer, active_list: Path) -> None:
+    """The daemon picks up changes written to the list by other processes."""
+    TasksList(active_list).add("Added outside")
+    assert request("ls", offset=30)["tasks"][0][1] == "Added outside"
+
+
+def test_bad_requests(server: TasksServer) -> None:
+    """Invalid requests get errors, and the daemon keeps serving."""
+    bad_requests: list[tuple[str, dict[str, object]]] = [
+        ("unknown", {}),
+        ("add", {"titles": "not a list"}),
+        ("ls", {"limit": -1}),
+        ("ls", {"match": "(", "regex": True}),
+        ("delete", {"id": "missing"}),
+        ("parse", {"args": [1]}),
+    ]
+    for cmd, params in bad_requests:
+        with pytest.raises(DaemonError) as error:
+            request(cmd, **params)
+        assert error.value.rc == 2
+
+    assert request("parse", args=["tui"]) == {"command": None, "params": {}}
+    assert request("ping")["version"]
@@ -0,0 +1,89 @@
+"""Loader: many lists are read concurrently."""
+
+from pathlib import Path
+
+import pytest
+
+from tasks.core import (
+    InvalidTasksListError,
+    ListSummary,
+    TasksList,
+    load_lists,
+    load_many,
+    load_summaries,
+    load_tasks_list,
+    read_summary,
+)
+from tasks.core.loader import Mode
+
+
+@pytest.mark.parametrize("mode", ["thread", "process"])
+def test_load_lists(mode: Mode, list_path: Path, tmp_path: Path) -> None:
+    """Lists are loaded in order of paths, with errors in place of unreadable ones."""
+    missing = tmp_path / "missing.json"
+    loaded = list(load_lists([list_path, missing, list_path], mode=mode))
+
+    assert [path for path, _ in loaded] == [list_path, missing, list_path]
+    assert isinstance(loaded[1][1], InvalidTasksListError)
+    for _, tasks in (loaded[0], loaded[2]):
+        assert isinstance(tasks, TasksList)
+        assert [task.title for task in tasks] == [f"Task {i}" for i in range(30)]
+
+
+def test_load_summaries(list_path: Path) -> None:
+    """Summaries are read for every path, in order or as they are ready."""
+    assert list(load_summaries([list_path], mode="auto")) == [(list_path, ListSummary("Test list", 30, 10))]
+
+    paths = [list_path.with_name(f"copy-{i}{list_path.suffix}") for i in range(5)]
+    for path in paths:
+        path.write_bytes(list_path.read_bytes())
+    results = dict(load_many(read_summary, paths, ordered=False, max_workers=2))
+    assert results == dict.fromkeys(paths, ListSummary("Test list", 30, 10))
+    assert list(load_many(read_summary, [])) == []
+
+
+@pytest.mark.parametrize(
+    ("content", "problems"),
+    [
+        ("[", ["Not a valid json: Expecting value: line 1 column 2 (char 1)"]),
+        ("[]", ["Must be an object, got array"]),
+        ('{"tasks": []}', ['"title" must be a string, got null', '"tasks" must be an object, got array']),
+        (
+            '{"title": "List", "tasks": {"1": 1, "2": {"title": 2}, "3": {"title": "", "done": 1},'
+            ' "4": {"title": "", "done": true, "id": "5"}, "6": {"title": "Valid", "done": false}}}',
+            [
+                "Task '1' must be an object, got number",
+                "Task '2': \"title\" must be a string, got number",
+                "Task '3': \"done\" must be a boolean, got number",
+                "Task '4': \"id\" does not match the key, got '5'",
+            ],
+        ),
+    ],
+)
+def test_invalid_list(content: str, problems: list[str], tmp_path: Path) -> None:
+    """Every problem of an invalid list file is reported at once."""
+    path = tmp_path / "list.json"
+    path.write_text(content)
+    with pytest.raises(InvalidTasksListError) as error:
+        load_tasks_list(path)
+    assert error.value.path == path
+    assert error.value.problems == problems
+
+
+def test_unreadable_list(tmp_path: Path) -> None:
+    """Missing, binary and non-list files are invalid lists too."""
+    binary = tmp_path / "binary.json"
+    binary.write_bytes(b"\xff\xfe")
+    not_sqlite = tmp_path / "list.sqlite"
+    not_sqlite.write_bytes(b"SQLite format 3\x00" + b"\x00" * 100)
+
+    for path, problem in [
+        (tmp_path / "missing.json", "File does not exist"),
+        (tmp_path, "Not a file"),
+        (binary, "Not a text file"),
+    ]:
+        with pytest.raises(InvalidTasksListError) as error:
+            load_tasks_list(path)
+        assert error.value.problems[0].startswith(problem)
+    with pytest.raises(InvalidTasksListError):
+        load_tasks_list(not_sqlite)
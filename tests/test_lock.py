@@ -0,0 +1,22 @@
+"""FileLock: a list lock is held by one holder at a time."""
+
+from pathlib import Path
+
+import pytest
+
+from tasks.core.lock import FileLock, LockTimeoutError, lock_path
+
+
+def test_lock(tmp_path: Path) -> None:
+    """A held lock makes other holders wait, and can be taken again once released."""
+    path = lock_path(tmp_path / "list.json")
+    assert path.name == "list.json.lock"
+
+    with FileLock(path) as lock:
+        assert lock.locked
+        with pytest.raises(LockTimeoutError):
+            FileLock(path, timeout=0.05).acquire()
+    assert not lock.locked
+
+    with FileLock(path, timeout=0.05) as other:
+        assert other.locked
@@ -0,0 +1,36 @@
+"""Profiling: phases of a command are timed without changing its output."""
+
+import pstats
+import time
+from pathlib import Path
+
+from tasks.core.profiling import PhaseTimer
+
+from .conftest import RunCli
+
+
+def test_phase_timer() -> None:
+    """Nested phases are timed exclusively, and nothing is timed while the timer is disabled."""
+    timer = PhaseTimer()
+    with timer.phase("outer"):
+        time.sleep(0.01)
+    assert timer.times == {}
+
+    timer.enabled = True
+    with timer.phase("outer"):
+        time.sleep(0.01)
+        with timer.phase("inner"):
+            time.sleep(0.02)
+    assert list(timer.iterate("read", [1, 2])) == [1, 2]
+
+    assert 0.01 <= timer.times["outer"] < 0.02
+    assert timer.times["inner"] >= 0.02
+    assert timer.calls == {"outer": 1, "inner": 1, "read": 3}
+
+
+def test_profile(run_cli: RunCli, tmp_path: Path) -> None:
+    """``tasks --profile`` prints the same output, and can save cProfile stats."""
+    output = tmp_path / "ls.prof"
+    assert run_cli("--profile", "ls") == run_cli("ls")
+    assert run_cli("--profile-output", str(output), "ls") == run_cli("ls")
+    assert pstats.Stats(str(output)).get_stats_profile().func_profiles
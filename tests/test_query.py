@@ -0,0 +1,143 @@
+"""Queries: finding tasks in one or many lists."""
+
+import re
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+import tasks.core
+from tasks import app_config
+from tasks.core import (
+    ListSummary,
+    SearchIndex,
+    SummaryCache,
+    Task,
+    TaskQuery,
+    TasksList,
+    find_in_lists,
+    find_tasks,
+    open_storage,
+    search_tasks,
+    select_tasks,
+)
+from tasks.core import query as query_module
+from tasks.core.storage import normalize_fingerprint
+
+from .conftest import RunCli
+
+
+def titles(tasks: list[Task]) -> list[str]:
+    """Get task titles in the order tasks were found."""
+    return [task.title for task in tasks]
+
+
+def test_task_query() -> None:
+    """Tasks are matched by title substring or pattern and by done state."""
+    task = Task("Buy Milk", done=True)
+    assert TaskQuery().matches(task)
+    assert TaskQuery("milk").matches(task)
+    assert not TaskQuery("milk", case_sensitive=True).matches(task)
+    assert TaskQuery("^buy .+k$", regex=True).matches(task)
+    assert not TaskQuery("b.y").matches(task)
+    assert not TaskQuery(done=False).matches(task)
+    with pytest.raises(re.error):
+        TaskQuery("(", regex=True)
+
+    assert TaskQuery(done=True).may_match(ListSummary("List", 2, 1))
+    assert not TaskQuery(done=True).may_match(ListSummary("List", 2, 0))
+    assert not TaskQuery(done=False).may_match(ListSummary("List", 2, 2))
+    assert not TaskQuery().may_match(ListSummary("List", 0, 0))
+
+
+def test_select_tasks() -> None:
+    """Tasks are selected with their positions, and nothing is read after the last one."""
+    tasks = [Task(f"Task {i}", done=i % 3 == 0) for i in range(30)]
+    read = []
+
+    def stream() -> Iterator[Task]:
+        for task in tasks:
+            read.append(task)
+            yield task
+
+    selected = list(select_tasks(stream(), TaskQuery(done=False), offset=2, limit=3))
+    assert [(position, task.title) for position, task in selected] == [(4, "Task 4"), (5, "Task 5"), (7, "Task 7")]
+    assert len(read) == 8
+    assert [position for position, _ in select_tasks(tasks, offset=28)] == [28, 29]
+    assert list(select_tasks(tasks, limit=0)) == []
+
+
+def test_find_tasks(list_path: Path) -> None:
+    """Tasks are found the same in a list and in its fresh search index."""
+    query = TaskQuery("task 1", done=False)
+    expected = ["Task 1", "Task 10", "Task 11", "Task 13", "Task 14", "Task 16", "Task 17", "Task 19"]
+    assert titles(find_tasks(list_path, query)) == expected
+
+    search_tasks(list_path, "task")
+    assert titles(find_tasks(list_path, query)) == expected
+    assert len(find_tasks(list_path, TaskQuery(done=True))) == 10
+
+
+def test_indexed_find_keeps_list_order(list_path: Path) -> None:
+    """Tasks found in a search index come in list order after moves and inserts."""
+    search_tasks(list_path, "task")
+    tasks = TasksList(list_path)
+    tasks.move(tasks.order[0], 20)
+    tasks.move(tasks.order[-1], -5)
+    tasks.insert(3, "Task inserted")
+    tasks.add("Task added")
+    assert SearchIndex(list_path).fingerprint() == normalize_fingerprint(open_storage(list_path).fingerprint())
+
+    expected = [task.title for task in tasks]
+    assert titles(find_tasks(list_path, TaskQuery("task"))) == expected
+
+
+def test_find_in_lists(list_path: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Only lists which may have matching tasks are scanned, unreadable ones are skipped."""
+    pending = tmp_path / "pending.json"
+    open_storage(pending).create("Pending", [Task("Pending task")])
+    scanned = []
+
+    def scan(path: Path, query: TaskQuery) -> list[Task]:
+        scanned.append(path)
+        return find_tasks(path, query)
+
+    monkeypatch.setattr(query_module, "find_tasks", scan)
+    paths = [list_path, pending, tmp_path / "missing.json"]
+    results = list(find_in_lists(paths, TaskQuery("task", done=True), cache=SummaryCache(tmp_path / "cache.json")))
+
+    assert scanned == [list_path]
+    assert [(path, summary) for path, summary, _ in results] == [(list_path, ListSummary("Test list", 30, 10))]
+    found = results[0][2]
+    assert isinstance(found, list)
+    assert titles(found) == [f"Task {i}" for i in range(0, 30, 3)]
+
+    results = list(find_in_lists(paths, TaskQuery("task", done=False), mode="thread"))
+    assert sorted(len(found) for _, _, found in results if isinstance(found, list)) == [1, 20]
+
+
+def test_cli_find(active_list: Path, run_cli: RunCli) -> None:
+    """``tasks find`` prints found tasks grouped by list."""
+    code, out = run_cli("find", "task 1[25]$", "--regex", "--done")
+    assert code == 0
+    assert out.splitlines()[1:] == ["[X] Task 12", "[X] Task 15", "-------------", "2 found in 1 list(s)"]
+
+    code, out = run_cli("find", "nothing", "-a")
+    assert out.splitlines() == ["-------------", "0 found in 0 list(s)"]
+
+    code, out = run_cli("find", "(", "-r")
+    assert code == 2
+
+
+def test_interrupted_cli_find_saves_cache(active_list: Path, run_cli: RunCli, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Summaries read before ``tasks find`` is interrupted are kept in the cache."""
+
+    def interrupted(*args: object, **kwargs: object) -> Iterator[tuple[Path, ListSummary, list[Task] | Exception]]:
+        yield from find_in_lists(*args, **kwargs)  # type: ignore[arg-type]
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(tasks.core, "find_in_lists", interrupted)
+    code, out = run_cli("find", "task 12")
+    assert code == 130
+    assert out.splitlines()[-1] == "[X] Task 12"
+    assert str(active_list) in app_config.SUMMARY_CACHE_PATH.read_text()
@@ -0,0 +1,39 @@
+"""Rendering: tasks are printed as a table on a terminal and as plain lines otherwise."""
+
+import re
+import sys
+
+import pytest
+
+from tasks.cli import render
+from tasks.cli.render import print_tasks
+
+ANSI_ESCAPE = re.compile(r"\x1b\[[0-9;]*m")
+
+ROWS = [(i, f"Task {i}", i % 3 == 0) for i in range(10)]
+
+
+def test_plain(capsys: pytest.CaptureFixture[str]) -> None:
+    """Piped output is plain lines."""
+    assert print_tasks("Test list", iter(ROWS[:2])) == 2
+    assert capsys.readouterr().out == "Test list\n[X] Task 0\n[ ] Task 1\n-------------\n2 items\n"
+
+
+def test_table_in_chunks(monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]) -> None:
+    """A table is printed in chunks, with a single title and header."""
+    monkeypatch.setattr(render, "TABLE_CHUNK", 4)
+    monkeypatch.setattr(sys.stdout, "isatty", lambda: True)
+    assert print_tasks("Test list", iter(ROWS)) == 10
+
+    out = ANSI_ESCAPE.sub("", capsys.readouterr().out)
+    assert out.count("Test list") == 1
+    assert out.count("Title") == 1
+    assert [line.split()[-2:] for line in out.splitlines() if "Task" in line] == [
+        ["Task", str(i)] for i in range(10)
+    ]
+    assert out.rstrip().endswith("10 items")
+
+    assert print_tasks("Empty list", iter([])) == 0
+    out = ANSI_ESCAPE.sub("", capsys.readouterr().out)
+    assert "Empty list" in out
+    assert out.rstrip().endswith("0 items")
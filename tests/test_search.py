@@ -0,0 +1,99 @@
+"""Search: an index over task titles, kept up to date by the list."""
+
+from pathlib import Path
+
+import pytest
+
+from tasks.core import SearchIndex, Task, TasksList, open_storage, search_tasks
+from tasks.core import search as search_module
+
+from .conftest import LIST_FILES, RunCli
+
+TITLES = ["Buy milk", "Buy a milkshake", "Call mom", "Build a house", "Milk the cow"]
+
+
+@pytest.fixture(params=LIST_FILES)
+def path(request: pytest.FixtureRequest, tmp_path: Path) -> Path:
+    """Make a list of tasks with searchable titles in every storage format."""
+    path = tmp_path / request.param
+    open_storage(path).create("Shopping", (Task(title) for title in TITLES))
+    return path
+
+
+def found(path: Path, query: str, *, fuzzy: bool = False) -> list[str]:
+    """Get titles of found tasks, best matches first, equal ones by title."""
+    hits = search_tasks(path, query, fuzzy=fuzzy)
+    assert [hit.score for hit in hits] == sorted((hit.score for hit in hits), reverse=True)
+    return [hit.task.title for hit in sorted(hits, key=lambda hit: (-hit.score, hit.task.title))]
+
+
+def test_search(path: Path) -> None:
+    """Tasks with every query word are found, exact words before prefixes."""
+    assert found(path, "milk") == ["Buy milk", "Milk the cow", "Buy a milkshake"]
+    assert found(path, "BUY milk") == ["Buy milk", "Buy a milkshake"]
+    assert found(path, "bu") == ["Build a house", "Buy a milkshake", "Buy milk"]
+    assert found(path, "buy mom") == []
+    assert found(path, "  ") == []
+    assert len(search_tasks(path, "milk", limit=1)) == 1
+
+
+def test_fuzzy_search(path: Path) -> None:
+    """Fuzzy search tolerates typos."""
+    assert found(path, "milkk") == []
+    assert found(path, "milkk", fuzzy=True) == ["Buy milk", "Milk the cow"]
+    assert found(path, "buy housee", fuzzy=True) == []
+    assert found(path, "build housee", fuzzy=True) == ["Build a house"]
+    assert found(path, "xyz", fuzzy=True) == []
+
+
+def test_index_is_updated_by_the_list(path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Once built, the index follows changes of the list without being rebuilt."""
+    assert found(path, "milk")
+    assert SearchIndex(path).exists
+
+    def rebuild(self: SearchIndex, tasks: object, fingerprint: list) -> None:
+        raise AssertionError("The index is rebuilt")
+
+    monkeypatch.setattr(SearchIndex, "rebuild", rebuild)
+    tasks = TasksList(path)
+    tasks.add("Buy bread")
+    task = tasks.get(tasks.order[0])
+    task.title = "Sell milk"
+    tasks.update(task)
+    tasks.delete(tasks.order[2])
+
+    assert found(path, "buy") == ["Buy a milkshake", "Buy bread"]
+    assert found(path, "milk") == ["Milk the cow", "Sell milk", "Buy a milkshake"]
+    assert found(path, "mom") == []
+
+
+def test_stale_index_is_rebuilt(path: Path) -> None:
+    """An index of a list changed behind its back is rebuilt on the next search."""
+    assert found(path, "milk")
+    open_storage(path).create("Shopping", [Task("Buy bread")])
+    assert found(path, "milk") == []
+    assert found(path, "bread") == ["Buy bread"]
+
+    SearchIndex(path).delete()
+    assert not SearchIndex(path).exists
+    assert found(path, "bread") == ["Buy bread"]
+
+
+def test_old_index_is_rebuilt(path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """An index of another version is rebuilt."""
+    assert found(path, "milk")
+    monkeypatch.setattr(search_module, "INDEX_VERSION", search_module.INDEX_VERSION + 1)
+    assert SearchIndex(path).fingerprint() is None
+    assert found(path, "cow") == ["Milk the cow"]
+
+
+def test_cli_search(active_list: Path, run_cli: RunCli) -> None:
+    """``tasks search`` prints found tasks."""
+    code, out = run_cli("search", "task", "3")
+    assert code == 0
+    assert out.splitlines() == ["[X] Task 3", "-------------", "1 found"]
+
+    code, out = run_cli("search", "tasks")
+    assert out.splitlines() == ["-------------", "0 found"]
+    code, out = run_cli("search", "tasks", "-f", "-n", "2")
+    assert out.splitlines()[-1] == "2 found"
@@ -0,0 +1,78 @@
+"""Selector: options are filtered as a user types, best matches first."""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from tasks.cli import selector
+from tasks.cli.selector import SelectorApp, match_rank, rank_options
+from tasks.core import open_storage
+
+from .conftest import RunCli
+
+OPTIONS = ["/lists/work.json", "/lists/home-work.json", "/work/home.json", "/lists/weekend.json"]
+
+
+def test_match_rank() -> None:
+    """Last path parts rank above words, words above substrings, substrings above scattered letters."""
+    assert match_rank("/lists/Work.json", "work") == (0, 7, 16)
+    assert match_rank("/lists/home-work.json", "work") == (1, 12, 21)
+    assert match_rank("/lists/homework.json", "work") == (2, 11, 20)
+    assert match_rank("/lists/weekend.json", "wkd") == (3, 7, 19)
+    assert match_rank("/lists/weekend.json", "dkw") is None
+    assert match_rank("anything", "") == (0, 0, 0)
+
+
+def test_rank_options() -> None:
+    """Matching options are ordered by rank, all options are kept for an empty query."""
+    assert rank_options(OPTIONS, "") == [0, 1, 2, 3]
+    assert rank_options(OPTIONS, "work") == [0, 2, 1]
+    assert rank_options(OPTIONS, "home") == [2, 1]
+    assert rank_options(OPTIONS, "xyz") == []
+
+
+@pytest.mark.parametrize(
+    ("keys", "expected"),
+    [
+        (["enter"], 2),
+        (["down", "enter"], 3),
+        (["pageup", "enter"], 0),
+        (["pageup", "pagedown", "enter"], 3),
+        (["h", "o", "m", "e", "enter"], 2),
+        (["h", "o", "m", "e", "down", "enter"], 1),
+        (["x", "enter", "escape"], None),
+        (["escape"], None),
+    ],
+)
+def test_selector_app(keys: list[str], expected: int | None) -> None:
+    """The default option is highlighted first, typing filters options and enter selects the highlighted one."""
+
+    async def run() -> int | None:
+        app = SelectorApp(OPTIONS, "Select", default=2)
+        async with app.run_test() as pilot:
+            await pilot.press(*keys)
+        return app.return_value
+
+    assert asyncio.run(run()) == expected
+
+
+def test_lists_select(active_list: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, run_cli: RunCli) -> None:
+    """``tasks lists select`` makes the selected list active."""
+    second = tmp_path / "second.json"
+    open_storage(second).create("Second list")
+    run_cli("lists", "add", str(second))
+    prompts = []
+
+    def select_menu(options: list[str], prompt: str, default: int) -> str | None:
+        prompts.append((options, default))
+        return options[-1]
+
+    monkeypatch.setattr(selector, "select_menu", select_menu)
+    code, out = run_cli("lists", "select")
+    assert code == 0
+    assert prompts == [([str(active_list), str(second)], 0)]
+    assert out.replace("\n", "") == f"New active tasks list: {second}"
+
+    monkeypatch.setattr(selector, "select_menu", lambda **_: None)
+    assert run_cli("lists", "select") == (0, "Selection canceled\n")
@@ -0,0 +1,27 @@
+"""Start-up: heavy modules are imported only by the commands that use them."""
+
+import subprocess
+import sys
+
+from .conftest import RunCli
+
+
+def test_cli_does_not_import_heavy_modules() -> None:
+    """Importing the CLI leaves out Textual and pydantic."""
+    code = "import sys, tasks.cli.app; print(sorted({m.split('.')[0] for m in sys.modules}))"
+    modules = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert "'tasks'" in modules
+    assert "'textual'" not in modules
+    assert "'pydantic'" not in modules
+
+
+def test_debug_startup(run_cli: RunCli) -> None:
+    """``tasks debug startup`` shows import times and checks them against a budget."""
+    code, out = run_cli("debug", "startup", "-n", "3")
+    assert code == 0
+    assert "Import time of tasks.daemon.client" in out
+    assert "Total import time" in out
+
+    code, out = run_cli("debug", "startup", "--module", "typer", "--budget", "0")
+    assert code == 1
+    assert "exceeds the budget" in out
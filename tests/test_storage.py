@@ -0,0 +1,253 @@
+"""Storage backends: loading, streaming and summaries of the same list agree."""
+
+from pathlib import Path
+
+import pytest
+
+from tasks.core import InvalidTasksListError, Task, TasksList, open_storage, read_summary, stream_tasks
+from tasks.core.journal import Journal
+from tasks.core.lock import lock_path
+from tasks.core.storage import BinaryStorage, CompressionPolicy, SqliteStorage, json_storage
+
+
+def change(tasks: TasksList) -> None:
+    """Make every kind of change to a list."""
+    first = tasks.add("Added")
+    tasks.insert(0, "Inserted")
+    tasks.move(first, 5)
+    tasks.move(tasks.order[-1], -3)
+    task = tasks.get(tasks.order[10])
+    task.done = not task.done
+    tasks.update(task)
+    tasks.delete(tasks.order[3])
+
+
+def assert_agree(path: Path, expected: TasksList) -> None:
+    """Check that a stored list is read the same way by every reader."""
+    rows = [(task.id, task.title, task.done) for task in expected]
+    assert [(task.id, task.title, task.done) for task in TasksList(path)] == rows
+
+    title, streamed = stream_tasks(path)
+    assert title == expected.title
+    assert [(task.id, task.title, task.done) for task in streamed] == rows
+
+    summary = read_summary(path)
+    assert (summary.title, summary.total, summary.done) == (expected.title, len(rows), expected.completed_number)
+
+
+def test_records_round_trip(tmp_path: Path) -> None:
+    """Appended journal records are read back in order."""
+    journal = Journal(tmp_path / "list.json")
+    assert journal.read() == []
+    assert journal.size == 0
+
+    journal.append([{"op": "add", "id": "1", "title": "Ünicode", "done": False}])
+    journal.append([{"op": "delete", "id": "1"}, {"op": "delete", "id": "2"}])
+    assert [record["op"] for record in journal.read()] == ["add", "delete", "delete"]
+    assert journal.read()[0]["title"] == "Ünicode"
+    assert journal.last() == {"op": "delete", "id": "2"}
+
+    journal.clear()
+    assert journal.read() == []
+
+
+def test_new_list(list_path: Path) -> None:
+    """A created list is read back as it was written."""
+    tasks = TasksList(list_path)
+    assert tasks.title == "Test list"
+    assert len(tasks) == 30
+    assert tasks.completed_number == 10
+    assert_agree(list_path, tasks)
+
+
+def test_appended_tasks_are_streamed(list_path: Path) -> None:
+    """Tasks added, changed and deleted without reordering are merged into the stream."""
+    tasks = TasksList(list_path)
+    tasks.add("Added")
+    tasks.insert(2, "Inserted")
+    task = tasks.get(tasks.order[5])
+    task.title = "Renamed"
+    tasks.update(task)
+    tasks.delete(tasks.order[0])
+    assert_agree(list_path, tasks)
+
+
+def test_changed_list(list_path: Path) -> None:
+    """Changes are read back in the same order by loading, streaming and summaries."""
+    tasks = TasksList(list_path)
+    change(tasks)
+    assert_agree(list_path, tasks)
+
+
+def test_version(list_path: Path) -> None:
+    """Every write makes a new list version, which is stored with the list."""
+    tasks = TasksList(list_path)
+    assert open_storage(list_path).version() == tasks.version == 0
+    tasks.add("First")
+    with tasks.batch():
+        tasks.add("Second")
+        tasks.add("Third")
+    assert open_storage(list_path).version() == tasks.version == 2
+
+    tasks.compact()
+    assert open_storage(list_path).version() == TasksList(list_path).version == tasks.version
+
+
+def test_compacted_list(list_path: Path) -> None:
+    """Compacting a list keeps its tasks, their order and counters."""
+    tasks = TasksList(list_path)
+    change(tasks)
+    tasks.compact()
+    assert_agree(list_path, tasks)
+
+
+def test_not_journaled(tmp_path: Path) -> None:
+    """Without a journal, every change rewrites the json file."""
+    path = tmp_path / "list.json"
+    open_storage(path).create("Test list", (Task(f"Task {i}") for i in range(30)))
+    tasks = TasksList(path, journaled=False)
+    change(tasks)
+
+    assert not Journal(path).path.exists()
+    assert_agree(path, tasks)
+
+
+def test_journal_is_compacted(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """A journal that outgrows the snapshot is folded into it."""
+    monkeypatch.setattr(json_storage, "COMPACT_MIN_BYTES", 0)
+    path = tmp_path / "list.json"
+    open_storage(path).create("Test list", (Task(f"Task {i}") for i in range(30)))
+    tasks = TasksList(path)
+    storage = open_storage(path)
+    assert isinstance(storage, json_storage.JsonStorage)
+
+    tasks.add("Journaled")
+    assert storage.journal.size > 0
+    header = storage.read_header()
+    assert header is not None
+    assert header["stats"]["total"] == 30
+
+    for i in range(30):
+        tasks.add(f"Added {i}")
+    header = storage.read_header()
+    assert header is not None
+    assert header["stats"]["total"] > 30
+    assert storage.journal.size <= json_storage.COMPACT_RATIO * path.stat().st_size
+    assert_agree(path, tasks)
+
+
+def test_torn_journal_line(tmp_path: Path) -> None:
+    """A journal line torn by a crash is skipped, and later changes go after it."""
+    path = tmp_path / "list.json"
+    open_storage(path).create("Test list")
+    TasksList(path).add("Written")
+    storage = open_storage(path)
+    assert isinstance(storage, json_storage.JsonStorage)
+    with storage.journal.path.open("ab") as f:
+        f.write(b'{"op": "add", "id": "torn", "ti')
+
+    tasks = TasksList(path)
+    tasks.add("After a crash")
+    assert [task.title for task in tasks] == ["Written", "After a crash"]
+    assert_agree(path, tasks)
+
+
+def test_undecodable_journal_line(tmp_path: Path) -> None:
+    """A journal line which is not utf-8 is skipped like any other corrupted line."""
+    path = tmp_path / "list.json"
+    open_storage(path).create("Test list")
+    TasksList(path).add("Before")
+    storage = open_storage(path)
+    assert isinstance(storage, json_storage.JsonStorage)
+    with storage.journal.path.open("ab") as f:
+        f.write(b'{"op": "add", "id": "garbage", "title": "\xff\xfe", "done": false}\n')
+    TasksList(path).add("After")
+
+    tasks = TasksList(path)
+    assert [task.title for task in tasks] == ["Before", "After"]
+    assert_agree(path, tasks)
+
+
+def test_version_after_torn_journal_line(tmp_path: Path) -> None:
+    """The list version is still known after a torn journal line, so writers need not reload."""
+    path = tmp_path / "list.json"
+    open_storage(path).create("Test list")
+    tasks = TasksList(path)
+    tasks.add("Written")
+    storage = open_storage(path)
+    assert isinstance(storage, json_storage.JsonStorage)
+    assert storage.version() == tasks.version
+    with storage.journal.path.open("ab") as f:
+        f.write(b'{"op": "add", "id": "torn", "ti')
+
+    assert storage.version() == tasks.version
+
+
+def test_storage_detection(tmp_path: Path) -> None:
+    """Backends are picked by the first bytes of a file, or by the suffix of a new one."""
+    sqlite_path = tmp_path / "list.db"
+    open_storage(sqlite_path).create("Sqlite")
+    renamed = sqlite_path.rename(tmp_path / "renamed.json")
+
+    assert isinstance(open_storage(renamed), SqliteStorage)
+    assert isinstance(open_storage(tmp_path / "new.sqlite3"), SqliteStorage)
+    assert isinstance(open_storage(tmp_path / "new.txt"), json_storage.JsonStorage)
+
+    binary_path = tmp_path / "list.tasks"
+    open_storage(binary_path).create("Binary")
+    assert isinstance(open_storage(binary_path.rename(tmp_path / "binary.json")), BinaryStorage)
+
+
+def test_compression(tmp_path: Path) -> None:
+    """Compressed snapshots are recognized by their first bytes and keep their codec when rewritten."""
+    path = tmp_path / "list.json.gz"
+    open_storage(path).create("Test list", (Task(f"Task {i}") for i in range(30)))
+    assert path.read_bytes()[:2] == b"\x1f\x8b"
+
+    renamed = path.rename(tmp_path / "renamed.json")
+    tasks = TasksList(renamed)
+    tasks.add("Journaled")
+    tasks.compact()
+    assert renamed.read_bytes()[:2] == b"\x1f\x8b"
+    assert_agree(renamed, tasks)
+
+    renamed.write_bytes(renamed.read_bytes()[:20])
+    with pytest.raises(InvalidTasksListError) as error:
+        TasksList(renamed)
+    assert error.value.problems[0].startswith("Damaged gzip data")
+
+
+def test_compression_policy(tmp_path: Path) -> None:
+    """New snapshots are compressed when a policy says so."""
+    policy = CompressionPolicy("auto", "bz2", min_size=1000)
+    assert policy.codec_for(999) is None
+    assert policy.codec_for(1000) == "bz2"
+    assert CompressionPolicy("never").codec_for(10**9) is None
+
+    small, large = tmp_path / "small.json", tmp_path / "large.json"
+    open_storage(small, compression=policy).create("Small")
+    open_storage(large, compression=policy).create("Large", (Task(f"Task {i}") for i in range(30)))
+    assert small.read_bytes().startswith(b"{")
+    assert large.read_bytes().startswith(b"BZh")
+    assert TasksList(large).title == "Large"
+
+
+def test_delete(list_path: Path) -> None:
+    """Deleting a list removes all of its files."""
+    TasksList(list_path).add("Journaled")
+    storage = open_storage(list_path)
+    storage.delete()
+    storage.remove_lock()
+    assert list(list_path.parent.iterdir()) == []
+
+
+def test_lock_file_outlives_deletion(list_path: Path) -> None:
+    """A list deleted under its lock keeps the lock file until the lock is released."""
+    storage = open_storage(list_path)
+    with storage.lock():
+        storage.delete()
+        assert lock_path(list_path).exists()
+    storage.remove_lock()
+
+    assert not lock_path(list_path).exists()
+    assert list(list_path.parent.iterdir()) == []
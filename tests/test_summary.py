@@ -0,0 +1,55 @@
+"""Summaries: aggregate counters of lists."""
+
+import json
+from pathlib import Path
+
+from tasks.core import ListSummary, TasksList, read_summary
+
+
+def change(tasks: TasksList) -> None:
+    """Add a task, complete one and delete a completed one."""
+    tasks.add("Added")
+    task = tasks.get(tasks.order[1])
+    task.done = True
+    tasks.update(task)
+    tasks.delete(tasks.order[0])
+
+
+def test_stats(list_path: Path) -> None:
+    """Counters follow every change, and a failed batch."""
+    tasks = TasksList(list_path)
+    assert tasks.stats == {"total": 30, "done": 10, "pending": 20}
+    change(tasks)
+    assert tasks.stats == {"total": 30, "done": 10, "pending": 20}
+    assert tasks.completed_number == 10
+
+    try:
+        with tasks.batch():
+            tasks.delete(tasks.order[1])
+            raise RuntimeError
+    except RuntimeError:
+        pass
+    assert tasks.stats == {"total": 30, "done": 10, "pending": 20}
+
+
+def test_summary_without_header(tmp_path: Path) -> None:
+    """Json lists written without a header are loaded to be summarized."""
+    path = tmp_path / "list.json"
+    tasks = {str(i): {"id": str(i), "title": f"Task {i}", "done": i == 0} for i in range(3)}
+    path.write_text(json.dumps({"title": "Old list", "tasks": tasks}))
+    assert read_summary(path) == ListSummary("Old list", 3, 1)
+
+
+def test_read_summary(list_path: Path) -> None:
+    """Summaries follow changes, compacted or not."""
+    assert read_summary(list_path) == ListSummary("Test list", 30, 10)
+
+    tasks = TasksList(list_path)
+    tasks.compact()
+    assert read_summary(list_path) == ListSummary("Test list", 30, 10)
+
+    tasks.add("Added")
+    tasks.delete(tasks.order[0])
+    tasks.delete(tasks.order[0])
+    assert read_summary(list_path) == ListSummary("Test list", 29, 9)
+    assert read_summary(list_path) == ListSummary(tasks.title, len(TasksList(list_path)), tasks.completed_number)
@@ -0,0 +1,56 @@
+"""SummaryCache: hits, invalidation and the cache file."""
+
+from pathlib import Path
+
+import pytest
+
+from tasks.core import ListSummary, SummaryCache, TasksList
+from tasks.core import summary_cache as summary_cache_module
+
+
+def test_summaries_are_read_once(list_path: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """A summary of an unchanged list comes from the cache file, without opening the list."""
+    cache = SummaryCache(tmp_path / "cache.json")
+    assert cache.get(list_path) == ListSummary("Test list", 30, 10)
+    cache.save()
+
+    def open_storage(path: Path) -> None:
+        raise AssertionError(f"{path} is opened")
+
+    monkeypatch.setattr(summary_cache_module, "open_storage", open_storage)
+    assert SummaryCache(tmp_path / "cache.json").get(list_path) == ListSummary("Test list", 30, 10)
+
+
+def test_changed_list_is_read_again(list_path: Path, tmp_path: Path) -> None:
+    """Changes of a list, including ones only appended to its journal, invalidate its summary."""
+    cache = SummaryCache(tmp_path / "cache.json")
+    cache.get(list_path)
+
+    tasks = TasksList(list_path)
+    tasks.add("New")
+    task = tasks.get(tasks.order[1])
+    task.done = True
+    tasks.update(task)
+
+    assert cache.get(list_path) == ListSummary("Test list", 31, 11)
+
+
+def test_many_summaries_keep_order(list_path: Path, tmp_path: Path) -> None:
+    """Summaries of many lists come in order of paths, errors included."""
+    missing = tmp_path / "missing.json"
+    summaries = SummaryCache(tmp_path / "cache.json").get_many([missing, list_path], mode="thread")
+
+    assert list(summaries) == [missing, list_path]
+    assert isinstance(summaries[missing], Exception)
+    assert summaries[list_path] == ListSummary("Test list", 30, 10)
+
+
+@pytest.mark.parametrize("content", ["{", '{"version": 0, "entries": {"x": 1}}'])
+def test_unusable_cache_file_is_dropped(content: str, list_path: Path, tmp_path: Path) -> None:
+    """A corrupted cache file, or one of another version, is treated as empty."""
+    path = tmp_path / "cache.json"
+    path.write_text(content)
+    cache = SummaryCache(path)
+    assert cache.get(list_path) == ListSummary("Test list", 30, 10)
+    cache.save()
+    assert SummaryCache(path).get(list_path) == ListSummary("Test list", 30, 10)
@@ -0,0 +1,23 @@
+"""Task: a slotted record of a single task."""
+
+from pathlib import Path
+
+import pytest
+
+from tasks.core import Task, TasksList
+
+
+def test_task_is_slotted() -> None:
+    """Tasks keep the attribute API, without a per-instance dict."""
+    task = Task("", done=True)
+    assert (task.title, task.done, len(task.id)) == ("Untitled", True, 32)
+    assert not hasattr(task, "__dict__")
+    with pytest.raises(AttributeError):
+        task.extra = 1  # type: ignore[attr-defined]
+    assert repr(Task("Title", task_id="1")) == "Task('Title', task_id='1', done=False)"
+
+
+def test_loaded_ids_are_shared(list_path: Path) -> None:
+    """Each loaded task id is stored once, as a dict key and as an attribute."""
+    tasks = TasksList(list_path)
+    assert all(task.id is task_id for task_id, task in tasks.tasks.items())
@@ -0,0 +1,175 @@
+"""TasksList: order of tasks, batches, flushing, syncing and concurrent writers."""
+
+import pickle
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from tasks.core import TasksList, load_lists
+
+
+def titles(tasks: TasksList) -> list[str]:
+    """Get task titles in list order."""
+    return [task.title for task in tasks]
+
+
+def test_order(list_path: Path) -> None:
+    """Inserted and moved tasks keep their positions after a reload and a compaction."""
+    tasks = TasksList(list_path)
+    tasks.insert(1, "Inserted")
+    tasks.insert(-1, "Before last")
+    tasks.move(tasks.order[0], 100)
+    tasks.move(tasks.order[-2], -30)
+    expected = titles(tasks)
+    assert expected[:3] == ["Inserted", "Task 29", "Task 1"]
+    assert expected[-3:] == ["Task 28", "Before last", "Task 0"]
+    assert tasks.at(0) == tasks.get(tasks.order[0])
+    assert tasks.index(tasks.order[5]) == 5
+    assert tasks.window(30, 100) == (32, [tasks.at(30), tasks.at(31)])
+
+    assert titles(TasksList(list_path)) == expected
+    tasks.compact()
+    assert titles(TasksList(list_path)) == expected
+
+
+def test_batch_is_written_once(list_path: Path) -> None:
+    """Changes made in a batch are written when it exits."""
+    tasks = TasksList(list_path)
+    with tasks.batch():
+        tasks.add("First")
+        with tasks.batch():
+            tasks.add("Second")
+        assert tasks.has_unsaved_changes
+        assert titles(TasksList(list_path))[-1] == "Task 29"
+    assert not tasks.has_unsaved_changes
+    assert titles(TasksList(list_path))[-2:] == ["First", "Second"]
+
+
+def test_failed_batch_rolls_back(list_path: Path) -> None:
+    """A batch that raises changes neither the list in memory nor the stored one."""
+    tasks = TasksList(list_path)
+    tasks.add("Before")
+    before = titles(tasks)
+
+    with pytest.raises(RuntimeError), tasks.batch():
+        tasks.add("Added")
+        tasks.delete(tasks.order[0])
+        tasks.move(tasks.order[-1], 0)
+        raise RuntimeError
+
+    assert titles(tasks) == before
+    assert not tasks.has_unsaved_changes
+    assert titles(TasksList(list_path)) == before
+
+
+def test_rollback_keeps_earlier_changes(list_path: Path) -> None:
+    """Changes made before a failed batch survive it, even if they are not written yet."""
+    tasks = TasksList(list_path, autoflush=False)
+    tasks.add("Kept")
+    with pytest.raises(RuntimeError), tasks.batch():
+        tasks.add("Dropped")
+        raise RuntimeError
+
+    assert titles(tasks)[-1] == "Kept"
+    assert titles(TasksList(list_path))[-1] == "Task 29"
+    tasks.flush()
+    assert titles(TasksList(list_path))[-1] == "Kept"
+
+
+def test_sync(list_path: Path) -> None:
+    """Changes written by another process are applied, with unwritten changes on top."""
+    tasks = TasksList(list_path, autoflush=False)
+    assert tasks.sync() == set()
+    tasks.add("Not written")
+
+    other = TasksList(list_path)
+    added = other.add("Added outside")
+    renamed = other.get(other.order[0])
+    renamed.title = "Renamed outside"
+    other.update(renamed)
+    deleted = other.order[1]
+    other.delete(deleted)
+
+    # Tasks after the deleted one moved up, so they are reported too
+    assert tasks.sync() >= {added, renamed.id, deleted}
+    assert titles(tasks)[:2] == ["Renamed outside", "Task 2"]
+    assert sorted(titles(tasks)[-2:]) == ["Added outside", "Not written"]
+    assert tasks.has_unsaved_changes
+    assert tasks.sync() == set()
+
+    checked = other.get(other.order[5])
+    checked.done = not checked.done
+    other.update(checked)
+    assert tasks.sync() == {checked.id}
+    assert tasks.get(checked.id).done == checked.done
+
+
+def test_stale_writer_catches_up(list_path: Path) -> None:
+    """A list written by someone else since it was loaded is merged before writing."""
+    first = TasksList(list_path)
+    second = TasksList(list_path)
+    first.add("From the first")
+    second.add("From the second")
+
+    assert titles(second)[-2:] == ["From the first", "From the second"]
+    assert titles(TasksList(list_path)) == titles(second)
+    assert first.sync() == {second.order[-1]}
+    assert titles(first) == titles(second)
+
+
+def test_concurrent_writers(list_path: Path) -> None:
+    """Writers with their own copies of a list do not lose each other's changes."""
+
+    def write(writer: int) -> None:
+        tasks = TasksList(list_path)
+        for i in range(10):
+            tasks.add(f"Writer {writer} task {i}")
+
+    with ThreadPoolExecutor(4) as executor:
+        list(executor.map(write, range(4)))
+
+    tasks = TasksList(list_path)
+    assert len(tasks) == 30 + 40
+    for writer in range(4):
+        assert [t for t in titles(tasks) if t.startswith(f"Writer {writer} ")] == [
+            f"Writer {writer} task {i}" for i in range(10)
+        ]
+
+
+def test_background_flush(list_path: Path) -> None:
+    """The list can be changed while another thread is flushing it."""
+    tasks = TasksList(list_path, autoflush=False)
+    stop = threading.Event()
+
+    def flush() -> None:
+        while not stop.is_set():
+            tasks.flush()
+
+    flusher = threading.Thread(target=flush)
+    flusher.start()
+    try:
+        for i in range(100):
+            task_id = tasks.add(f"Added {i}")
+            if i % 2:
+                tasks.move(task_id, 0)
+    finally:
+        stop.set()
+        flusher.join()
+    tasks.flush()
+
+    assert titles(TasksList(list_path)) == titles(tasks)
+
+
+def test_pickle(list_path: Path) -> None:
+    """Lists can be pickled, e.g. to be loaded in other processes."""
+    tasks = TasksList(list_path)
+    copy = pickle.loads(pickle.dumps(tasks))
+    assert titles(copy) == titles(tasks)
+    copy.add("Added to a copy")
+    assert titles(TasksList(list_path))[-1] == "Added to a copy"
+
+    loaded = dict(load_lists([list_path], mode="process"))[list_path]
+    assert isinstance(loaded, TasksList)
+    assert titles(loaded) == titles(copy)
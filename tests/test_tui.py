@@ -0,0 +1,151 @@
+"""TUI: rendering visible rows, saving in the background and live reload."""
+
+import asyncio
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+
+import pytest
+from textual.containers import VerticalScroll
+from textual.pilot import Pilot
+
+from tasks.core import Task, open_storage
+from tasks.core import TasksList as TasksListRepo
+from tasks.tui import TasksApp
+from tasks.tui.tasks_list_item import TasksListItem
+
+type AppTest = Callable[[TasksApp, Pilot], Awaitable[None]]
+
+
+@pytest.fixture
+def path(tmp_path: Path) -> Path:
+    """Make a list of 30 tasks, every third one done."""
+    path = tmp_path / "list.json"
+    open_storage(path).create("Test list", (Task(f"Task {i}", done=i % 3 == 0) for i in range(30)))
+    return path
+
+
+def run_app(path: Path, test: AppTest) -> None:
+    """Run the app on a list in a headless terminal, then run a test against it."""
+
+    async def run() -> None:
+        app = TasksApp(TasksListRepo(path))
+        async with app.run_test(size=(80, 30)) as pilot:
+            await pilot.pause()
+            await test(app, pilot)
+
+    asyncio.run(run())
+
+
+def rows(app: TasksApp) -> dict[str, TasksListItem]:
+    """Get mounted rows by task title."""
+    return {row.title: row for row in app.query(TasksListItem)}
+
+
+async def wait_for(pilot: Pilot, condition: Callable[[], bool], timeout: float = 5.0) -> None:
+    """Wait until a condition is met, e.g. a background save is done."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "Timed out"
+        await pilot.pause(0.05)
+
+
+def test_only_visible_rows_are_mounted(path: Path) -> None:
+    """Rows are mounted around the visible part of the list as it is scrolled."""
+
+    async def test(app: TasksApp, pilot: Pilot) -> None:
+        mounted = list(rows(app))
+        assert mounted == [f"Task {i}" for i in range(len(mounted))]
+        assert len(mounted) < 30
+
+        app.query_one(VerticalScroll).scroll_end(animate=False)
+        await pilot.pause()
+        mounted = list(rows(app))
+        assert mounted == [f"Task {i}" for i in range(30 - len(mounted), 30)]
+
+    run_app(path, test)
+
+
+def test_rows_are_updated_by_task_id(path: Path) -> None:
+    """Changing a task updates its row in place, deleting it removes the row."""
+
+    async def test(app: TasksApp, pilot: Pilot) -> None:
+        row = rows(app)["Task 1"]
+        row.post_message(TasksListItem.StateChanged(row.task_id))
+        row.post_message(TasksListItem.TitleChanged(row.task_id, "Renamed"))
+        await pilot.pause()
+        assert rows(app)["Renamed"] is row
+        assert row.done
+
+        row.post_message(TasksListItem.Deleted(row.task_id))
+        await pilot.pause()
+        assert "Renamed" not in rows(app)
+        assert list(rows(app))[:2] == ["Task 0", "Task 2"]
+
+    run_app(path, test)
+    assert [(task.title, task.done) for task in TasksListRepo(path)][:2] == [("Task 0", True), ("Task 2", False)]
+
+
+def test_changes_are_saved_in_background(path: Path) -> None:
+    """Checking a task updates its row and is saved after a short delay."""
+
+    async def test(app: TasksApp, pilot: Pilot) -> None:
+        row = rows(app)["Task 1"]
+        row.post_message(TasksListItem.StateChanged(row.task_id))
+        await pilot.pause()
+        assert row.done
+        assert app.sub_title == "Unsaved changes"
+        assert not TasksListRepo(path).get(row.task_id).done
+
+        await wait_for(pilot, lambda: app.sub_title == "Saved")
+        assert TasksListRepo(path).get(row.task_id).done
+
+    run_app(path, test)
+
+
+def test_changes_made_outside_are_shown(path: Path) -> None:
+    """Tasks added and deleted by another process are shown without a restart."""
+
+    async def test(app: TasksApp, pilot: Pilot) -> None:
+        sync = app.tasks.sync
+        sync_threads = []
+
+        def record_sync() -> set[str]:
+            sync_threads.append(threading.current_thread())
+            return sync()
+
+        app.tasks.sync = record_sync  # type: ignore[method-assign]
+        other = TasksListRepo(path)
+        other.delete(other.order[0])
+        other.add("Added outside")
+
+        await wait_for(pilot, lambda: "Task 0" not in rows(app))
+        assert len(app.tasks) == 30
+        assert [task.title for task in app.tasks][-1] == "Added outside"
+        # Files are read in the watcher worker, not on the UI thread
+        assert sync_threads
+        assert threading.main_thread() not in sync_threads
+
+    run_app(path, test)
+
+
+def test_row_of_task_deleted_outside(path: Path) -> None:
+    """A row changed after its task was deleted by another process is dropped, not resurrected."""
+
+    async def test(app: TasksApp, pilot: Pilot) -> None:
+        row = rows(app)["Task 1"]
+        with app.tasks.batch():
+            # Emulate a sync which happened right before the message
+            app.tasks.delete(row.task_id)
+
+        row.post_message(TasksListItem.StateChanged(row.task_id))
+        row.post_message(TasksListItem.TitleChanged(row.task_id, "Renamed"))
+        row.post_message(TasksListItem.Deleted(row.task_id))
+        await pilot.pause()
+
+        assert "Task 1" not in rows(app)
+        assert "Renamed" not in [task.title for task in app.tasks]
+        assert len(app.tasks) == 29
+
+    run_app(path, test)
@@ -0,0 +1,31 @@
+"""FileWatcher: changes of watched files are reported, with inotify or by polling."""
+
+from pathlib import Path
+
+import pytest
+
+from tasks.core import FileWatcher
+
+
+@pytest.mark.parametrize("inotify", [True, False])
+def test_wait(inotify: bool, tmp_path: Path) -> None:
+    """Writing, replacing and deleting a file are changes, other files in its folder are not."""
+    path = tmp_path / "list.json"
+    path.write_text("{}")
+    with FileWatcher([path], poll_interval=0.01) as watcher:
+        if not inotify:
+            watcher.close()
+        assert watcher.uses_inotify == inotify
+
+        assert not watcher.wait(timeout=0.05)
+        (tmp_path / "other.json").write_text("{}")
+        assert not watcher.wait(timeout=0.05)
+
+        path.write_text('{"title": "Changed"}')
+        assert watcher.wait(timeout=1)
+        replacement = tmp_path / "list.json.tmp"
+        replacement.write_text('{"title": "Replaced"}')
+        replacement.replace(path)
+        assert watcher.wait(timeout=1)
+        path.unlink()
+        assert watcher.wait(timeout=1)